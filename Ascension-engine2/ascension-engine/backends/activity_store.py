@@ -0,0 +1,206 @@
+"""
+backends/activity_store.py
+Per-user activity log store for PWN Ascension.
+
+Activity lives outside the user record so logging an action never
+rewrites the user, and reading a user never drags their history along.
+
+Events are fixed-width 16-byte binary records in memory-mapped shard
+files (users are spread over shards by id):
+
+  time u32 | event code u16 | (2 bytes padding) | payload i64
+
+Each user owns a block in their shard: a 16-byte header (user id, next
+sequence number) followed by a ring buffer of `retention` records, so
+records do not repeat the user id. Entry
+number `seq` is written to slot `seq % retention`, so old entries are
+overwritten in place and paging is a direct offset calculation with no
+parsing. Display text is rendered from utils/activity_events.py.
+
+Includes:
+- Append (one record write + header bump)
+- Newest-first paged reads by offset
+- Clearing one user's log
+- A marker for the one-time import of the old text logs
+"""
+
+import os
+import mmap
+import struct
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+RECORD = struct.Struct("<IHxxq")    # time, code, payload
+BLOCK_HEADER = struct.Struct("<QQ")  # uid, next seq
+FILE_HEADER = struct.Struct("<8sII")  # magic, retention, used blocks
+
+MAGIC = b"PWNACT02"
+GROW_BLOCKS = 64
+PAYLOAD_MIN, PAYLOAD_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class _Shard:
+    """One memory-mapped shard file holding a block per user."""
+
+    def __init__(self, path: str, retention: int):
+        self.path = path
+        self.lock = threading.Lock()
+        self.blocks = {}    # uid -> block offset
+
+        new = not os.path.exists(path) or os.path.getsize(path) < FILE_HEADER.size
+        self._file = open(path, "r+b" if not new else "w+b")
+
+        if new:
+            self.retention = retention
+            self.used = 0
+            self._file.truncate(FILE_HEADER.size)
+            self._map()
+            self._write_file_header()
+        else:
+            self._map()
+            magic, self.retention, self.used = FILE_HEADER.unpack_from(self.mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an activity shard")
+            if self.retention != retention:
+                # Block layout is fixed per file; keep what is on disk
+                logger.warning(
+                    f"{path} uses retention {self.retention}, ignoring {retention}"
+                )
+
+        self.block_size = BLOCK_HEADER.size + self.retention * RECORD.size
+
+        # Rebuild uid → block index from block headers
+        for i in range(self.used):
+            offset = FILE_HEADER.size + i * self.block_size
+            uid, _ = BLOCK_HEADER.unpack_from(self.mm, offset)
+            self.blocks[uid] = offset
+
+    def _map(self):
+        self.mm = mmap.mmap(self._file.fileno(), 0)
+
+    def _write_file_header(self):
+        FILE_HEADER.pack_into(self.mm, 0, MAGIC, self.retention, self.used)
+
+    def block(self, uid: int, create=False):
+        """Offset of a user's block, allocating one if asked. Caller holds lock."""
+        offset = self.blocks.get(uid)
+        if offset is not None or not create:
+            return offset
+
+        offset = FILE_HEADER.size + self.used * self.block_size
+        if offset + self.block_size > len(self.mm):
+            # Grow in chunks; the new space is sparse until written
+            self.mm.close()
+            self._file.truncate(offset + GROW_BLOCKS * self.block_size)
+            self._map()
+
+        BLOCK_HEADER.pack_into(self.mm, offset, uid, 0)
+        self.used += 1
+        self._write_file_header()
+        self.blocks[uid] = offset
+        return offset
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self._file.close()
+
+
+class ActivityStore:
+    """Sharded, memory-mapped ring-buffer activity log."""
+
+    def __init__(self, directory: str, retention=500, shards=16):
+        self.directory = directory
+        self.retention = retention
+        os.makedirs(directory, exist_ok=True)
+
+        self._shards = [
+            _Shard(os.path.join(directory, f"shard-{i:02d}.bin"), retention)
+            for i in range(shards)
+        ]
+
+    def _shard(self, uid: int) -> _Shard:
+        return self._shards[uid % len(self._shards)]
+
+    # -------------------------------
+    # WRITES
+    # -------------------------------
+    def append(self, uid: int, ts: int, code: int, payload: int = 0):
+        """Add one event to a user's log, overwriting the oldest when full."""
+        self.append_many(uid, [(ts, code, payload)])
+
+    def append_many(self, uid: int, events):
+        """Add (time, code, payload) events, oldest first."""
+        shard = self._shard(uid)
+        with shard.lock:
+            offset = shard.block(uid, create=True)
+            _, seq = BLOCK_HEADER.unpack_from(shard.mm, offset)
+
+            for ts, code, payload in events:
+                if not PAYLOAD_MIN <= payload <= PAYLOAD_MAX:
+                    logger.warning(f"Activity payload {payload} of user {uid} (event {code}) out of range, clamped")
+                    payload = max(PAYLOAD_MIN, min(PAYLOAD_MAX, payload))
+                slot = offset + BLOCK_HEADER.size + (seq % shard.retention) * RECORD.size
+                RECORD.pack_into(shard.mm, slot, ts, code, payload)
+                seq += 1
+
+            # Header last: a crash mid-append never exposes a half-written slot
+            BLOCK_HEADER.pack_into(shard.mm, offset, uid, seq)
+
+    def clear(self, uid: int):
+        """Empty a user's log (their block is kept for reuse)."""
+        shard = self._shard(uid)
+        with shard.lock:
+            offset = shard.block(uid)
+            if offset is not None:
+                BLOCK_HEADER.pack_into(shard.mm, offset, uid, 0)
+
+    # -------------------------------
+    # READS
+    # -------------------------------
+    def page(self, uid: int, offset: int, limit: int):
+        """
+        Return (events, total) for one page of a user's log, newest first.
+        Events are (time, code, payload) tuples; total is the number retained.
+        """
+        shard = self._shard(uid)
+        with shard.lock:
+            block = shard.block(uid)
+            if block is None:
+                return [], 0
+
+            _, head = BLOCK_HEADER.unpack_from(shard.mm, block)
+            total = min(head, shard.retention)
+
+            newest = head - 1 - offset
+            oldest = max(head - total, newest - limit + 1)
+
+            events = []
+            for seq in range(newest, oldest - 1, -1):
+                slot = block + BLOCK_HEADER.size + (seq % shard.retention) * RECORD.size
+                ts, code, payload = RECORD.unpack_from(shard.mm, slot)
+                events.append((ts, code, payload))
+
+        return events, total
+
+    # -------------------------------
+    # MIGRATION
+    # -------------------------------
+    def is_migrated(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, "MIGRATED"))
+
+    def mark_migrated(self):
+        open(os.path.join(self.directory, "MIGRATED"), "w").close()
+
+    def flush(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.mm.flush()
+
+    def close(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.close()
@@ -0,0 +1,220 @@
+"""
+backends/cache.py
+Process-local write-back user cache that sits in front of a storage engine.
+
+Handles:
+- Hot user records served from memory
+- Dirty tracking for records written through the cache
+- Flushing on an interval, on a dirty-count threshold and on close
+- LRU eviction once the cache holds `max_users` records
+
+Records returned by get() are shared with the cache and must be treated
+as read-only. Writers go through get_for_update() (a private copy) and
+put(), which is what database.transaction does.
+"""
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CachedBackend:
+    """Write-back LRU cache wrapping another storage engine."""
+
+    def __init__(self, inner, max_users=50000, flush_interval=5.0, flush_threshold=200):
+        self.inner = inner
+        self.max_users = max_users
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+        self._records = OrderedDict()   # uid -> record, least recently used first
+        self._dirty = set()             # uids in _records not yet written
+        self._evicted = {}              # dirty records pushed out of the LRU
+        self._flushing = {}             # evicted records being written right now
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self._thread = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._flush_loop, name="db-cache-flush", daemon=True)
+            self._thread.start()
+
+    # -------------------------------
+    # READS
+    # -------------------------------
+    def get(self, uid: str):
+        """Return the cached record (read-only), loading it on a miss."""
+        with self._lock:
+            record = self._lookup(uid)
+        if record is not None:
+            return record
+
+        record = self.inner.get(uid)
+        if record is None:
+            return None
+
+        with self._lock:
+            # Another thread may have loaded or written it meanwhile
+            existing = self._lookup(uid)
+            if existing is not None:
+                return existing
+            self._records[uid] = record
+            self._evict()
+        return record
+
+    def get_many(self, uids):
+        """Return {uid: record} (read-only), loading all misses in one call."""
+        found = {}
+        with self._lock:
+            for uid in uids:
+                record = self._lookup(uid)
+                if record is not None:
+                    found[uid] = record
+
+        missing = [uid for uid in uids if uid not in found]
+        if not missing:
+            return found
+
+        loaded = self.inner.get_many(missing)
+        with self._lock:
+            for uid, record in loaded.items():
+                existing = self._lookup(uid)
+                if existing is not None:
+                    record = existing
+                else:
+                    self._records[uid] = record
+                found[uid] = record
+            self._evict()
+        return found
+
+    def get_for_update(self, uid: str):
+        """Return a private copy the caller may mutate and put() back."""
+        record = self.get(uid)
+        return copy.deepcopy(record) if record is not None else None
+
+    def _lookup(self, uid):
+        """Find a record in memory. Caller holds self._lock."""
+        record = self._records.get(uid)
+        if record is not None:
+            self._records.move_to_end(uid)
+            return record
+
+        record = self._evicted.pop(uid, None)
+        if record is not None:
+            # Still unwritten: bring it back as dirty
+            self._records[uid] = record
+            self._dirty.add(uid)
+            self._evict()
+            return record
+
+        record = self._flushing.get(uid)
+        if record is not None:
+            # Being written now: bring it back clean
+            self._records[uid] = record
+            self._evict()
+        return record
+
+    # -------------------------------
+    # WRITES
+    # -------------------------------
+    def put(self, uid: str, record: dict):
+        """Store a record in memory and mark it dirty."""
+        with self._lock:
+            self._records[uid] = record
+            self._records.move_to_end(uid)
+            self._dirty.add(uid)
+            self._evicted.pop(uid, None)
+            self._evict()
+            pending = len(self._dirty) + len(self._evicted)
+
+        if pending >= self.flush_threshold:
+            self._request_flush()
+
+    def put_many(self, items):
+        for uid, record in items:
+            self.put(uid, record)
+
+    def _evict(self):
+        """Drop least recently used records over the cap. Caller holds self._lock."""
+        while len(self._records) > self.max_users:
+            uid, record = self._records.popitem(last=False)
+            if uid in self._dirty:
+                self._dirty.discard(uid)
+                self._evicted[uid] = record
+
+    # -------------------------------
+    # FLUSHING
+    # -------------------------------
+    def flush(self):
+        """Write every dirty record to the wrapped engine."""
+        with self._flush_lock:
+            with self._lock:
+                batch = {uid: self._records[uid] for uid in self._dirty}
+                batch.update(self._evicted)
+                self._flushing = self._evicted
+                self._evicted = {}
+                self._dirty.clear()
+
+            if not batch:
+                return
+
+            try:
+                self.inner.put_many(batch.items())
+            except Exception as e:
+                logger.error(f"Cache flush failed: {e}")
+                with self._lock:
+                    # Re-queue anything that was not overwritten meanwhile
+                    for uid, record in batch.items():
+                        if self._records.get(uid) is record:
+                            self._dirty.add(uid)
+                        elif uid not in self._records and uid not in self._evicted:
+                            self._evicted[uid] = record
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    def _request_flush(self):
+        if self._thread is not None:
+            self._wake.set()
+        else:
+            self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # -------------------------------
+    # WHOLE DATABASE (legacy callers)
+    # -------------------------------
+    def iter_users(self):
+        self.flush()
+        return self.inner.iter_users()
+
+    def load_all(self) -> dict:
+        self.flush()
+        return self.inner.load_all()
+
+    def save_all(self, db: dict):
+        with self._flush_lock:
+            with self._lock:
+                self._records.clear()
+                self._dirty.clear()
+                self._evicted = {}
+            self.inner.save_all(db)
+
+    def close(self):
+        """Stop the flush thread, write everything and close the engine."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.inner.close()
@@ -0,0 +1,171 @@
+"""
+backends/group_commit.py
+Group-commit wrapper that coalesces concurrent writes into one storage commit.
+
+Handles:
+- Queueing put() calls from many handler threads
+- One writer thread committing each batch with a single put_many()
+- A short batching window (a few ms) so bursts share one commit
+- Coalescing repeated writes to the same user within a batch
+
+Each put() blocks until the wrapped engine has committed the batch
+holding it, so callers keep the same guarantees as a direct write to
+that engine (database.py opens SQLite with synchronous=FULL under group
+commit, so a returned put() survives a power failure). Records still
+waiting to be written are served by get() so reads never go back in time.
+"""
+
+import copy
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    """Records waiting for one commit, plus the event their writers wait on."""
+
+    def __init__(self):
+        self.items = {}
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommitBackend:
+    """Batches writes to another storage engine on a single writer thread."""
+
+    def __init__(self, inner, window_ms=10.0, max_batch=500):
+        self.inner = inner
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._cond = threading.Condition()
+        self._batch = _Batch()
+        self._pending = {}      # uid -> newest record not yet committed
+        self._stop = False
+
+        self._thread = threading.Thread(target=self._writer_loop, name="db-group-commit", daemon=True)
+        self._thread.start()
+
+    # -------------------------------
+    # READS
+    # -------------------------------
+    def get(self, uid: str):
+        """Return one record, including writes still waiting to commit."""
+        with self._cond:
+            record = self._pending.get(uid)
+        if record is not None:
+            return record
+        return self.inner.get(uid)
+
+    def get_for_update(self, uid: str):
+        with self._cond:
+            record = self._pending.get(uid)
+        if record is not None:
+            return copy.deepcopy(record)
+        return self.inner.get_for_update(uid)
+
+    def get_many(self, uids):
+        """Return {uid: record}; queued writes win over stored records."""
+        with self._cond:
+            found = {uid: self._pending[uid] for uid in uids if uid in self._pending}
+        missing = [uid for uid in uids if uid not in found]
+        if missing:
+            found.update(self.inner.get_many(missing))
+        return found
+
+    # -------------------------------
+    # WRITES
+    # -------------------------------
+    def put(self, uid: str, record: dict):
+        """Queue one record and wait until its batch is committed."""
+        self.put_many([(uid, record)])
+
+    def put_many(self, items):
+        """Queue several records and wait until their batch is committed."""
+        with self._cond:
+            if self._stop:
+                batch = None
+            else:
+                batch = self._batch
+                for uid, record in items:
+                    batch.items[uid] = record
+                    self._pending[uid] = record
+                self._cond.notify_all()
+
+        # Writer already shut down (atexit): write directly
+        if batch is None:
+            self.inner.put_many(items)
+            return
+
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._batch.items and not self._stop:
+                    self._cond.wait()
+                if not self._batch.items:
+                    return
+
+                # Give concurrent handlers a short window to join this batch
+                deadline = time.monotonic() + self.window
+                while not self._stop and len(self._batch.items) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._batch
+                self._batch = _Batch()
+
+            self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            self.inner.put_many(list(batch.items.items()))
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch.items)} records failed: {e}")
+            batch.error = e
+
+        with self._cond:
+            # Drop pending entries unless a newer write replaced them
+            for uid, record in batch.items.items():
+                if self._pending.get(uid) is record:
+                    del self._pending[uid]
+            self._cond.notify_all()
+
+        batch.done.set()
+
+    # -------------------------------
+    # WHOLE DATABASE (legacy callers)
+    # -------------------------------
+    def flush(self):
+        """Wait for queued writes, then flush the wrapped engine."""
+        with self._cond:
+            while self._pending and not self._stop:
+                self._cond.wait()
+        self.inner.flush()
+
+    def iter_users(self):
+        self.flush()
+        return self.inner.iter_users()
+
+    def load_all(self) -> dict:
+        self.flush()
+        return self.inner.load_all()
+
+    def save_all(self, db: dict):
+        self.flush()
+        self.inner.save_all(db)
+
+    def close(self):
+        """Commit whatever is queued, stop the writer and close the engine."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.inner.close()
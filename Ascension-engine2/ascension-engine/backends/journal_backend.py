@@ -0,0 +1,259 @@
+"""
+backends/journal_backend.py
+Append-only journal + snapshot storage engine for PWN Ascension.
+
+The whole database lives in memory. Every write appends a small delta
+record (user id + changed fields) to a journal file and fsyncs it, so
+write cost follows the size of the change, not the size of the database.
+A background compactor periodically folds the journal into a fresh
+snapshot of database.json.
+
+Startup: load the snapshot, then replay the journal on top of it.
+
+Journal line format (compact JSON, one per line):
+  {"u": "<uid>", "s": {<field>: <value>, ...}, "d": [<removed field>, ...]}
+"""
+
+import os
+import copy
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JournalBackend:
+    """In-memory store persisted as snapshot + append-only delta journal."""
+
+    def __init__(self, snapshot_path: str, journal_path: str,
+                 compact_interval=60.0, compact_bytes=8 * 1024 * 1024):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_interval = compact_interval
+        self.compact_bytes = compact_bytes
+
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._db = self._read_snapshot()
+        self._replay()
+        self._journal = open(journal_path, "ab")
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        if compact_interval > 0:
+            self._thread = threading.Thread(target=self._compact_loop, name="db-journal-compact", daemon=True)
+            self._thread.start()
+
+    # -------------------------------
+    # STARTUP
+    # -------------------------------
+    def _read_snapshot(self) -> dict:
+        try:
+            with open(self.snapshot_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Could not read snapshot {self.snapshot_path}: {e}")
+            return {}
+
+    def _replay(self):
+        """Apply every complete journal line to the loaded snapshot."""
+        if not os.path.exists(self.journal_path):
+            return
+
+        good_size = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                _apply(self._db, entry)
+                good_size += len(line)
+
+        # Cut a torn last line (crash mid-append) so new entries start clean
+        if good_size < os.path.getsize(self.journal_path):
+            logger.warning("Dropping incomplete journal entry")
+            os.truncate(self.journal_path, good_size)
+
+    # -------------------------------
+    # SINGLE RECORD
+    # -------------------------------
+    def get(self, uid: str):
+        """Return a private copy of one user record, or None."""
+        with self._lock:
+            record = self._db.get(uid)
+        return copy.deepcopy(record) if record is not None else None
+
+    get_for_update = get
+
+    def get_many(self, uids):
+        """Return {uid: record} (private copies) for the uids that exist."""
+        with self._lock:
+            found = {uid: self._db[uid] for uid in uids if uid in self._db}
+        return copy.deepcopy(found)
+
+    def put(self, uid: str, record: dict):
+        """Journal the changed fields of one record."""
+        self.put_many([(uid, record)])
+
+    def put_many(self, items):
+        """Journal several records with a single append + fsync."""
+        with self._lock:
+            lines = []
+            for uid, record in items:
+                entry = _delta(uid, self._db.get(uid), record)
+                if entry is None:
+                    continue
+                lines.append(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+                self._db[uid] = copy.deepcopy(record)
+
+            if lines:
+                self._journal.write(b"".join(lines))
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+
+            journal_size = self._journal.tell()
+
+        if journal_size >= self.compact_bytes:
+            self._request_compact()
+
+    def iter_users(self):
+        """Yield (uid, record) for every user. Records are read-only."""
+        with self._lock:
+            items = list(self._db.items())
+        for uid, record in items:
+            if isinstance(record, dict):
+                yield uid, record
+
+    # -------------------------------
+    # WHOLE DATABASE (legacy callers)
+    # -------------------------------
+    def load_all(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._db)
+
+    def save_all(self, db: dict):
+        """Replace the whole database with a new snapshot and empty journal."""
+        with self._compact_lock:
+            with self._lock:
+                self._db = copy.deepcopy(db)
+                _write_snapshot(self.snapshot_path, self._db)
+                self._journal.close()
+                self._journal = open(self.journal_path, "wb")
+
+    # -------------------------------
+    # COMPACTION
+    # -------------------------------
+    def compact(self):
+        """
+        Fold the journal into a new snapshot.
+
+        Records are replaced, never mutated, so a shallow copy taken under
+        the lock is a consistent view to serialize without blocking writers.
+        Entries appended while the snapshot is written are carried over into
+        the new journal. If we crash between replacing the snapshot and the
+        journal, replaying the old journal over the new snapshot is harmless:
+        each entry sets absolute values.
+        """
+        with self._compact_lock:
+            with self._lock:
+                self._journal.flush()
+                offset = self._journal.tell()
+                if offset == 0:
+                    return
+                view = dict(self._db)
+
+            _write_snapshot(self.snapshot_path, view)
+
+            with self._lock:
+                self._journal.flush()
+                with open(self.journal_path, "rb") as f:
+                    f.seek(offset)
+                    tail = f.read()
+
+                temp_path = self.journal_path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                self._journal.close()
+                os.replace(temp_path, self.journal_path)
+                self._journal = open(self.journal_path, "ab")
+
+    def _request_compact(self):
+        if self._thread is not None:
+            self._wake.set()
+        else:
+            self.compact()
+
+    def _compact_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.compact_interval)
+            self._wake.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Journal compaction failed: {e}")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.compact()
+        with self._lock:
+            self._journal.close()
+
+
+# ---------------------------------------------------------
+# INTERNAL HELPERS
+# ---------------------------------------------------------
+def _delta(uid, old, new):
+    """Journal entry for the fields that differ between old and new."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None if old == new else {"u": uid, "r": new}
+
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    removed = [k for k in old if k not in new]
+    if not changed and not removed:
+        return None
+
+    entry = {"u": uid, "s": changed}
+    if removed:
+        entry["d"] = removed
+    return entry
+
+
+def _apply(db, entry):
+    """Apply one journal entry to the in-memory database."""
+    uid = entry["u"]
+
+    # Whole-value replacement (non-dict entries such as meta values)
+    if "r" in entry:
+        db[uid] = entry["r"]
+        return
+
+    record = db.get(uid)
+    record = dict(record) if isinstance(record, dict) else {}
+    record.update(entry.get("s", {}))
+    for key in entry.get("d", []):
+        record.pop(key, None)
+    db[uid] = record
+
+
+def _write_snapshot(path, db):
+    """Write a snapshot atomically (tmp file + fsync + os.replace)."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(db, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
@@ -0,0 +1,84 @@
+"""
+backends/json_backend.py
+Whole-file JSON storage engine (the original PWN Ascension store).
+
+Every read parses the entire file and every write rewrites it, so cost
+grows with the number of users. Kept for small deployments and as the
+source format for migrations.
+"""
+
+import os
+import json
+import threading
+
+
+class JsonBackend:
+    """Storage engine backed by a single pretty-printed JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        # If JSON database does not exist → create empty
+        if not os.path.exists(path):
+            self.save_all({})
+
+    # -------------------------------
+    # WHOLE DATABASE
+    # -------------------------------
+    def load_all(self) -> dict:
+        """Load and return entire JSON database."""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_all(self, db: dict):
+        """Safely write the database to disk."""
+        # Write to temporary file first (prevents corruption)
+        temp_path = self.path + ".tmp"
+
+        with open(temp_path, "w") as f:
+            json.dump(db, f, indent=4)
+
+        # Replace the old file atomically
+        os.replace(temp_path, self.path)
+
+    # -------------------------------
+    # SINGLE RECORD
+    # -------------------------------
+    def get(self, uid: str):
+        """Return one user record, or None."""
+        return self.load_all().get(uid)
+
+    # Records are parsed fresh on every read, so callers may mutate them
+    get_for_update = get
+
+    def get_many(self, uids):
+        """Return {uid: record} for the uids that exist, with one file parse."""
+        db = self.load_all()
+        return {uid: db[uid] for uid in uids if uid in db}
+
+    def put(self, uid: str, record: dict):
+        """Insert or replace one user record."""
+        self.put_many([(uid, record)])
+
+    def put_many(self, items):
+        """Insert or replace several records with one rewrite."""
+        with self._lock:
+            db = self.load_all()
+            db.update(items)
+            self.save_all(db)
+
+    def iter_users(self):
+        """Yield (uid, record) for every user in the store."""
+        for uid, record in self.load_all().items():
+            if isinstance(record, dict):
+                yield uid, record
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,56 @@
+"""
+backends/record_codec.py
+Storage wrapper converting between stored dicts and in-memory records.
+
+Engines below this layer only ever see plain JSON-ready dicts; layers
+above it (the user cache, database.transaction) work with record objects.
+Whole-database calls (load_all / save_all / iter_users) pass the stored
+form through unchanged for legacy callers.
+"""
+
+
+class RecordCodecBackend:
+    """Decode records read from `inner`, encode records written to it."""
+
+    def __init__(self, inner, decode, encode):
+        self.inner = inner
+        self.decode = decode
+        self.encode = encode
+
+    # -------------------------------
+    # SINGLE RECORD
+    # -------------------------------
+    def get(self, uid: str):
+        record = self.inner.get(uid)
+        return self.decode(record) if record is not None else None
+
+    def get_for_update(self, uid: str):
+        record = self.inner.get_for_update(uid)
+        return self.decode(record) if record is not None else None
+
+    def get_many(self, uids):
+        return {uid: self.decode(record) for uid, record in self.inner.get_many(uids).items()}
+
+    def put(self, uid: str, record):
+        self.inner.put(uid, self.encode(record))
+
+    def put_many(self, items):
+        self.inner.put_many([(uid, self.encode(record)) for uid, record in items])
+
+    # -------------------------------
+    # WHOLE DATABASE (stored form)
+    # -------------------------------
+    def iter_users(self):
+        return self.inner.iter_users()
+
+    def load_all(self) -> dict:
+        return self.inner.load_all()
+
+    def save_all(self, db: dict):
+        self.inner.save_all(db)
+
+    def flush(self):
+        self.inner.flush()
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,160 @@
+"""
+backends/sqlite_backend.py
+SQLite storage engine for PWN Ascension.
+
+Each user is one row keyed by user id, so reading or updating a single
+user costs the same no matter how many users exist.
+
+Includes:
+- Per-user get / put by primary key
+- Full load / save for legacy whole-database callers
+- One-shot migration from the old database.json
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+
+_UPSERT = (
+    "INSERT INTO users (uid, data) VALUES (?, ?) "
+    "ON CONFLICT(uid) DO UPDATE SET data = excluded.data"
+)
+
+
+class SqliteBackend:
+    """Storage engine backed by a single SQLite table (uid → JSON blob)."""
+
+    def __init__(self, path: str, synchronous="NORMAL"):
+        self.path = path
+        self._lock = threading.Lock()
+
+        # One shared connection; PTB worker threads serialize on the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL may lose the last commits on power failure (never corrupts);
+        # FULL syncs the WAL on every commit
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "uid TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL)"
+        )
+
+    # -------------------------------
+    # SINGLE RECORD
+    # -------------------------------
+    def get(self, uid: str):
+        """Return one user record, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM users WHERE uid = ?", (uid,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Records are parsed fresh on every read, so callers may mutate them
+    get_for_update = get
+
+    def get_many(self, uids):
+        """Return {uid: record} for the uids that exist, in one query."""
+        uids = list(dict.fromkeys(uids))
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(uids), 500):
+            chunk = uids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT uid, data FROM users WHERE uid IN ({marks})", chunk
+                ).fetchall()
+            for uid, data in rows:
+                found[uid] = json.loads(data)
+        return found
+
+    def put(self, uid: str, record: dict):
+        """Insert or replace one user record."""
+        data = _encode(record)
+        with self._lock:
+            self._conn.execute(_UPSERT, (uid, data))
+
+    def put_many(self, items):
+        """Insert or replace several records in one SQLite transaction."""
+        rows = [(uid, _encode(record)) for uid, record in items]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def iter_users(self):
+        """Yield (uid, record) for every user in the store."""
+        with self._lock:
+            rows = self._conn.execute("SELECT uid, data FROM users").fetchall()
+        for uid, data in rows:
+            record = json.loads(data)
+            if isinstance(record, dict):
+                yield uid, record
+
+    # -------------------------------
+    # WHOLE DATABASE (legacy callers)
+    # -------------------------------
+    def load_all(self) -> dict:
+        """Return every row as a {uid: record} dict."""
+        with self._lock:
+            rows = self._conn.execute("SELECT uid, data FROM users").fetchall()
+        return {uid: json.loads(data) for uid, data in rows}
+
+    def save_all(self, db: dict):
+        """Replace the whole table with the contents of `db`."""
+        rows = [(uid, _encode(record)) for uid, record in db.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM users")
+                self._conn.executemany("INSERT INTO users (uid, data) VALUES (?, ?)", rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # -------------------------------
+    # MIGRATION
+    # -------------------------------
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone()
+        return row is None
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Import an existing database.json into an empty table.
+        Does nothing if the table already has rows or the file is missing.
+        Returns the number of imported entries.
+        """
+        if not os.path.exists(json_path) or not self.is_empty():
+            return 0
+
+        try:
+            with open(json_path, "r") as f:
+                db = json.load(f)
+        except Exception:
+            return 0
+
+        self.save_all(db)
+        return len(db)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _encode(record) -> str:
+    """Compact JSON for row storage."""
+    return json.dumps(record, separators=(",", ":"))
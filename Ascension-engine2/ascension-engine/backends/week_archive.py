@@ -0,0 +1,203 @@
+"""
+backends/week_archive.py
+Weekly leaderboard archive for PWN Ascension.
+
+When a week closes, its final standings are written once to an
+immutable columnar file, storage/weeks/<week>.wk (week = date of its
+Monday):
+
+  header   magic | rows u32 | top rows u32
+  uid      u64 × rows      sorted ascending (binary-searched)
+  xp       u32 × rows
+  grinds   u32 × rows
+  rank     u32 × rows      1-based XP position that week
+  top      u32 × top rows  row numbers of the best XP, in order
+
+Files are memory-mapped on read: a user's result for one week is a
+binary search over the uid column, so "my last N weeks" costs O(N log n)
+and never touches the user store or the activity log.
+"""
+
+import os
+import mmap
+import struct
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+FILE_HEADER = struct.Struct("<8sII")    # magic, rows, top rows
+UID = struct.Struct("<Q")
+U32 = struct.Struct("<I")
+
+MAGIC = b"PWNWEEK1"
+SUFFIX = ".wk"
+
+
+class _WeekFile:
+    """Read-only view of one archived week."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mm) < FILE_HEADER.size:
+            self.mm.close()
+            raise ValueError(f"{path} is not a week archive")
+
+        magic, self.rows, self.top_rows = FILE_HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.mm.close()
+            raise ValueError(f"{path} is not a week archive")
+
+        self.uid_at = FILE_HEADER.size
+        self.xp_at = self.uid_at + self.rows * UID.size
+        self.grinds_at = self.xp_at + self.rows * U32.size
+        self.rank_at = self.grinds_at + self.rows * U32.size
+        self.top_at = self.rank_at + self.rows * U32.size
+
+        if len(self.mm) < self.top_at + self.top_rows * U32.size:
+            self.mm.close()
+            raise ValueError(f"{path} is truncated")
+
+    def uid(self, row):
+        return UID.unpack_from(self.mm, self.uid_at + row * UID.size)[0]
+
+    def column(self, start, row):
+        return U32.unpack_from(self.mm, start + row * U32.size)[0]
+
+    def find(self, uid: int):
+        """Row of a user, or None (binary search on the uid column)."""
+        lo, hi = 0, self.rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.uid(mid) < uid:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.rows and self.uid(lo) == uid:
+            return lo
+        return None
+
+    def result(self, row):
+        return {
+            "xp": self.column(self.xp_at, row),
+            "grinds": self.column(self.grinds_at, row),
+            "rank": self.column(self.rank_at, row),
+            "total": self.rows,
+        }
+
+    def top(self, limit):
+        rows = [self.column(self.top_at, i) for i in range(min(limit, self.top_rows))]
+        return [(str(self.uid(row)), self.column(self.xp_at, row)) for row in rows]
+
+    def close(self):
+        self.mm.close()
+
+
+class WeekArchive:
+    """Directory of archived weeks, one columnar file per week."""
+
+    def __init__(self, directory: str, top_rows=10):
+        self.directory = directory
+        self.top_rows = top_rows
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._weeks = sorted(
+            name[:-len(SUFFIX)]
+            for name in os.listdir(directory)
+            if name.endswith(SUFFIX)
+        )
+
+    def _path(self, week: str) -> str:
+        return os.path.join(self.directory, week + SUFFIX)
+
+    # -------------------------------
+    # WRITE (once per week)
+    # -------------------------------
+    def write(self, week: str, ranked):
+        """
+        Archive one week. `ranked` is [(uid, xp, grinds), ...] in final
+        XP order. An already archived week is left as it is.
+        """
+        with self._lock:
+            if week in self._weeks:
+                return
+
+            ranked = [(int(uid), xp, grinds) for uid, xp, grinds in ranked]
+            by_uid = sorted(range(len(ranked)), key=lambda i: ranked[i][0])
+            row_of = {pos: row for row, pos in enumerate(by_uid)}
+            rows = len(ranked)
+            top_rows = min(self.top_rows, rows)
+
+            parts = [
+                FILE_HEADER.pack(MAGIC, rows, top_rows),
+                struct.pack(f"<{rows}Q", *(ranked[i][0] for i in by_uid)),
+                struct.pack(f"<{rows}I", *(ranked[i][1] for i in by_uid)),
+                struct.pack(f"<{rows}I", *(ranked[i][2] for i in by_uid)),
+                struct.pack(f"<{rows}I", *(i + 1 for i in by_uid)),
+                struct.pack(f"<{top_rows}I", *(row_of[i] for i in range(top_rows))),
+            ]
+
+            path = self._path(week)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                for part in parts:
+                    f.write(part)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+            self._weeks.append(week)
+            self._weeks.sort()
+            logger.info(f"Archived week {week} ({rows} players)")
+
+    # -------------------------------
+    # READ
+    # -------------------------------
+    def weeks(self, limit=None):
+        """Archived week keys, newest first."""
+        with self._lock:
+            weeks = self._weeks[::-1]
+        return weeks[:limit] if limit else weeks
+
+    def _open(self, week):
+        try:
+            return _WeekFile(self._path(week))
+        except (OSError, ValueError) as e:
+            logger.error(f"Week archive {week} unreadable: {e}")
+            return None
+
+    def user_history(self, uid, weeks=8):
+        """
+        [(week, result or None), ...] for the last `weeks` archived weeks,
+        newest first. A result is {"xp", "grinds", "rank", "total"}; None
+        means the user had no stats that week.
+        """
+        history = []
+        for week in self.weeks(weeks):
+            wf = self._open(week)
+            if wf is None:
+                continue
+            try:
+                row = wf.find(int(uid))
+                history.append((week, wf.result(row) if row is not None else None))
+            finally:
+                wf.close()
+        return history
+
+    def top(self, week: str, limit=3):
+        """[(uid, xp), ...] final top of one archived week."""
+        wf = self._open(week)
+        if wf is None:
+            return []
+        try:
+            return wf.top(limit)
+        finally:
+            wf.close()
+
+    def hall_of_fame(self, weeks=8, limit=3):
+        """[(week, [(uid, xp), ...]), ...] for the last `weeks` weeks, newest first."""
+        return [(week, self.top(week, limit)) for week in self.weeks(weeks)]
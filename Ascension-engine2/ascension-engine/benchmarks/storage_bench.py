@@ -0,0 +1,254 @@
+"""
+benchmarks/storage_bench.py
+Storage benchmark for PWN Ascension.
+
+Generates a synthetic database.json-shaped population, starts the bot's
+storage layer on it and measures latency / throughput of the hot user
+operations for each storage engine and population size.
+
+Every (engine, size) pair runs in its own subprocess, because the
+storage engine is chosen when `database` is imported.
+
+Usage (from the ascension-engine folder):
+    python benchmarks/storage_bench.py --sizes 1000,100000,1000000
+    python benchmarks/storage_bench.py --backends sqlite,journal --out results.json --csv results.csv
+
+Output: one JSON row per (engine, size, operation) with count, total
+seconds, ops/s and mean / p50 / p95 / p99 latency in milliseconds.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import atexit
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIELDS = ["backend", "cache", "users", "op", "count", "total_s", "ops_per_s",
+          "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+
+
+# ---------------------------------------------------------
+# SYNTHETIC POPULATION
+# ---------------------------------------------------------
+def make_user(uid: int, rng: random.Random, activity: int) -> dict:
+    """A user record in the original database.json shape."""
+    xp = int(rng.paretovariate(1.2) * 100)
+    now = int(time.time())
+    return {
+        "username": f"user{uid}",
+        "xp": xp,
+        "rank": "Bronze",
+        "streak": rng.randint(0, 30),
+        "grinds_today": 0,
+        "last_grind": 0,
+        "last_grind_date": None,
+        "badges": rng.sample(["First Grind", "Grinder", "XP Hunter", "Streak Master"], rng.randint(0, 3)),
+        "onboarding_step": 4,
+        "onboarding_complete": True,
+        "verified": rng.random() < 0.5,
+        "settings": {"notifications": True, "theme": "Dark", "language": "English"},
+        "activity": [
+            {"time": now - i * 60, "text": "Performed grind (+50 XP)"}
+            for i in range(activity)
+        ],
+        "weekly": {"xp": rng.randint(0, 5000), "grinds": rng.randint(0, 100), "badges": 0},
+        "last_spin": None,
+        "badge_fragments": 0,
+        "xp_boost_until": None,
+        "created_at": now - rng.randint(0, 90 * 86400),
+    }
+
+
+def write_population(path: str, users: int, activity: int, seed: int):
+    """Stream a {uid: record} JSON file without holding it all in memory."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("{")
+        for uid in range(1, users + 1):
+            if uid > 1:
+                f.write(",")
+            f.write(json.dumps(str(uid)))
+            f.write(":")
+            f.write(json.dumps(make_user(uid, rng, activity), separators=(",", ":")))
+        f.write("}")
+
+
+# ---------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------
+def measure(op: str, fn, args_list):
+    """Run fn(*args) for each entry and return a result row (without engine fields)."""
+    samples = []
+    start = time.perf_counter()
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    return summarize(op, samples, total)
+
+
+def summarize(op: str, samples, total):
+    samples = sorted(samples)
+    n = len(samples)
+
+    def pct(p):
+        return samples[min(n - 1, int(p * n))] * 1000 if n else 0.0
+
+    return {
+        "op": op,
+        "count": n,
+        "total_s": round(total, 6),
+        "ops_per_s": round(n / total, 2) if total > 0 else 0.0,
+        "mean_ms": round(sum(samples) / n * 1000, 4) if n else 0.0,
+        "p50_ms": round(pct(0.50), 4),
+        "p95_ms": round(pct(0.95), 4),
+        "p99_ms": round(pct(0.99), 4),
+    }
+
+
+# ---------------------------------------------------------
+# WORKER (one engine + one size, in its own process)
+# ---------------------------------------------------------
+def run_worker(args):
+    storage = tempfile.mkdtemp(prefix="pwn-bench-")
+    # Registered before `database` is imported, so it runs after database.close()
+    atexit.register(shutil.rmtree, storage, True)
+
+    write_population(os.path.join(storage, "database.json"), args.users, args.activity, args.seed)
+
+    os.environ["STORAGE_DIR"] = storage
+    os.environ["DB_BACKEND"] = args.backend
+    os.environ["DB_CACHE_MAX_USERS"] = str(args.cache)
+    sys.path.insert(0, ENGINE_DIR)
+
+    rows = []
+
+    # Startup includes migration / snapshot load of the population
+    t0 = time.perf_counter()
+    import database
+    rows.append(summarize("startup", [time.perf_counter() - t0], time.perf_counter() - t0))
+
+    from modules.grinding import perform_grind
+    from modules.leaderboard import get_top, handle_weekly_reset
+    # Grind subscribers register on import, as router.py does for the bot
+    import modules.badges, modules.challenges  # noqa: F401
+    from utils.activity_events import EVENT_GRIND
+
+    rng = random.Random(args.seed + 1)
+    existing = lambda: rng.randint(1, args.users)
+    ops = args.ops
+    slow_ops = args.slow_ops
+
+    rows.append(measure("get_user", database.get_user,
+                        [(existing(),) for _ in range(ops)]))
+    rows.append(measure("init_user", database.init_user,
+                        [(args.users + 1 + i, f"new{i}") for i in range(ops)]))
+    rows.append(measure("log_activity", database.log_activity,
+                        [(existing(), EVENT_GRIND, 50) for _ in range(ops)]))
+
+    # Distinct users so the grind cooldown never short-circuits
+    grinders = rng.sample(range(1, args.users + 1), min(ops, args.users))
+    rows.append(measure("perform_grind", perform_grind, [(uid,) for uid in grinders]))
+
+    rows.append(measure("flush", database.flush, [()]))
+    rows.append(measure("get_top_xp", get_top, [("xp", 10) for _ in range(slow_ops)]))
+    rows.append(measure("handle_weekly_reset", handle_weekly_reset, [()]))
+
+    for row in rows:
+        row.update(backend=args.backend, cache=args.cache, users=args.users)
+
+    json.dump(rows, sys.stdout)
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def run_all(args):
+    results = []
+    for users in args.sizes:
+        for backend in args.backends:
+            if backend == "json" and users > args.json_max_users:
+                print(f"skip json @ {users} users (over --json-max-users)", file=sys.stderr)
+                continue
+
+            print(f"{backend} @ {users} users (cache {args.cache})...", file=sys.stderr)
+            cmd = [
+                sys.executable, os.path.abspath(__file__), "--worker",
+                "--backend", backend,
+                "--users", str(users),
+                "--ops", str(min(args.ops, users)),
+                "--slow-ops", str(args.slow_ops),
+                "--activity", str(args.activity),
+                "--cache", str(args.cache),
+                "--seed", str(args.seed),
+            ]
+            proc = subprocess.run(cmd, cwd=ENGINE_DIR, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(proc.stderr, file=sys.stderr)
+                continue
+
+            # Worker prints a single JSON array as its last line
+            rows = json.loads(proc.stdout.strip().splitlines()[-1])
+            for row in rows:
+                print(f"  {row['op']:<20} {row['ops_per_s']:>12} ops/s  p95 {row['p95_ms']} ms", file=sys.stderr)
+            results.extend(rows)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for row in results:
+                writer.writerow({k: row[k] for k in FIELDS})
+
+
+def _csv_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PWN Ascension storage benchmark")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in _csv_list(v)], default=[1000, 100000, 1000000],
+                        help="comma-separated population sizes")
+    parser.add_argument("--backends", type=_csv_list, default=["sqlite", "journal", "json"],
+                        help="comma-separated DB_BACKEND values")
+    parser.add_argument("--ops", type=int, default=1000, help="iterations of each per-user operation")
+    parser.add_argument("--slow-ops", type=int, default=5, help="iterations of get_top_xp")
+    parser.add_argument("--activity", type=int, default=0,
+                        help="old-style in-record activity entries per user (imported at startup)")
+    parser.add_argument("--cache", type=int, default=50000, help="DB_CACHE_MAX_USERS for the run (0 = no cache)")
+    parser.add_argument("--json-max-users", type=int, default=100000,
+                        help="skip the json engine above this size (every write rewrites the file)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write JSON results here instead of stdout")
+    parser.add_argument("--csv", help="also write CSV results here")
+
+    # Internal: run one (engine, size) pair
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    parser.add_argument("--users", type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        run_all(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,57 @@
 import os
 import json
 import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
 from typing import Optional
 
+from backends.json_backend import JsonBackend
+from backends.sqlite_backend import SqliteBackend
+from backends.journal_backend import JournalBackend
+from backends.group_commit import GroupCommitBackend
+from backends.record_codec import RecordCodecBackend
+from backends.cache import CachedBackend
+from backends.activity_store import ActivityStore
+from utils.activity_events import render_event, parse_legacy_text
+from utils.epochs import current_epochs
+from user_record import UserRecord
+
+logger = logging.getLogger(__name__)
+
 # Storage folder
-STORAGE_DIR = "storage"
+STORAGE_DIR = os.getenv("STORAGE_DIR", "storage")
 DB_PATH = os.path.join(STORAGE_DIR, "database.json")
+SQLITE_PATH = os.path.join(STORAGE_DIR, "database.sqlite3")
+JOURNAL_PATH = os.path.join(STORAGE_DIR, "database.journal")
+META_PATH = os.path.join(STORAGE_DIR, "meta.json")
+ACTIVITY_DIR = os.path.join(STORAGE_DIR, "activity")
+# Archived final standings of closed leaderboard weeks
+WEEKS_DIR = os.path.join(STORAGE_DIR, "weeks")
+
+# Storage engine: "sqlite" (default), "journal" (database.json snapshot
+# + append-only delta journal) or "json" (original whole-file store)
+DB_BACKEND = os.getenv("DB_BACKEND", "sqlite").lower()
+
+# Journal engine: fold the journal into a new snapshot every N seconds
+# or once it grows past N bytes
+JOURNAL_COMPACT_INTERVAL = float(os.getenv("DB_JOURNAL_COMPACT_INTERVAL", "60"))
+JOURNAL_COMPACT_BYTES = int(os.getenv("DB_JOURNAL_COMPACT_BYTES", str(8 * 1024 * 1024)))
+
+# Group commit: batch concurrent writes arriving within N ms into one
+# storage commit (0 disables it; each write then commits on its own).
+# Only used with the cache off (DB_CACHE_MAX_USERS=0)
+GROUP_COMMIT_MS = float(os.getenv("DB_GROUP_COMMIT_MS", "0"))
+
+# Write-back user cache (DB_CACHE_MAX_USERS=0 disables it)
+CACHE_MAX_USERS = int(os.getenv("DB_CACHE_MAX_USERS", "50000"))
+CACHE_FLUSH_INTERVAL = float(os.getenv("DB_CACHE_FLUSH_INTERVAL", "5"))
+CACHE_FLUSH_THRESHOLD = int(os.getenv("DB_CACHE_FLUSH_THRESHOLD", "200"))
+
+# Activity log entries kept per user (oldest are overwritten)
+ACTIVITY_RETENTION = int(os.getenv("DB_ACTIVITY_RETENTION", "500"))
+ACTIVITY_SHARDS = int(os.getenv("DB_ACTIVITY_SHARDS", "16"))
 
 
 # -------------------------------
@@ -13,114 +59,387 @@ DB_PATH = os.path.join(STORAGE_DIR, "database.json")
 # -------------------------------
 os.makedirs(STORAGE_DIR, exist_ok=True)
 
-# If JSON database does not exist → create empty
-if not os.path.exists(DB_PATH):
-    with open(DB_PATH, "w") as f:
-        json.dump({}, f, indent=4)
+
+# -------------------------------
+# OPEN STORAGE ENGINE
+# -------------------------------
+def _open_backend():
+    """
+    Build the configured storage engine.
+
+    Engines store plain dicts; the codec layer turns them into UserRecord
+    objects, which is what the cache holds and transactions hand out.
+
+    Every engine exposes:
+      get(uid) / put(uid, record)   single user by primary key
+      get_for_update(uid)           a copy the caller may mutate
+      get_many(uids)                {uid: record} for existing uids, one round-trip
+      put_many(items)               several (uid, record) pairs at once
+      iter_users()                  (uid, record) for all users
+      load_all() / save_all(db)     whole database (legacy callers)
+      flush() / close()             write pending changes / release resources
+    """
+    if DB_BACKEND == "json":
+        backend = JsonBackend(DB_PATH)
+
+    elif DB_BACKEND == "sqlite":
+        # Group commit syncs once per batch, so it can afford a full sync
+        group_commit = GROUP_COMMIT_MS > 0 and CACHE_MAX_USERS == 0
+        backend = SqliteBackend(SQLITE_PATH, synchronous="FULL" if group_commit else "NORMAL")
+        # One-shot import of the old JSON file on first start
+        backend.migrate_from_json(DB_PATH)
+
+    elif DB_BACKEND == "journal":
+        backend = JournalBackend(
+            DB_PATH,
+            JOURNAL_PATH,
+            compact_interval=JOURNAL_COMPACT_INTERVAL,
+            compact_bytes=JOURNAL_COMPACT_BYTES
+        )
+
+    else:
+        raise ValueError(f"Unknown DB_BACKEND: {DB_BACKEND}")
+
+    # Group commit batches handler commits. The write-back cache already
+    # returns commits from memory and flushes in batches of its own, so
+    # underneath it group commit would have nothing left to coalesce.
+    if GROUP_COMMIT_MS > 0 and CACHE_MAX_USERS > 0:
+        logger.warning("DB_GROUP_COMMIT_MS is ignored while the user cache is on (set DB_CACHE_MAX_USERS=0 to use group commit)")
+    elif GROUP_COMMIT_MS > 0:
+        backend = GroupCommitBackend(backend, window_ms=GROUP_COMMIT_MS)
+
+    backend = RecordCodecBackend(backend, decode=UserRecord.from_dict, encode=UserRecord.to_dict)
+
+    if CACHE_MAX_USERS > 0:
+        backend = CachedBackend(
+            backend,
+            max_users=CACHE_MAX_USERS,
+            flush_interval=CACHE_FLUSH_INTERVAL,
+            flush_threshold=CACHE_FLUSH_THRESHOLD
+        )
+
+    return backend
+
+
+_backend = _open_backend()
+_activity = ActivityStore(ACTIVITY_DIR, retention=ACTIVITY_RETENTION, shards=ACTIVITY_SHARDS)
+
+
+def _import_text_log(uid, entries):
+    """Import (time, text) entries, oldest first, as event codes."""
+    if not uid.isdigit():
+        return
+    events = [(ts, *parse_legacy_text(text)) for ts, text in entries]
+    _activity.append_many(int(uid), events)
+
+
+def _migrate_activity():
+    """Import the old in-record text activity logs into the event store (once)."""
+    if _activity.is_migrated():
+        return
+
+    stripped = []
+    for uid, record in _backend.iter_users():
+        if "activity" not in record:
+            continue
+        entries = [
+            (entry.get("time", 0), entry.get("text", ""))
+            for entry in reversed(record.get("activity") or [])
+            if isinstance(entry, dict)
+        ]
+        _import_text_log(uid, entries[-ACTIVITY_RETENTION:])
+        stripped.append((uid, UserRecord.from_dict(record)))
+
+    if stripped:
+        _backend.put_many(stripped)
+        _backend.flush()
+
+    _activity.mark_migrated()
+
+
+_migrate_activity()
+
+
+# -------------------------------
+# FLUSH / SHUTDOWN
+# -------------------------------
+def flush():
+    """Write any cached changes to storage now."""
+    _backend.flush()
+    _activity.flush()
+
+
+def close():
+    """Flush and close the storage engine (runs automatically at exit)."""
+    _backend.close()
+    _activity.close()
+
+
+atexit.register(close)
 
 
 # -------------------------------
 # LOAD DATABASE
 # -------------------------------
 def load_db():
-    """Load and return entire JSON database."""
+    """Load and return entire database."""
+    return _backend.load_all()
+
+
+def iter_users():
+    """Yield (uid, record) for every stored user, in stored dict form."""
+    return _backend.iter_users()
+
+
+# -------------------------------
+# SAVE DATABASE
+# -------------------------------
+def save_db(db: dict):
+    """Safely write the entire database."""
+    _backend.save_all(db)
+    _run_hooks(_reload_hooks)
+
+
+# -------------------------------
+# META VALUES (job checkpoints etc.)
+# -------------------------------
+_meta_lock = threading.Lock()
+
+
+def get_meta(key: str, default=None):
+    """Read a small bot-wide value (kept outside the user store)."""
+    with _meta_lock:
+        return _read_meta().get(key, default)
+
+
+def set_meta(key: str, value):
+    """Durably write a small bot-wide value."""
+    with _meta_lock:
+        meta = _read_meta()
+        meta[key] = value
+
+        temp_path = META_PATH + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(meta, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, META_PATH)
+
+
+def _read_meta() -> dict:
     try:
-        with open(DB_PATH, "r") as f:
+        with open(META_PATH, "r") as f:
             return json.load(f)
-    except Exception:
+    except FileNotFoundError:
         return {}
 
 
 # -------------------------------
-# SAVE DATABASE
+# COMMIT HOOKS
 # -------------------------------
-def save_db(db: dict):
-    """Safely write the database to disk."""
-    # Write to temporary file first (prevents corruption)
-    temp_path = DB_PATH + ".tmp"
+_commit_hooks = []
+_reload_hooks = []
+_rollover_hooks = []
+
+
+def add_commit_hook(fn):
+    """
+    Call fn(uid, record, old_username) after every committed transaction
+    (uid is a str; old_username is the username the transaction started with).
+    """
+    _commit_hooks.append(fn)
+
 
-    with open(temp_path, "w") as f:
-        json.dump(db, f, indent=4)
+def add_reload_hook(fn):
+    """Call fn() after the whole database is replaced with save_db()."""
+    _reload_hooks.append(fn)
 
-    # Replace the old file atomically
-    os.replace(temp_path, DB_PATH)
+
+def add_rollover_hook(fn):
+    """
+    Call fn(uid, record, finished_weekly) when a user's weekly stats roll
+    over, inside their transaction (changes to record are committed).
+    """
+    _rollover_hooks.append(fn)
+
+
+def _run_hooks(hooks, *args):
+    # The write is already committed: a failing hook must not undo it
+    for hook in hooks:
+        try:
+            hook(*args)
+        except Exception as e:
+            logger.error(f"Hook {getattr(hook, '__name__', hook)} failed: {e}")
 
 
 # -------------------------------
-# INIT USER IF MISSING
+# DAY / WEEK ROLLOVER
+# -------------------------------
+def _roll_over(uid: str, user):
+    """
+    Zero the daily / weekly counters of a user first touched in a new
+    period. Replaces the old sweep over every user at each reset.
+    """
+    day, week = current_epochs()
+    finished = user.roll_over(day, week)
+    if finished is not None:
+        _run_hooks(_rollover_hooks, uid, user, finished)
+
+
+# -------------------------------
+# PER-USER TRANSACTIONS
 # -------------------------------
-def init_user(user_id: int, username: Optional[str] = None):
-    """Create a new user entry if they don't exist yet."""
+_user_locks = {}
+_user_locks_guard = threading.Lock()
+_open_tx = threading.local()
+
+
+def _user_lock(uid: str):
+    with _user_locks_guard:
+        lock = _user_locks.get(uid)
+        if lock is None:
+            lock = _user_locks[uid] = threading.RLock()
+        return lock
+
+
+@contextmanager
+def transaction(user_id: int):
+    """
+    Lock one user, load only their record and commit it once on exit.
+
+    Usage:
+        with transaction(user_id) as user:
+            user["xp"] += 50
+
+    Nested transactions for the same user in the same thread share the
+    record and are committed by the outermost one. If the block raises,
+    nothing is written.
+    """
+    uid = str(user_id)
+    open_records = _open_records()
+
+    # Re-entrant: join the transaction already open in this thread
+    if uid in open_records:
+        yield open_records[uid]
+        return
+
+    with _user_lock(uid):
+        user = _backend.get_for_update(uid)
+        if user is None:
+            user = UserRecord.new(user_id)
+        old_username = user.get("username")
+
+        after = _open_tx.after[uid] = []
+        open_records[uid] = user
+        try:
+            # Inside the open transaction, so events emitted by rollover
+            # hooks join it
+            _roll_over(uid, user)
+            yield user
+        finally:
+            del open_records[uid]
+            del _open_tx.after[uid]
+
+        _backend.put(uid, user)
+        _run_hooks(_commit_hooks, uid, user, old_username)
+        _run_hooks(after)
+
+
+def _open_records() -> dict:
+    """uid -> record of the transactions open in this thread."""
+    open_records = getattr(_open_tx, "records", None)
+    if open_records is None:
+        open_records = _open_tx.records = {}
+        _open_tx.after = {}
+    return open_records
+
+
+def after_commit(user_id: int, fn):
+    """
+    Call fn() once the transaction open for user_id in this thread has
+    committed; it is dropped if the transaction raises. With no open
+    transaction fn runs now.
+    """
     uid = str(user_id)
-    db = load_db()
-
-    if uid not in db:
-        db[uid] = {
-            "username": username if username else f"User{user_id}",
-            "xp": 0,
-            "rank": "Bronze",
-            "streak": 0,
-            "grinds_today": 0,
-            "last_grind": 0,
-            "last_grind_date": None,
-            "badges": [],
-            "onboarding_step": 1,
-            "onboarding_complete": False,
-            "verified": False,
-            "settings": {
-                "notifications": True,
-                "theme": "Dark",
-                "language": "English"
-            },
-            "activity": [],
-            "weekly": {
-                "xp": 0,
-                "grinds": 0,
-                "badges": 0
-            },
-            "last_spin": None,
-            "badge_fragments": 0,
-            "xp_boost_until": None,
-            "created_at": int(time.time())
-        }
-        save_db(db)
-    elif username and db[uid].get("username") != username:
-        db[uid]["username"] = username
-        save_db(db)
-
-    return load_db()[uid]
+    if uid in _open_records():
+        _open_tx.after[uid].append(fn)
+    else:
+        fn()
+
+
+def update_user(user_id: int, fn):
+    """Apply fn(user) inside a transaction and return its result."""
+    with transaction(user_id) as user:
+        return fn(user)
+
+
+# -------------------------------
+# INIT USER IF MISSING
+# -------------------------------
+def init_user(user_id: int, username: Optional[str] = None, chat_id: Optional[int] = None):
+    """
+    Create a new user entry if they don't exist yet (or roll over a stale
+    one). `chat_id` records membership of a group chat the user was seen in.
+    """
+    user = _backend.get(str(user_id))
+    if (user is not None and (not username or user.get("username") == username)
+            and (chat_id is None or chat_id in user.chats)
+            and user.is_current(*current_epochs())):
+        return user
+
+    with transaction(user_id) as user:
+        if username:
+            user["username"] = username
+        if chat_id is not None and chat_id not in user.chats:
+            user.chats.append(chat_id)
+
+    return user
 
 
 # -------------------------------
 # ACTIVITY LOGGING
 # -------------------------------
-def log_activity(user_id: int, text: str):
-    """Add an entry to user's activity log."""
-    db = load_db()
-    uid = str(user_id)
+def log_activity(user_id: int, code: int, payload: int = 0):
+    """Add an event (see utils/activity_events.py) to user's activity log."""
+    _activity.append(int(user_id), int(time.time()), code, payload)
 
-    if uid not in db:
-        init_user(user_id)
-        db = load_db()
 
-    log_list = db[uid].setdefault("activity", [])
-    log_list.insert(0, {
-        "time": int(time.time()),
-        "text": text
-    })
+def get_activity(user_id: int, offset: int = 0, limit: int = 10):
+    """
+    Return (entries, total) for one page of the log, newest first.
+    Entries are {"time", "text"} dicts rendered from the event templates.
+    """
+    events, total = _activity.page(int(user_id), offset, limit)
+    entries = [
+        {"time": ts, "text": render_event(code, payload)}
+        for ts, code, payload in events
+    ]
+    return entries, total
 
-    # Limit to last 500 entries
-    db[uid]["activity"] = log_list[:500]
 
-    save_db(db)
+def clear_activity(user_id: int):
+    """Delete a user's whole activity log."""
+    _activity.clear(int(user_id))
 
 
 # -------------------------------
 # GET USER OBJECT
 # -------------------------------
 def get_user(user_id: int):
-    db = load_db()
-    uid = str(user_id)
-    if uid not in db:
+    """
+    Read one user (created if missing). The first read in a new day or
+    week rolls their counters over, so stale values are never shown.
+    """
+    user = _backend.get(str(user_id))
+    if user is None or not user.is_current(*current_epochs()):
         return init_user(user_id)
-    return db[uid]
+    return user
+
+
+def get_users(user_ids):
+    """
+    Read several users with one storage round-trip.
+    Returns {str(user_id): record} for the users that exist (read-only;
+    missing users are not created).
+    """
+    return _backend.get_many([str(uid) for uid in user_ids])
@@ -0,0 +1,161 @@
+"""
+events.py
+In-process domain event bus for PWN Ascension.
+
+Handlers emit typed events (GrindPerformed, XpAwarded, GameFinished,
+BadgeUnlocked) and each subsystem subscribes to the types it cares
+about, so a new subsystem hooks in here instead of into every handler.
+
+Subscribers run either:
+- inline:   fn(event, user) inside the emitter's transaction, on the
+            record it already holds (changes commit with it)
+- deferred: fn(event) on a background worker once that transaction has
+            committed (dropped if it raises), off the response path
+
+The leaderboard index is not a subscriber: it follows every committed
+write through database.add_commit_hook().
+"""
+
+import queue
+import atexit
+import logging
+import threading
+
+from database import transaction, after_commit
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------
+# EVENT TYPES
+# ---------------------------------------------------------
+class Event:
+    __slots__ = ("user_id",)
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+
+    def _fields(self):
+        for cls in reversed(type(self).__mro__):
+            yield from getattr(cls, "__slots__", ())
+
+
+class GrindPerformed(Event):
+    """A grind went through (counters updated, XP already awarded)."""
+    __slots__ = ()
+
+
+class XpAwarded(Event):
+    """XP changed through the ledger; amount is the applied change (may be < 0)."""
+    __slots__ = ("amount", "source", "rank")
+
+    def __init__(self, user_id: int, amount: int, source: str, rank=None):
+        super().__init__(user_id)
+        self.amount = amount
+        self.source = source
+        self.rank = rank        # new rank if it changed, else None
+
+
+class GameFinished(Event):
+    """A mini-game round paid out or penalised."""
+    __slots__ = ("game", "xp")
+
+    def __init__(self, user_id: int, game: str, xp: int):
+        super().__init__(user_id)
+        self.game = game
+        self.xp = xp
+
+
+class BadgeUnlocked(Event):
+    """A badge was added to the user's collection."""
+    __slots__ = ("badge",)
+
+    def __init__(self, user_id: int, badge: str):
+        super().__init__(user_id)
+        self.badge = badge
+
+
+# ---------------------------------------------------------
+# SUBSCRIBE / EMIT
+# ---------------------------------------------------------
+_inline = {}        # event type -> [fn(event, user)]
+_deferred = {}      # event type -> [fn(event)]
+
+
+def subscribe(event_type, fn, deferred: bool = False):
+    """Call fn for every emitted event of event_type, in subscription order."""
+    (_deferred if deferred else _inline).setdefault(event_type, []).append(fn)
+    return fn
+
+
+def emit(event: Event):
+    """
+    Run inline subscribers now and queue deferred ones for after commit.
+
+    Joins the transaction the caller holds for event.user_id (the usual
+    case), so inline subscribers cost no extra read or write.
+    """
+    inline = _inline.get(type(event))
+    if inline:
+        with transaction(event.user_id) as user:
+            for fn in inline:
+                try:
+                    fn(event, user)
+                except Exception as e:
+                    logger.error(f"Subscriber {getattr(fn, '__name__', fn)} failed on {event!r}: {e}")
+
+    deferred = _deferred.get(type(event))
+    if deferred:
+        after_commit(event.user_id, lambda: _worker.put(event, deferred))
+
+
+# ---------------------------------------------------------
+# DEFERRED WORKER
+# ---------------------------------------------------------
+class _Worker:
+    """One background thread running deferred subscribers in event order."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def put(self, event, subscribers):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, name="event-worker", daemon=True)
+                    self._thread.start()
+        self._queue.put((event, list(subscribers)))
+
+    def _loop(self):
+        while True:
+            event, subscribers = self._queue.get()
+            for fn in subscribers:
+                try:
+                    fn(event)
+                except Exception as e:
+                    logger.error(f"Deferred subscriber {getattr(fn, '__name__', fn)} failed on {event!r}: {e}")
+            self._queue.task_done()
+
+    def drain(self):
+        """Block until every queued event has been handled."""
+        if self._thread is not None:
+            self._queue.join()
+
+
+_worker = _Worker()
+
+
+def drain():
+    """Wait for deferred subscribers to catch up (runs automatically at exit)."""
+    _worker.drain()
+
+
+# Registered after database's own atexit handler, so it runs before the
+# storage engine is closed
+atexit.register(drain)
@@ -12,6 +12,7 @@ from telegram.error import Conflict
 
 # ROUTER
 from router import handle_command, handle_callback
+from modules.leaderboard import schedule_weekly_reset
 
 # Logging
 logging.basicConfig(
@@ -50,6 +51,9 @@ def main():
             # Register callback query handler (catches all button presses)
             dispatcher.add_handler(CallbackQueryHandler(handle_callback))
             
+            # Weekly leaderboard reset (Monday 00:00 UTC)
+            schedule_weekly_reset(updater.job_queue)
+            
             # Start polling
             logger.info("Bot is running with polling...")
             updater.start_polling(drop_pending_updates=True)
@@ -9,7 +9,7 @@ Supports:
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db
+from database import get_user, get_activity
 from ui.components import render_text
 
 
@@ -37,15 +37,10 @@ def _show_activity_page(bot, update, page):
     user_id = query.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
-    logs = db.get(uid, {}).get("activity", [])
-
-    # Pagination
+    # Pagination: only the requested page is read
     start = page * ITEMS_PER_PAGE
     end = start + ITEMS_PER_PAGE
-    page_items = logs[start:end]
+    page_items, total = get_activity(user_id, start, ITEMS_PER_PAGE)
 
     text = "📜 *ACTIVITY LOG*\n\n"
     if not page_items:
@@ -63,7 +58,7 @@ def _show_activity_page(bot, update, page):
 
     if page > 0:
         nav_buttons.append(InlineKeyboardButton("⬅️ Prev", callback_data=f"act_{page-1}"))
-    if end < len(logs):
+    if end < total:
         nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"act_{page+1}"))
 
     keyboard = InlineKeyboardMarkup([
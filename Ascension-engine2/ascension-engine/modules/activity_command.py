@@ -4,9 +4,8 @@ Allows users to type /activity and instantly open the activity log.
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user
+from database import get_user, get_activity
 from ui.components import render_text
-from database import load_db
 
 
 ITEMS_PER_PAGE = 10
@@ -17,16 +16,12 @@ def handle_activity_command(bot, update):
     user_id = update.effective_user.id
 
     user = get_user(user_id)
-    db = load_db()
-    uid = str(user_id)
-
-    logs = db.get(uid, {}).get("activity", [])
     page = 0
 
     # First page
     start = 0
     end = ITEMS_PER_PAGE
-    page_items = logs[start:end]
+    page_items, total = get_activity(user_id, start, ITEMS_PER_PAGE)
 
     text = "📜 *ACTIVITY LOG*\n\n"
 
@@ -41,7 +36,7 @@ def handle_activity_command(bot, update):
 
     # Navigation buttons
     nav_buttons = []
-    if end < len(logs):
+    if end < total:
         nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data="act_1"))
 
     keyboard = InlineKeyboardMarkup([
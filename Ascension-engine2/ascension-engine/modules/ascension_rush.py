@@ -12,7 +12,8 @@ Simple, fast, reliable gameplay:
 import time
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 
@@ -128,17 +129,13 @@ def process_final(bot, update, chosen, correct, seq_index):
 
     seq = FLASH_SEQUENCES[seq_index]
 
-    db = load_db()
-    uid = str(user_id)
-
     if chosen == correct:
-        db[uid]["xp"] += XP_FINAL
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + XP_FINAL
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_FINAL, "ascension_rush")
 
         t = render_text(
             user,
-            f"🔥 Correct!\nFinal emoji *was* {correct}.\n+{XP_FINAL} XP\n\n"
+            f"🔥 Correct!\nFinal emoji *was* {correct}.\n+{XP_FINAL} XP"
+            + boost_note(XP_FINAL, gained) + "\n\n"
             "Now choose the correct count:"
         )
 
@@ -157,8 +154,7 @@ def process_final(bot, update, chosen, correct, seq_index):
         q.edit_message_text(t, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(k))
 
     else:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - PENALTY)
-        save_db(db)
+        award_xp(user_id, -PENALTY, "ascension_rush")
 
         t = render_text(user,
             f"💥 WRONG!\nFinal emoji was *{correct}*.\n−{PENALTY} XP"
@@ -172,23 +168,17 @@ def process_count(bot, update, chosen, correct):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     chosen = int(chosen)
     correct = int(correct)
 
     if chosen == correct:
-        db[uid]["xp"] += XP_COUNT
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + XP_COUNT
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_COUNT, "ascension_rush")
 
         t = render_text(user,
-            f"⚡ *AMAZING MEMORY!*\n\n+{XP_COUNT} XP"
+            f"⚡ *AMAZING MEMORY!*\n\n+{XP_COUNT} XP" + boost_note(XP_COUNT, gained)
         )
     else:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - PENALTY)
-        save_db(db)
+        award_xp(user_id, -PENALTY, "ascension_rush")
 
         t = render_text(user,
             f"💥 WRONG COUNT!\n−{PENALTY} XP"
@@ -0,0 +1,79 @@
+"""
+modules/badge_catalog.py
+Badge catalog for PWN Ascension.
+
+Every badge is declared once in data/badges.json: name, emoji,
+description, the rule that earns it (type + required_value) or the
+feature that awards it directly (awarded_by), and its progress text.
+The file is parsed once at import into read-only Badge entries shared
+by the badge rule engine (badges.py) and every screen, so a new badge
+is one catalog entry.
+"""
+
+import os
+import json
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Any
+
+
+CATALOG_PATH = os.getenv(
+    "BADGE_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "badges.json")
+)
+
+DEFAULT_EMOJI = "🔸"
+
+
+class Badge(NamedTuple):
+    name: str
+    emoji: str
+    description: str
+    type: Optional[str]             # rule type (badges.RULE_TYPES), None if awarded directly
+    required_value: Any
+    awarded_by: Optional[str]       # feature that unlocks it directly (e.g. "spin")
+    progress: str                   # format string; {value} / {required} for rule badges
+
+    def progress_text(self, value=None) -> str:
+        return self.progress.format(value=value, required=self.required_value)
+
+
+def _load(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)["badges"]
+
+    badges = {}
+    for entry in entries:
+        name = entry["name"]
+        if name in badges:
+            raise ValueError(f"Duplicate badge in {path}: {name}")
+        badges[name] = Badge(
+            name=name,
+            emoji=entry.get("emoji", DEFAULT_EMOJI),
+            description=entry.get("description", ""),
+            type=entry.get("type"),
+            required_value=entry.get("required_value"),
+            awarded_by=entry.get("awarded_by"),
+            progress=entry.get("progress", ""),
+        )
+    return badges
+
+
+# name -> Badge, in catalog order (read-only)
+CATALOG = MappingProxyType(_load(CATALOG_PATH))
+
+# awarded_by -> Badge
+_AWARDED_BY = MappingProxyType({b.awarded_by: b for b in CATALOG.values() if b.awarded_by})
+
+
+def get_badge(name: str) -> Optional[Badge]:
+    return CATALOG.get(name)
+
+
+def badge_emoji(name: str, default: str = DEFAULT_EMOJI) -> str:
+    badge = CATALOG.get(name)
+    return badge.emoji if badge is not None else default
+
+
+def awarded_by(feature: str) -> Badge:
+    """The badge a feature (e.g. "spin") unlocks directly."""
+    return _AWARDED_BY[feature]
@@ -6,10 +6,16 @@ Includes:
 - Badge list screen
 - Badge details screen
 - Progress bars
+- Badge rules compiled once from the catalog (badge_catalog.py) and
+  indexed by the field they depend on
+  (xp, streak, grinds, top3, onboarding); after a grind or XP award
+  only the rules on the changed fields are evaluated
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user, transaction
+from events import subscribe, emit, GrindPerformed, XpAwarded, BadgeUnlocked
+from modules.badge_catalog import CATALOG, badge_emoji
 from ui.components import render_text
 
 
@@ -40,22 +46,9 @@ def _show_badge_list(bot, update):
     user_id = query.from_user.id
     user = get_user(user_id)
 
-    badge_defs = get_badge_definitions()
     unlocked = user.get("badges", [])
 
-    # EMOJI MAP
-    emoji_map = {
-        "Initiate": "🟦",
-        "First Grind": "🔥",
-        "Grind Master": "⚡",
-        "Streak Keeper": "📅",
-        "Streak Legend": "💀",
-        "XP Hunter": "📈",
-        "XP Champion": "🏆",
-        "Dominator": "⚙️",
-    }
-
-    total_badges = len(badge_defs)
+    total_badges = len(CATALOG)
     unlocked_count = len(unlocked)
 
     text = (
@@ -68,8 +61,7 @@ def _show_badge_list(bot, update):
         text += "_You haven't unlocked any badges yet._\n\n"
     else:
         for b in unlocked:
-            emoji = emoji_map.get(b, "🔸")
-            text += f"{emoji} {b}\n"
+            text += f"{badge_emoji(b)} {b}\n"
         text += "\n"
 
     text += (
@@ -77,8 +69,7 @@ def _show_badge_list(bot, update):
         "👑 *Badge Grid*\n"
     )
 
-    all_badge_names = list(badge_defs.keys())
-    grid_emojis = [emoji_map.get(name, "🔸") for name in all_badge_names]
+    grid_emojis = [badge.emoji for badge in CATALOG.values()]
     
     for i in range(0, len(grid_emojis), 4):
         row_emojis = grid_emojis[i:i+4]
@@ -94,11 +85,11 @@ def _show_badge_list(bot, update):
 
     # Build button grid
     keyboard_rows = []
-    for badge_name in badge_defs.keys():
+    for badge in CATALOG.values():
         keyboard_rows.append([
             InlineKeyboardButton(
-                f"{emoji_map.get(badge_name, '🔸')} {badge_name}",
-                callback_data=f"badge_detail_{badge_name}"
+                f"{badge.emoji} {badge.name}",
+                callback_data=f"badge_detail_{badge.name}"
             )
         ])
 
@@ -123,12 +114,8 @@ def _show_badge_detail(bot, update, badge_name):
     user = get_user(user_id)
     unlocked = user.get("badges", [])
 
-    defs = get_badge_definitions()
-    info = defs.get(badge_name, {})
-
-    title = info.get("title", badge_name)
-    desc = info.get("description", "")
-    required_type = info.get("type")
+    badge = CATALOG.get(badge_name)
+    desc = badge.description if badge is not None else ""
 
     text = f"📜 *{badge_name}*\n\n{desc}\n\n"
 
@@ -155,114 +142,99 @@ def _show_badge_detail(bot, update, badge_name):
 
 
 # ---------------------------------------------------------
-# BADGE DEFINITIONS
+# BADGE RULES (compiled once from the catalog)
 # ---------------------------------------------------------
-def get_badge_definitions():
-    """Return all badge definitions."""
-    return {
-        "Initiate": {
-            "title": "Initiate",
-            "description": "Complete the onboarding process and begin your ascension.",
-            "type": "onboarding_complete",
-            "required_value": True
-        },
-        "First Grind": {
-            "title": "First Grind",
-            "description": "Complete your first grind session.",
-            "type": "grinds",
-            "required_value": 1
-        },
-        "Grind Master": {
-            "title": "Grind Master",
-            "description": "Complete 100 grind sessions.",
-            "type": "grinds",
-            "required_value": 100
-        },
-        "Streak Keeper": {
-            "title": "Streak Keeper",
-            "description": "Maintain a 7-day streak.",
-            "type": "streak",
-            "required_value": 7
-        },
-        "Streak Legend": {
-            "title": "Streak Legend",
-            "description": "Maintain a 30-day streak.",
-            "type": "streak",
-            "required_value": 30
-        },
-        "XP Hunter": {
-            "title": "XP Hunter",
-            "description": "Reach 1000 XP.",
-            "type": "xp",
-            "required_value": 1000
-        },
-        "XP Champion": {
-            "title": "XP Champion",
-            "description": "Reach 10000 XP.",
-            "type": "xp",
-            "required_value": 10000
-        },
-        "Dominator": {
-            "title": "Dominator",
-            "description": "Finish in the top 3 on the weekly leaderboard.",
-            "type": "top3",
-            "required_value": True
-        }
-    }
+# Catalog rule type -> (user field it depends on, value getter)
+RULE_TYPES = {
+    "onboarding_complete": ("onboarding", lambda user: user.get("onboarding_complete", False)),
+    "grinds": ("grinds", lambda user: user.get("weekly", {}).get("grinds", 0)),
+    "streak": ("streak", lambda user: user.get("streak", 0)),
+    "xp": ("xp", lambda user: user.get("xp", 0)),
+    "top3": ("top3", lambda user: user.get("weekly", {}).get("top3", False)),
+}
+
+
+def _compile_rule(getter, required):
+    """Predicate fn(user) -> bool for one catalog rule."""
+    if required is True:
+        return lambda user: bool(getter(user))
+    return lambda user: getter(user) >= required
+
+
+def _compile_rules(catalog):
+    """field -> [(badge name, predicate), ...] in catalog order."""
+    rules = {}
+    for badge in catalog.values():
+        if badge.type is None:
+            continue    # awarded directly (unlock_badge), not by a rule
+        if badge.type not in RULE_TYPES:
+            raise ValueError(f"Badge {badge.name!r} has unknown rule type {badge.type!r}")
+        field, getter = RULE_TYPES[badge.type]
+        predicate = _compile_rule(getter, badge.required_value)
+        rules.setdefault(field, []).append((badge.name, predicate))
+    return rules
+
+
+RULES = _compile_rules(CATALOG)
 
 
 # ---------------------------------------------------------
 # CHECK FOR NEW BADGES
 # ---------------------------------------------------------
-def check_for_new_badges(user_id: int):
+def check_for_new_badges(user_id: int, fields=None):
     """
-    Check if the user has earned any new badges.
-    Returns the name of a new badge, or None.
+    Award every badge the user has newly earned.
+    Returns the list of new badge names (empty if none).
+    """
+    with transaction(user_id) as user:
+        return award_new_badges(user_id, user, fields)
+
+
+def award_new_badges(user_id: int, user: dict, fields=None):
+    """
+    Award newly earned badges on a locked user record, evaluating only
+    the rules that depend on `fields` (all rules if None).
+    Returns the list of new badge names.
     """
-    db = load_db()
-    uid = str(user_id)
-    
-    if uid not in db:
-        return None
-    
-    user = db[uid]
     unlocked = user.get("badges", [])
-    definitions = get_badge_definitions()
-    
-    for badge_name, badge_info in definitions.items():
-        # Skip if already unlocked
-        if badge_name in unlocked:
-            continue
-        
-        badge_type = badge_info.get("type")
-        required_value = badge_info.get("required_value")
-        
-        # Check if user meets requirements
-        earned = False
-        
-        if badge_type == "onboarding_complete":
-            earned = user.get("onboarding_complete", False)
-        
-        elif badge_type == "grinds":
-            total_grinds = user.get("weekly", {}).get("grinds", 0)
-            earned = total_grinds >= required_value
-        
-        elif badge_type == "streak":
-            earned = user.get("streak", 0) >= required_value
-        
-        elif badge_type == "xp":
-            earned = user.get("xp", 0) >= required_value
-        
-        elif badge_type == "top3":
-            earned = user.get("weekly", {}).get("top3", False)
-        
-        if earned:
-            # Award the badge
-            user.setdefault("badges", []).append(badge_name)
-            save_db(db)
-            return badge_name
-    
-    return None
+    earned = []
+
+    for field in RULES if fields is None else fields:
+        for badge_name, predicate in RULES.get(field, ()):
+            if badge_name not in unlocked and badge_name not in earned and predicate(user):
+                earned.append(badge_name)
+
+    for badge_name in earned:
+        unlock_badge(user_id, user, badge_name)
+    return earned
+
+
+def unlock_badge(user_id: int, user: dict, badge_name: str):
+    """Add a badge to a locked user record; False if they already had it."""
+    badges = user.setdefault("badges", [])
+    if badge_name in badges:
+        return False
+
+    badges.append(badge_name)
+    emit(BadgeUnlocked(user_id, badge_name))
+    return True
+
+
+# ---------------------------------------------------------
+# EVENT SUBSCRIBERS
+# ---------------------------------------------------------
+def _on_xp(event, user):
+    award_new_badges(event.user_id, user, ("xp",))
+
+
+def _on_grind(event, user):
+    # top3 is evaluated by the rollover hook that sets it
+    # (leaderboard_index._flag_dominator)
+    award_new_badges(event.user_id, user, ("grinds", "streak"))
+
+
+subscribe(XpAwarded, _on_xp)
+subscribe(GrindPerformed, _on_grind)
 
 
 # ---------------------------------------------------------
@@ -272,28 +244,10 @@ def get_badge_progress(user, badge_name):
     """
     Return a progress string for a badge.
     """
-    definitions = get_badge_definitions()
-    badge_info = definitions.get(badge_name, {})
-    
-    badge_type = badge_info.get("type")
-    required_value = badge_info.get("required_value")
-    
-    if badge_type == "onboarding_complete":
-        return "Complete onboarding" if not user.get("onboarding_complete", False) else "Completed"
-    
-    elif badge_type == "grinds":
-        total_grinds = user.get("weekly", {}).get("grinds", 0)
-        return f"{total_grinds}/{required_value} grinds"
-    
-    elif badge_type == "streak":
-        current_streak = user.get("streak", 0)
-        return f"{current_streak}/{required_value} days"
-    
-    elif badge_type == "xp":
-        current_xp = user.get("xp", 0)
-        return f"{current_xp}/{required_value} XP"
-    
-    elif badge_type == "top3":
-        return "Finish top 3 on weekly leaderboard"
-    
-    return "Unknown"
+    badge = CATALOG.get(badge_name)
+    if badge is None:
+        return "Unknown"
+
+    rule = RULE_TYPES.get(badge.type)
+    value = rule[1](user) if rule is not None else None
+    return badge.progress_text(value)
@@ -5,7 +5,7 @@ Allows users to type /badges and open the badge UI instantly.
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from database import get_user
-from modules.badges import get_badge_definitions
+from modules.badge_catalog import CATALOG, badge_emoji
 from ui.components import render_text
 
 
@@ -14,7 +14,6 @@ def handle_badges_command(bot, update):
     user_id = update.effective_user.id
     user = get_user(user_id)
 
-    badge_defs = get_badge_definitions()
     unlocked = user.get("badges", [])
 
     text = "🏅 *YOUR BADGES*\n\n"
@@ -23,13 +22,13 @@ def handle_badges_command(bot, update):
         text += "_You haven't unlocked any badges yet._\n"
     else:
         for b in unlocked:
-            text += f"🟦 *{b}*\n"
+            text += f"{badge_emoji(b)} *{b}*\n"
 
     text = render_text(user, text)
 
     # Build button grid
     keyboard_rows = []
-    for badge_name in badge_defs.keys():
+    for badge_name in CATALOG:
         keyboard_rows.append([
             InlineKeyboardButton(
                 badge_name,
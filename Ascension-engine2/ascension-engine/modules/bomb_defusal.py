@@ -9,7 +9,8 @@ Purely a guessing / logic mini-game.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 SAFE_XP = 150
@@ -90,23 +91,15 @@ def _process_choice(bot, update, chosen, safe_index):
     user_id = query.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     if chosen == safe_index:
-        db[uid]["xp"] += SAFE_XP
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + SAFE_XP
-        save_db(db)
+        gained, _ = award_xp(user_id, SAFE_XP, "bomb_defusal")
 
         text = render_text(user,
             f"🟩 *SAFE BOMB!* You guessed correctly!\n\n"
-            f"+{SAFE_XP} XP"
+            f"+{SAFE_XP} XP" + boost_note(SAFE_XP, gained)
         )
     else:
-        current_xp = db[uid].get("xp", 0)
-        new_xp = max(0, current_xp - 5)
-        db[uid]["xp"] = new_xp
-        save_db(db)
+        award_xp(user_id, -5, "bomb_defusal")
 
         text = render_text(user,
             "💥 *BOOM!*\n\n"
@@ -5,91 +5,187 @@ Daily + Weekly challenge system for PWN Ascension.
 
 Handles:
 - Challenge definitions
-- Progress tracking
+- Progress tracking (event bus subscriber)
 - Completion bonuses
 - Dark Mode animated UI rendering
+
+Each user keeps one counter set per section ("grinds", "xp", "badges"),
+stamped with the day / week it belongs to; a stale stamp reads as
+empty, so nothing is reset in bulk. Events bump a counter in memory on
+the emitter's locked record and only the challenges on that counter are
+checked. A challenge completes once per period and pays its reward_xp
+through the XP ledger in the same commit.
 """
 
-from datetime import datetime
-from database import load_db, save_db, get_user
+from database import get_user
+from events import subscribe, GrindPerformed, XpAwarded, BadgeUnlocked
+from modules.xp_ledger import award_xp
 from ui.components import render_text
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from utils.animations import animated_fire_cosmic_bar
+from utils.epochs import current_epochs
 
 
 # ---------------------------------------------------------
 # CHALLENGE DEFINITIONS
 # ---------------------------------------------------------
-def get_challenge_definitions():
-    return {
-        "daily": {
-            "grinds_today": {
-                "title": "Grind 20 times today",
-                "required": 20,
-                "description": "You gain speed, momentum, and discipline.",
-                "reward_xp": 200
-            },
-            "xp_today": {
-                "title": "Earn 500 XP today",
-                "required": 500,
-                "description": "Push yourself past your daily limit.",
-                "reward_xp": 300
-            },
-            "streak_day": {
-                "title": "Maintain your streak today",
-                "required": 1,
-                "description": "Log in and grind at least once today.",
-                "reward_xp": 150
-            }
+CHALLENGE_DEFINITIONS = {
+    "daily": {
+        "grinds_today": {
+            "title": "Grind 20 times today",
+            "required": 20,
+            "description": "You gain speed, momentum, and discipline.",
+            "reward_xp": 200,
+            "counter": "grinds"
         },
-        "weekly": {
-            "xp_week": {
-                "title": "Earn 5,000 XP this week",
-                "required": 5000,
-                "description": "Only the consistent rise.",
-                "reward_xp": 500
-            },
-            "grinds_week": {
-                "title": "Perform 100 grinds this week",
-                "required": 100,
-                "description": "Prove your dedication.",
-                "reward_xp": 600
-            },
-            "badge_collector": {
-                "title": "Unlock a new badge this week",
-                "required": 1,
-                "description": "Badge collectors dominate the hall of honor.",
-                "reward_xp": 300
-            }
+        "xp_today": {
+            "title": "Earn 500 XP today",
+            "required": 500,
+            "description": "Push yourself past your daily limit.",
+            "reward_xp": 300,
+            "counter": "xp"
+        },
+        "streak_day": {
+            "title": "Maintain your streak today",
+            "required": 1,
+            "description": "Log in and grind at least once today.",
+            "reward_xp": 150,
+            "counter": "grinds"
+        }
+    },
+    "weekly": {
+        "xp_week": {
+            "title": "Earn 5,000 XP this week",
+            "required": 5000,
+            "description": "Only the consistent rise.",
+            "reward_xp": 500,
+            "counter": "xp"
+        },
+        "grinds_week": {
+            "title": "Perform 100 grinds this week",
+            "required": 100,
+            "description": "Prove your dedication.",
+            "reward_xp": 600,
+            "counter": "grinds"
+        },
+        "badge_collector": {
+            "title": "Unlock a new badge this week",
+            "required": 1,
+            "description": "Badge collectors dominate the hall of honor.",
+            "reward_xp": 300,
+            "counter": "badges"
         }
     }
+}
+
+
+def get_challenge_definitions():
+    """Return all challenge definitions (shared; do not modify)."""
+    return CHALLENGE_DEFINITIONS
+
+
+def _index_by_counter(definitions):
+    """section -> counter -> [(name, definition), ...]"""
+    index = {}
+    for section, defs in definitions.items():
+        for name, info in defs.items():
+            index.setdefault(section, {}).setdefault(info["counter"], []).append((name, info))
+    return index
+
+
+_BY_COUNTER = _index_by_counter(CHALLENGE_DEFINITIONS)
+
+
+def _epochs():
+    day, week = current_epochs()
+    return (("daily", day), ("weekly", week))
 
 
 # ---------------------------------------------------------
 # UPDATE CHALLENGE PROGRESS
-# (Called by grinding.py)
 # ---------------------------------------------------------
-def update_challenge_progress(user_id, field, value):
-    db = load_db()
-    uid = str(user_id)
+def add_progress(user_id: int, user, counter: str, amount: int):
+    """
+    Add `amount` to one counter in every section on a locked record.
+    Challenges on that counter that reach their target are completed
+    once and their reward_xp is awarded in the caller's transaction.
+    Returns the names of the challenges completed.
+    """
+    completed = []
+    challenges = user["challenges"]
 
-    if uid not in db:
-        return
+    for section, epoch in _epochs():
+        targets = _BY_COUNTER.get(section, {}).get(counter)
+        if not targets:
+            continue
 
-    user = db[uid]
-    challenges = user.setdefault("challenges", {
-        "daily": {},
-        "weekly": {}
-    })
+        state = challenges.get(section)
+        if not state or state.get("epoch") != epoch:
+            state = challenges[section] = {"epoch": epoch, "counts": {}, "done": []}
 
-    # Update both daily & weekly if field matches
-    if field in challenges["daily"]:
-        challenges["daily"][field]["current"] = value
+        counts = state["counts"]
+        value = counts[counter] = max(0, counts.get(counter, 0) + amount)
 
-    if field in challenges["weekly"]:
-        challenges["weekly"][field]["current"] = value
+        for name, info in targets:
+            if value >= info["required"] and name not in state["done"]:
+                state["done"].append(name)
+                completed.append(name)
+                award_xp(user_id, info["reward_xp"], "challenge")
 
-    save_db(db)
+    return completed
+
+
+# ---------------------------------------------------------
+# EVENT SUBSCRIBERS (inline, on the emitter's locked record)
+# ---------------------------------------------------------
+def _on_grind(event, user):
+    add_progress(event.user_id, user, "grinds", 1)
+
+
+def _on_xp(event, user):
+    # Rewards do not count towards the XP challenges that paid them
+    if event.source != "challenge":
+        add_progress(event.user_id, user, "xp", event.amount)
+
+
+def _on_badge(event, user):
+    add_progress(event.user_id, user, "badges", 1)
+
+
+subscribe(GrindPerformed, _on_grind)
+subscribe(XpAwarded, _on_xp)
+subscribe(BadgeUnlocked, _on_badge)
+
+
+# ---------------------------------------------------------
+# READ CHALLENGE PROGRESS
+# (Called by the challenge screens)
+# ---------------------------------------------------------
+def get_challenge_progress(user):
+    """
+    This period's progress, read-only:
+    {"daily" | "weekly": {name: {"current", "required", "completed"}}}
+    """
+    challenges = user.get("challenges") or {}
+    progress = {}
+
+    for section, epoch in _epochs():
+        state = challenges.get(section) or {}
+        if state.get("epoch") != epoch:
+            state = {}
+        counts = state.get("counts", {})
+        done = state.get("done", [])
+
+        progress[section] = {
+            name: {
+                "current": counts.get(info["counter"], 0),
+                "required": info["required"],
+                "completed": name in done,
+            }
+            for name, info in CHALLENGE_DEFINITIONS[section].items()
+        }
+
+    return progress
 
 
 # ---------------------------------------------------------
@@ -98,8 +194,6 @@ def update_challenge_progress(user_id, field, value):
 def handle_challenges_callback(bot, update):
     query = update.callback_query
     data = query.data
-    user_id = query.from_user.id
-    user = get_user(user_id)
 
     if data == "ch_main" or data == "challenges_main":
         return _show_challenges_dark_mode(bot, update)
@@ -114,21 +208,7 @@ def _show_challenges_dark_mode(bot, update):
     """Main Dark Mode Challenges UI with Fire + Cosmic animation."""
     query = update.callback_query
     user = get_user(query.from_user.id)
-    db = load_db()
-
-    uid = str(query.from_user.id)
-    challenges = db[uid].setdefault("challenges", {"daily": {}, "weekly": {}})
-    defs = get_challenge_definitions()
-
-    # Initialize current challenge progress if missing
-    for section in ["daily", "weekly"]:
-        for cname, c in defs[section].items():
-            challenges[section].setdefault(cname, {
-                "current": 0,
-                "completed": False
-            })
-
-    save_db(db)
+    challenges = get_challenge_progress(user)
 
     # Show loading message and run fire+cosmic animation
     query.edit_message_text(
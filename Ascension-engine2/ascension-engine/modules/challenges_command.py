@@ -7,7 +7,7 @@ from database import get_user
 from ui.components import render_text
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from utils.animations import animated_fire_cosmic_bar
-from modules.challenges import get_challenge_definitions
+from modules.challenges import get_challenge_progress
 
 
 def handle_challenges_command(bot, update):
@@ -33,22 +33,7 @@ def handle_challenges_command(bot, update):
     )
 
     # Get challenge data
-    from database import load_db
-    db = load_db()
-    uid = str(user_id)
-    challenges = db[uid].setdefault("challenges", {"daily": {}, "weekly": {}})
-    defs = get_challenge_definitions()
-
-    # Initialize current challenge progress if missing
-    for section in ["daily", "weekly"]:
-        for cname, c in defs[section].items():
-            challenges[section].setdefault(cname, {
-                "current": 0,
-                "completed": False
-            })
-
-    from database import save_db
-    save_db(db)
+    challenges = get_challenge_progress(user)
 
     # Helper: draw progress bars
     def bar(current, total, length=10):
@@ -9,7 +9,8 @@ XP varies by difficulty.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 XP_SAME = 200      # Hardest prediction
@@ -77,49 +78,42 @@ def process_guess(bot, update, guess, original):
 
     new_number = random.randint(1, 12)
 
-    db = load_db()
-    uid = str(user_id)
-
     # Determine if correct
     if new_number == original and guess == "same":
         # Hardest case
-        db[uid]["xp"] += XP_SAME
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_SAME, "oracle")
         result = render_text(
             user,
             f"✨ *THE ORACLE SPEAKS...*\n\n"
             f"Original: {original}\n"
             f"New: {new_number}\n\n"
             f"🟰 You predicted *SAME* — **CORRECT!**\n"
-            f"+{XP_SAME} XP"
+            f"+{XP_SAME} XP" + boost_note(XP_SAME, gained)
         )
 
     elif new_number > original and guess == "higher":
-        db[uid]["xp"] += XP_NORMAL
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_NORMAL, "oracle")
         result = render_text(
             user,
             f"🔼 *CORRECT PREDICTION!*\n\n"
             f"Original: {original}\n"
             f"New: {new_number}\n\n"
-            f"+{XP_NORMAL} XP"
+            f"+{XP_NORMAL} XP" + boost_note(XP_NORMAL, gained)
         )
 
     elif new_number < original and guess == "lower":
-        db[uid]["xp"] += XP_NORMAL
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_NORMAL, "oracle")
         result = render_text(
             user,
             f"🔽 *CORRECT PREDICTION!*\n\n"
             f"Original: {original}\n"
             f"New: {new_number}\n\n"
-            f"+{XP_NORMAL} XP"
+            f"+{XP_NORMAL} XP" + boost_note(XP_NORMAL, gained)
         )
 
     else:
         # Wrong prediction
-        db[uid]["xp"] = max(0, db[uid]["xp"] - XP_WRONG)
-        save_db(db)
+        award_xp(user_id, -XP_WRONG, "oracle")
         result = render_text(
             user,
             f"💀 *THE ORACLE LAUGHS... WRONG!* 💀\n\n"
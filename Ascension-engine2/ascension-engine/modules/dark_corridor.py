@@ -13,7 +13,8 @@ Streak increases difficulty slightly but XP stays controlled.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp
 from ui.components import render_text
 
 
@@ -77,9 +78,6 @@ def _resolve_choice(bot, update, door, depth):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     streak = user.get("streak", 0)
 
     multiplier = (1 + STREAK_FACTOR * streak) * (DEPTH_FACTOR ** depth)
@@ -97,13 +95,11 @@ def _resolve_choice(bot, update, door, depth):
         amount = random.randint(TREASURE_MIN, TREASURE_MAX)
         amount = int(amount * multiplier)
 
-        db[uid]["xp"] += amount
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + amount
-        save_db(db)
+        gained, _ = award_xp(user_id, amount, "dark_corridor")
 
         text = render_text(user,
             f"💰 *TREASURE!*\n\n"
-            f"You gained +{amount} XP.\n"
+            f"You gained +{gained} XP.\n"
             f"Depth {depth} | Streak bonus applied."
         )
 
@@ -115,8 +111,7 @@ def _resolve_choice(bot, update, door, depth):
         amount = random.randint(TRAP_MIN, TRAP_MAX)
         amount = int(amount * multiplier)
 
-        db[uid]["xp"] = max(0, db[uid]["xp"] - amount)
-        save_db(db)
+        award_xp(user_id, -amount, "dark_corridor")
 
         text = render_text(user,
             f"💀 *A TRAP!* You lost −{amount} XP.\n"
@@ -129,13 +124,11 @@ def _resolve_choice(bot, update, door, depth):
         amount = random.randint(SECRET_MIN, SECRET_MAX)
         amount = int(amount * multiplier)
 
-        db[uid]["xp"] += amount
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + amount
-        save_db(db)
+        gained, _ = award_xp(user_id, amount, "dark_corridor")
 
         text = render_text(user,
             f"✨ *SECRET ROOM FOUND!*\n\n"
-            f"Hidden treasure grants +{amount} XP."
+            f"Hidden treasure grants +{gained} XP."
         )
 
         return q.edit_message_text(text=text, parse_mode="Markdown", reply_markup=_next(depth))
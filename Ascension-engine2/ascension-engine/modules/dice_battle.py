@@ -7,7 +7,8 @@ User rolls → Bot rolls → Higher roll wins XP.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 
@@ -81,24 +82,18 @@ def _roll_dice(bot, update):
     )
 
     # Determine result
-    db = load_db()
-    uid = str(user_id)
-
     if user_roll > bot_roll:
-        text += "🏆 *YOU WIN!* +200 XP"
-        db[uid]["xp"] += BATTLE_XP_WIN
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + BATTLE_XP_WIN
+        text += f"🏆 *YOU WIN!* +{BATTLE_XP_WIN} XP"
+        base = BATTLE_XP_WIN
     elif user_roll < bot_roll:
-        text += "😵 *You lost…* +50 XP"
-        db[uid]["xp"] += BATTLE_XP_LOSE
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + BATTLE_XP_LOSE
+        text += f"😵 *You lost…* +{BATTLE_XP_LOSE} XP"
+        base = BATTLE_XP_LOSE
     else:
-        text += "🤝 *Draw!* +100 XP"
-        db[uid]["xp"] += BATTLE_XP_DRAW
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + BATTLE_XP_DRAW
+        text += f"🤝 *Draw!* +{BATTLE_XP_DRAW} XP"
+        base = BATTLE_XP_DRAW
 
-    save_db(db)
-    user = get_user(user_id)
+    gained, _ = award_xp(user_id, base, "dice_battle")
+    text += boost_note(base, gained)
 
     text = render_text(user, text)
 
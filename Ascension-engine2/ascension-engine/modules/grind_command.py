@@ -5,7 +5,8 @@ Allows user to type /grind and run a grind cycle instantly.
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from database import get_user
-from modules.grinding import perform_grind
+from modules.grinding import perform_grind, GRIND_XP
+from modules.xp_ledger import boost_note
 from ui.components import render_text
 
 
@@ -42,7 +43,7 @@ def handle_grind_command(bot, update):
         return
 
     # Success
-    text = render_text(user, f"🔥 Grind complete — +50 XP!")
+    text = render_text(user, f"🔥 Grind complete — +{GRIND_XP} XP!" + boost_note(GRIND_XP, value))
     keyboard = InlineKeyboardMarkup([
         [InlineKeyboardButton("Grind Again", callback_data="prof_grind")],
         [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
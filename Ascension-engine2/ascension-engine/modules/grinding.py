@@ -6,18 +6,17 @@ Handles:
 - Cooldowns
 - Daily reset
 - Streak system
-- Rank progression
-- Badge unlocks
+- Rank progression (via the XP ledger)
 - Weekly counters
-- Challenge updates
+- GrindPerformed on the event bus (badges and challenges subscribe)
 """
 
 import time
 from datetime import datetime
 
-from database import get_user, save_db, load_db, log_activity
-from modules.badges import check_for_new_badges
-from modules.challenges import update_challenge_progress
+from database import get_user, transaction
+from events import emit, GrindPerformed
+from modules.xp_ledger import award_xp, boost_note
 
 
 COOLDOWN_SECONDS = 30        # Time between allowed grinds
@@ -30,133 +29,106 @@ STREAK_MILESTONES = [5, 10, 20, 30]
 # ---------------------------------------------------------
 def perform_grind(user_id: int):
     """
+    Run one grind as a single in-memory pipeline:
+    cooldown → daily reset → counters → XP (ledger: boost, weekly, rank)
+    → GrindPerformed, committed with one write of the user.
+    The cooldown is pre-checked on the read-only (usually cached) record,
+    so a refused grind takes no lock and writes nothing; it is checked
+    again inside the transaction.
+    Inline subscribers (challenges, badges) run on the same record;
+    deferred ones (activity) run after the commit.
+
     Returns:
       ("cooldown", seconds_left)
       ("badge", badge_name)
       ("rankup", new_rank)
       ("streak_milestone", streak_days)
-      ("success", xp_gain)
+      ("success", xp_gain)   xp_gain includes any active boost
     """
 
-    db = load_db()
-    uid = str(user_id)
-
-    if uid not in db:
-        user = get_user(user_id)
-        db = load_db()
-    else:
-        user = db[uid]
-
-    now = datetime.utcnow()
-    now_ts = time.time()
-
-    last_ts = user.get("last_grind", 0)
-    diff = now_ts - last_ts
-
-    # -----------------------------------------
-    # COOLDOWN CHECK
-    # -----------------------------------------
-    if diff < COOLDOWN_SECONDS:
-        remaining = COOLDOWN_SECONDS - int(diff)
+    # COOLDOWN CHECK on the read-only record: a grind refused here
+    # writes nothing
+    remaining = _cooldown_left(get_user(user_id), time.time())
+    if remaining:
         return ("cooldown", remaining)
 
-    # -----------------------------------------
-    # DAILY RESET
-    # -----------------------------------------
-    today_str = now.strftime("%Y-%m-%d")
-    last_date = user.get("last_grind_date")
-
-    if last_date != today_str:
-        # New day, reset daily counters
-        user["grinds_today"] = 0
-        user["xp_today"] = 0
-
-        # Determine streak:
-        # If last grind was yesterday → continue streak
-        if last_date:
-            try:
-                last_date_dt = datetime.strptime(last_date, "%Y-%m-%d")
-                if (now - last_date_dt).days == 1:
-                    user["streak"] += 1
-                else:
-                    user["streak"] = 1
-            except:
-                user["streak"] = 1
-        else:
-            user["streak"] = 1
-
-        user["last_grind_date"] = today_str
+    with transaction(user_id) as user:
+        now = datetime.utcnow()
+        now_ts = time.time()
 
-    # -----------------------------------------
-    # APPLY GRIND
-    # -----------------------------------------
-    user["grinds_today"] += 1
-    user["last_grind"] = now_ts
-    user["xp"] += GRIND_XP
-    user["xp_today"] = user.get("xp_today", 0) + GRIND_XP
-
-    # WEEKLY COUNTERS
-    weekly = user.get("weekly", {})
-    weekly["xp"] = weekly.get("xp", 0) + GRIND_XP
-    weekly["grinds"] = weekly.get("grinds", 0) + 1
-    user["weekly"] = weekly
-
-    # Log activity
-    log_activity(user_id, f"Performed grind (+{GRIND_XP} XP)")
+        # Checked again under the lock (a concurrent grind may have won)
+        remaining = _cooldown_left(user, now_ts)
+        if remaining:
+            return ("cooldown", remaining)
 
-    # -----------------------------------------
-    # CHALLENGES UPDATE
-    # -----------------------------------------
-    update_challenge_progress(user_id, "grinds_today", user["grinds_today"])
-    update_challenge_progress(user_id, "xp_today", user["xp_today"])
-    update_challenge_progress(user_id, "xp_week", weekly["xp"])
-    update_challenge_progress(user_id, "grinds_week", weekly["grinds"])
+        _daily_reset(user, now)
+        _apply_grind(user, now_ts)
+        had_badges = len(user.badges)
+        xp_gain, new_rank = award_xp(user_id, GRIND_XP, "grind")
+        emit(GrindPerformed(user_id))
 
-    save_db(db)
+        new_badges = user.badges[had_badges:]
+        new_badge = new_badges[0] if new_badges else None
 
     # -----------------------------------------
-    # BADGE CHECK
+    # RESULT (highest priority first)
     # -----------------------------------------
-    new_badge = check_for_new_badges(user_id)
     if new_badge:
         return ("badge", new_badge)
 
-    # -----------------------------------------
-    # STREAK MILESTONE
-    # -----------------------------------------
-    if user["streak"] in STREAK_MILESTONES:
-        save_db(db)
-        return ("streak_milestone", user["streak"])
+    if user.streak in STREAK_MILESTONES:
+        return ("streak_milestone", user.streak)
 
-    # -----------------------------------------
-    # RANK PROGRESSION
-    # -----------------------------------------
-    new_rank = _calculate_rank(user["xp"])
-    if new_rank != user.get("rank"):
-        user["rank"] = new_rank
-        save_db(db)
+    if new_rank:
         return ("rankup", new_rank)
 
-    save_db(db)
-    return ("success", GRIND_XP)
+    return ("success", xp_gain)
 
 
 # ---------------------------------------------------------
-# INTERNAL: RANK CALCULATION
+# PIPELINE STAGES (operate on a locked UserRecord)
 # ---------------------------------------------------------
-def _calculate_rank(xp):
-    """Return the appropriate rank based on XP."""
-    if xp >= 10000:
-        return "Ascended"
-    if xp >= 5000:
-        return "Master"
-    if xp >= 2500:
-        return "Diamond"
-    if xp >= 1500:
-        return "Gold"
-    if xp >= 750:
-        return "Silver"
-    return "Bronze"
+def _cooldown_left(user, now_ts):
+    """Seconds until the next grind is allowed, or 0."""
+    diff = now_ts - user.last_grind
+    if diff < COOLDOWN_SECONDS:
+        return COOLDOWN_SECONDS - int(diff)
+    return 0
+
+
+def _daily_reset(user, now):
+    """
+    Update the streak on the first grind of a day. Daily counters were
+    already rolled over when the transaction opened.
+    """
+    today_str = now.strftime("%Y-%m-%d")
+    last_date = user.last_grind_date
+
+    if last_date == today_str:
+        return
+
+    # Determine streak:
+    # If last grind was yesterday → continue streak
+    if last_date:
+        try:
+            last_date_dt = datetime.strptime(last_date, "%Y-%m-%d")
+            if (now - last_date_dt).days == 1:
+                user.streak += 1
+            else:
+                user.streak = 1
+        except:
+            user.streak = 1
+    else:
+        user.streak = 1
+
+    user.last_grind_date = today_str
+
+
+def _apply_grind(user, now_ts):
+    user.grinds_today += 1
+    user.last_grind = now_ts
+    weekly = user.weekly
+    weekly["grinds"] = weekly.get("grinds", 0) + 1
 
 
 # ---------------------------------------------------------
@@ -210,7 +182,7 @@ def handle_grind_callback(bot, update):
         return
 
     # Success
-    text = render_text(user, f"🔥 Grind complete — +50 XP!")
+    text = render_text(user, f"🔥 Grind complete — +{GRIND_XP} XP!" + boost_note(GRIND_XP, value))
     keyboard = InlineKeyboardMarkup([
         [InlineKeyboardButton("Grind Again", callback_data="grind_again")],
         [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
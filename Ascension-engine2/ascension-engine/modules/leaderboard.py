@@ -1,204 +1,339 @@
 """
 modules/leaderboard.py
-Weekly leaderboard system (XP, Grinds, Badges).
+Leaderboard system (weekly XP, weekly grinds, badges, streaks, all-time XP).
+Boards are declared in modules/leaderboard_metrics.py and served from
+modules/leaderboard_index.py.
 Tracks:
-- Weekly XP rankings
-- Weekly Grind rankings
-- Badge count rankings
-- Weekly reset
+- Top rankings for every registered metric
+- Per-user position, percentile and gap
+- Paged boards (lb_<metric>_p<n>) and jump-to-me
+- Weekly history and Hall of Fame (read from the week archive)
+- Weekly reset (lazy per-user rollover, scheduled week close)
 - Dominator badge flagging (Top 3)
 """
 
+import os
+import time
+import logging
 from datetime import datetime, timedelta
-from database import load_db, save_db
+from modules.leaderboard_index import index as leaderboard_index, archive as week_archive
+from modules.leaderboard_metrics import METRICS
 
+logger = logging.getLogger(__name__)
 
+
+# ---------------------------------------------------------
+# GET LEADERBOARD: TOP N
+# ---------------------------------------------------------
+def get_top(metric, limit=10, chat=None):
+    """[(uid, score), ...] best `limit` users of a registered metric."""
+    return leaderboard_index.top(metric, limit, chat)
+
+
+# ---------------------------------------------------------
+# GET LEADERBOARD: CHAT SCOPE
 # ---------------------------------------------------------
-# GET LEADERBOARD: TOP XP
+def board_chat(metric, chat):
+    """
+    Chat id whose own board answers `metric` for a screen shown in `chat`
+    (a group chat with a per-chat board), else None for the global board.
+    """
+    if chat is not None and chat.type in ("group", "supergroup") and leaderboard_index.has_chat_board(metric):
+        return chat.id
+    return None
+
+
+# ---------------------------------------------------------
+# GET LEADERBOARD: ONE PAGE
 # ---------------------------------------------------------
-def get_top_xp(limit=10):
-    db = load_db()
-    weekly = {}
+PAGE_SIZE = 10
+
+
+def get_page(metric, page, size=PAGE_SIZE, chat=None):
+    """
+    ([(position, uid, score), ...], total) for one 0-based page, read by
+    offset from the index in O(size + log n).
+    """
+    rows, total = leaderboard_index.page(metric, page * size, size, chat)
+    first = page * size + 1
+    return [(first + i, uid, score) for i, (uid, score) in enumerate(rows)], total
 
-    for uid, user in db.items():
-        if isinstance(user, dict):
-            w = user.get("weekly", {})
-            weekly[uid] = w.get("xp", 0)
 
-    sorted_xp = sorted(weekly.items(), key=lambda x: x[1], reverse=True)
-    return sorted_xp[:limit]
+def page_of(user_id, metric, size=PAGE_SIZE, chat=None):
+    """0-based page holding a user's row, or None if they are unranked."""
+    pos = get_rank(user_id, metric, chat)
+    if pos is None:
+        return None
+    return (pos["position"] - 1) // size
 
 
 # ---------------------------------------------------------
-# GET LEADERBOARD: TOP GRINDS
+# GET LEADERBOARD: ONE USER'S POSITION
 # ---------------------------------------------------------
-def get_top_grinds(limit=10):
-    db = load_db()
-    weekly = {}
+def get_rank(user_id, metric="xp", chat=None):
+    """
+    Position, percentile and gap to the next place for one user on a
+    registered metric, globally or within one chat. None if unranked.
+    """
+    return leaderboard_index.position(metric, str(user_id), chat)
+
 
-    for uid, user in db.items():
-        if isinstance(user, dict):
-            w = user.get("weekly", {})
-            weekly[uid] = w.get("grinds", 0)
+def format_position(user_id, metric="xp", unit="XP", chat=None):
+    """'Your position' block shown under a leaderboard."""
+    pos = get_rank(user_id, metric, chat)
+    if pos is None:
+        return ""
 
-    sorted_grinds = sorted(weekly.items(), key=lambda x: x[1], reverse=True)
-    return sorted_grinds[:limit]
+    text = (
+        f"📍 *Your position:* #{pos['position']} of {pos['total']}\n"
+        f"   {pos['score']} {unit} · ahead of {pos['percentile']}% of players\n"
+    )
+    if pos["gap"] is not None:
+        text += f"   🔺 {pos['gap']} {unit} behind #{pos['position'] - 1}\n"
+    return text
 
 
 # ---------------------------------------------------------
-# GET LEADERBOARD: TOP BADGES
+# ARCHIVED WEEKS (history / hall of fame)
 # ---------------------------------------------------------
-def get_top_badge_collectors(limit=10):
-    db = load_db()
-    badge_counts = {}
+HISTORY_WEEKS = 8
+
+
+def get_user_history(user_id, weeks=HISTORY_WEEKS):
+    """
+    [(week, result or None), ...] for the last archived weeks, newest
+    first; result is {"xp", "grinds", "rank", "total"}.
+    """
+    leaderboard_index.close_week()
+    return week_archive.user_history(str(user_id), weeks)
+
 
-    for uid, user in db.items():
-        if isinstance(user, dict):
-            badge_counts[uid] = len(user.get("badges", []))
+def get_hall_of_fame(weeks=HISTORY_WEEKS, limit=3):
+    """[(week, [(uid, xp), ...]), ...] final Top `limit` of recent weeks."""
+    leaderboard_index.close_week()
+    return [(week, top) for week, top in week_archive.hall_of_fame(weeks, limit) if top]
 
-    sorted_badges = sorted(badge_counts.items(), key=lambda x: x[1], reverse=True)
-    return sorted_badges[:limit]
+
+def week_label(week):
+    """'Oct 12' for a week key (the date of its Monday)."""
+    return datetime.strptime(week, "%Y-%m-%d").strftime("%b %d")
 
 
 # ---------------------------------------------------------
 # WEEKLY RESET TIME CALCULATOR
 # ---------------------------------------------------------
 def next_weekly_reset():
+    """Next Monday 00:00 UTC strictly after now."""
     now = datetime.utcnow()
     days_until_monday = (7 - now.weekday()) % 7
     next_mon = now + timedelta(days=days_until_monday)
     reset_time = next_mon.replace(hour=0, minute=0, second=0, microsecond=0)
+    if reset_time <= now:
+        reset_time += timedelta(days=7)
     return reset_time
 
 
+def last_weekly_reset():
+    """Most recent Monday 00:00 UTC (the reset that should have happened)."""
+    return next_weekly_reset() - timedelta(days=7)
+
+
 # ---------------------------------------------------------
 # WEEKLY RESET HANDLER
 # ---------------------------------------------------------
 def handle_weekly_reset():
     """
-    Resets weekly statistics and awards the Dominator flag
-    to the Top 3 XP players.
-    """
+    Close the finished week: freeze its Top 3 for the Dominator flag
+    and start empty weekly boards.
 
-    db = load_db()
-    top3 = get_top_xp(3)
+    No user is touched here. Weekly stats carry the week they belong to
+    and roll over lazily on each user's first transaction of the new
+    week, when the Top 3 of the closed week get their flag.
+    """
+    leaderboard_index.close_week()
+    week, top3 = leaderboard_index.finished_week()
+    logger.info(f"Weekly leaderboard {week} closed (top 3: {', '.join(top3) or 'none'})")
+    return True
 
-    # Award Dominator badge flag
-    for uid, _xp in top3:
-        if uid in db:
-            db[uid]["weekly"] = db[uid].get("weekly", {})
-            db[uid]["weekly"]["top3"] = True  # Badge engine will pick this up
 
-    # Reset all weekly stats
-    for uid, user in db.items():
-        if isinstance(user, dict):
-            user["weekly"] = {
-                "xp": 0,
-                "grinds": 0,
-                "badges": len(user.get("badges", [])),
-                "top3": False
-            }
+# ---------------------------------------------------------
+# WEEKLY RESET SCHEDULING (PTB JobQueue)
+# ---------------------------------------------------------
+def schedule_weekly_reset(job_queue):
+    """
+    Register the weekly close on the bot's JobQueue (every Monday
+    00:00 UTC). A week that ended while the bot was down is closed by
+    the index rebuild at startup.
+    """
+    job_queue.run_repeating(
+        _weekly_reset_job,
+        interval=timedelta(weeks=1),
+        first=next_weekly_reset(),
+        name="weekly_reset"
+    )
 
-    db["next_reset"] = next_weekly_reset().strftime("%Y-%m-%d %H:%M:%S")
 
-    save_db(db)
-    return True
+def _weekly_reset_job(context):
+    try:
+        handle_weekly_reset()
+    except Exception as e:
+        logger.error(f"Weekly reset failed: {e}")
 
 
 # ---------------------------------------------------------
 # UI CALLBACK HANDLER (used by router)
 # ---------------------------------------------------------
 def handle_leaderboard_callback(bot, update):
+    """
+    lb_<metric>          first page
+    lb_<metric>_p<n>     page n (0-based)
+    lb_<metric>_me       page holding the viewer, their row marked
+    lb_history / lb_hof  archived weeks
+    """
     query = update.callback_query
     data = query.data
     user_id = query.from_user.id
 
-    if data == "lb_xp":
-        return _show_xp_leaderboard(bot, update)
+    if data == "lb_history":
+        return _show_history(bot, update)
+
+    elif data == "lb_hof":
+        return _show_hall_of_fame(bot, update)
 
-    elif data == "lb_grinds":
-        return _show_grinds_leaderboard(bot, update)
+    metric, _, nav = data[len("lb_"):].partition("_")
+    if metric not in METRICS:
+        return
 
-    elif data == "lb_badges":
-        return _show_badges_leaderboard(bot, update)
+    if nav == "me":
+        page = page_of(user_id, metric, chat=board_chat(metric, _query_chat(query)))
+        if page is None:
+            query.answer("You're not on this board yet. Go grind!")
+            return
+        return _show_board(update, metric, page, highlight=str(user_id))
+
+    page = int(nav[1:]) if nav.startswith("p") and nav[1:].isdigit() else 0
+    return _show_board(update, metric, page)
 
 
 # ---------------------------------------------------------
 # INTERNAL: Leaderboard Screens
 # ---------------------------------------------------------
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user
-from ui.components import render_text
+from database import get_user, get_users
+from ui.components import get_theme, render_text, render_themed, render_fragment
 
 
-def _show_xp_leaderboard(bot, update):
-    query = update.callback_query
-    user = get_user(query.from_user.id)
+def display_names(uids):
+    """Markdown-safe usernames for leaderboard rows, read in one batch."""
+    uids = list(uids)
+    users = get_users(uids)
+    names = {}
+    for uid in uids:
+        u = users.get(uid)
+        username = (u.get("username") if u else None) or f"User{uid}"
+        names[uid] = username.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("`", "\\`")
+    return names
 
-    top = get_top_xp(10)
 
-    text = "💠✨💠  *TOP XP LEADERBOARD*  💠✨💠\n\n"
-    
-    rank_icons = ["🥇", "🥈", "🥉"] + ["🔸"] * 7
-    
-    for i, (uid, xp) in enumerate(top):
-        u = get_user(int(uid))
-        username = u.get("username", f"User{uid}") if u else f"User{uid}"
-        username_safe = username.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("`", "\\`")
-        
-        icon = rank_icons[i] if i < len(rank_icons) else "🔹"
-        crystal = "🔷" if i == 0 else "🔹"
-        
-        text += (
-            f"{icon} @{username_safe}\n"
-            f"   {crystal} {xp} XP\n\n"
-        )
-    
-    text += (
-        "━━━━━━━━━━━━━━━\n"
-        "💠 *Ascension Flow Active*\n"
-        "━━━━━━━━━━━━━━━"
-    )
+def _query_chat(query):
+    return query.message.chat if query.message else None
 
-    text = render_text(user, text)
 
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("🔥 Top XP", callback_data="lb_xp"),
-            InlineKeyboardButton("⚡ Top Grinds", callback_data="lb_grinds"),
-            InlineKeyboardButton("🎖️ Top Badges", callback_data="lb_badges"),
-        ],
-        [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
+# ---------------------------------------------------------
+# RENDER CACHE
+# Screens are identical for every viewer with the same theme, so the
+# rendered text + keyboard is cached per (metric, chat, theme) and rebuilt
+# when the index version for that board changes, or when its page count
+# does (the version only follows the top rows, the "Next" button follows
+# the board size). With
+# LEADERBOARD_MAX_STALENESS > 0 a cached screen is also served for that
+# many seconds after a change (useful at peak traffic).
+# ---------------------------------------------------------
+LEADERBOARD_MAX_STALENESS = float(os.getenv("LEADERBOARD_MAX_STALENESS", "0"))
+
+_screen_cache = {}      # (metric, chat, theme) -> (version, pages, built_at, text, keyboard)
+
+
+def _cached_screen(metric, theme, build, chat=None):
+    """Return (text, keyboard) for a shared screen, building it on a miss."""
+    version = leaderboard_index.version(metric, chat)
+    _, total = leaderboard_index.page(metric, 0, 0, chat)
+    pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    now = time.monotonic()
+
+    cached = _screen_cache.get((metric, chat, theme))
+    if cached is not None:
+        cached_version, cached_pages, built_at, text, keyboard = cached
+        fresh = cached_version == version or now - built_at < LEADERBOARD_MAX_STALENESS
+        if fresh and cached_pages == pages:
+            return text, keyboard
+
+    text, keyboard = build()
+    text = render_themed(theme, text)
+    _screen_cache[(metric, chat, theme)] = (version, pages, now, text, keyboard)
+    return text, keyboard
+
+
+def leaderboard_keyboard(metric=None, page=0, total=0):
+    """Board buttons (three per row), page navigation and archive links."""
+    buttons = [
+        InlineKeyboardButton(m.button, callback_data=f"lb_{m.name}")
+        for m in METRICS.values()
+    ]
+    rows = [buttons[i:i + 3] for i in range(0, len(buttons), 3)]
+
+    # Page navigation for a ranked board
+    if metric is not None:
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton("◀️ Prev", callback_data=f"lb_{metric}_p{page - 1}"))
+        nav.append(InlineKeyboardButton("📍 Me", callback_data=f"lb_{metric}_me"))
+        if (page + 1) * PAGE_SIZE < total:
+            nav.append(InlineKeyboardButton("Next ▶️", callback_data=f"lb_{metric}_p{page + 1}"))
+        rows.append(nav)
+
+    rows.append([
+        InlineKeyboardButton("📜 My Weeks", callback_data="lb_history"),
+        InlineKeyboardButton("🏛 Hall of Fame", callback_data="lb_hof"),
     ])
+    rows.append([InlineKeyboardButton("🏠 Menu", callback_data="menu_main")])
+    return InlineKeyboardMarkup(rows)
 
-    query.edit_message_text(
-        text=text,
-        parse_mode="Markdown",
-        reply_markup=keyboard
-    )
 
+def _row_icon(position, uid, highlight):
+    if uid == highlight:
+        return "👉"
+    if position <= 3:
+        return ["🥇", "🥈", "🥉"][position - 1]
+    return "🔸" if position <= 10 else "🔹"
 
-def _show_grinds_leaderboard(bot, update):
-    query = update.callback_query
-    user = get_user(query.from_user.id)
 
-    top = get_top_grinds(10)
+def _page_header(page, total, chat=None):
+    text = "👥 _This group_\n" if chat is not None else ""
+    if page > 0:
+        pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        text += f"_Page {page + 1} of {pages}_\n"
+    return text + "\n" if text else ""
 
-    text = "💠✨💠  *TOP GRINDERS*  💠✨💠\n\n"
-    
-    rank_icons = ["🥇", "🥈", "🥉"] + ["🔸"] * 7
+
+def _build_board(metric, page=0, highlight=None, chat=None):
+    """(text, keyboard) for one page of a board, before theming."""
+    m = METRICS[metric]
+    rows, total = get_page(metric, page, chat=chat)
+    names = display_names(uid for _, uid, _ in rows)
+
+    text = f"💠✨💠  *{m.title}*  💠✨💠\n\n"
+    text += _page_header(page, total, chat)
     
-    for i, (uid, gr) in enumerate(top):
-        u = get_user(int(uid))
-        username = u.get("username", f"User{uid}") if u else f"User{uid}"
-        username_safe = username.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("`", "\\`")
+    for position, uid, score in rows:
+        username_safe = names[uid]
         
-        icon = rank_icons[i] if i < len(rank_icons) else "🔹"
-        crystal = "🔷" if i == 0 else "🔹"
+        icon = _row_icon(position, uid, highlight)
+        crystal = "🔷" if position == 1 else "🔹"
         
         text += (
-            f"{icon} @{username_safe}\n"
-            f"   {crystal} {gr} grinds\n\n"
+            f"{icon} #{position} @{username_safe}\n"
+            f"   {crystal} {score} {m.unit}\n\n"
         )
     
     text += (
@@ -207,16 +342,29 @@ def _show_grinds_leaderboard(bot, update):
         "━━━━━━━━━━━━━━━"
     )
 
-    text = render_text(user, text)
+    return text, leaderboard_keyboard(metric, page, total)
 
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("🔥 Top XP", callback_data="lb_xp"),
-            InlineKeyboardButton("⚡ Top Grinds", callback_data="lb_grinds"),
-            InlineKeyboardButton("🎖️ Top Badges", callback_data="lb_badges"),
-        ],
-        [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
-    ])
+
+def _show_board(update, metric, page=0, highlight=None):
+    """
+    Send one page of a board (the group's own board inside a group chat).
+    The shared first page comes from the render cache; other pages and
+    "jump to me" views are built per request.
+    """
+    query = update.callback_query
+    theme = get_theme(get_user(query.from_user.id))
+    chat = board_chat(metric, _query_chat(query))
+
+    if page == 0 and highlight is None:
+        text, keyboard = _cached_screen(metric, theme, lambda: _build_board(metric, 0, None, chat), chat)
+    else:
+        text, keyboard = _build_board(metric, page, highlight, chat)
+        text = render_themed(theme, text)
+
+    # Per-viewer part, themed on its own
+    footer = format_position(query.from_user.id, metric, METRICS[metric].unit, chat)
+    if footer:
+        text += "\n\n" + render_fragment(theme, footer)
 
     query.edit_message_text(
         text=text,
@@ -225,48 +373,53 @@ def _show_grinds_leaderboard(bot, update):
     )
 
 
-def _show_badges_leaderboard(bot, update):
+def _show_history(bot, update):
     query = update.callback_query
-    user = get_user(query.from_user.id)
+    user_id = query.from_user.id
+    user = get_user(user_id)
 
-    top = get_top_badge_collectors(10)
+    text = f"📜  *YOUR LAST {HISTORY_WEEKS} WEEKS*  📜\n\n"
 
-    text = "💠✨💠  *TOP BADGE COLLECTORS*  💠✨💠\n\n"
-    
-    rank_icons = ["🥇", "🥈", "🥉"] + ["🔸"] * 7
-    
-    for i, (uid, count) in enumerate(top):
-        u = get_user(int(uid))
-        username = u.get("username", f"User{uid}") if u else f"User{uid}"
-        username_safe = username.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("`", "\\`")
-        
-        icon = rank_icons[i] if i < len(rank_icons) else "🔹"
-        crystal = "🔷" if i == 0 else "🔹"
-        
+    history = get_user_history(user_id)
+    if not history:
+        text += "No finished weeks yet. Keep grinding!\n"
+
+    for week, result in history:
+        if result is None:
+            text += f"▫️ Week of {week_label(week)} — no activity\n"
+            continue
+        icon = ["🥇", "🥈", "🥉"][result["rank"] - 1] if result["rank"] <= 3 else "🔹"
         text += (
-            f"{icon} @{username_safe}\n"
-            f"   {crystal} {count} badges\n\n"
+            f"{icon} Week of {week_label(week)} — #{result['rank']} of {result['total']}\n"
+            f"   {result['xp']} XP · {result['grinds']} grinds\n"
         )
-    
-    text += (
-        "━━━━━━━━━━━━━━━\n"
-        "💠 *Ascension Flow Active*\n"
-        "━━━━━━━━━━━━━━━"
+
+    query.edit_message_text(
+        text=render_text(user, text),
+        parse_mode="Markdown",
+        reply_markup=leaderboard_keyboard()
     )
 
-    text = render_text(user, text)
 
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("🔥 Top XP", callback_data="lb_xp"),
-            InlineKeyboardButton("⚡ Top Grinds", callback_data="lb_grinds"),
-            InlineKeyboardButton("🎖️ Top Badges", callback_data="lb_badges"),
-        ],
-        [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
-    ])
+def _show_hall_of_fame(bot, update):
+    query = update.callback_query
+    user = get_user(query.from_user.id)
+
+    text = "🏛  *HALL OF FAME*  🏛\n\n"
+
+    weeks = get_hall_of_fame()
+    names = display_names({uid for _week, top in weeks for uid, _xp in top})
+    if not weeks:
+        text += "No finished weeks yet. Be the first legend!\n"
+
+    for week, top in weeks:
+        text += f"*Week of {week_label(week)}*\n"
+        for icon, (uid, xp) in zip(["🥇", "🥈", "🥉"], top):
+            text += f"{icon} @{names[uid]} — {xp} XP\n"
+        text += "\n"
 
     query.edit_message_text(
-        text=text,
+        text=render_text(user, text),
         parse_mode="Markdown",
-        reply_markup=keyboard
+        reply_markup=leaderboard_keyboard()
     )
@@ -0,0 +1,366 @@
+"""
+modules/leaderboard_index.py
+In-memory ordered leaderboard index for PWN Ascension.
+
+Handles:
+- One skip list per registered metric (leaderboard_metrics.py),
+  ordered by (-score, uid)
+- Separate weekly boards per group chat, holding only its members
+- Incremental updates from every committed user transaction
+- Full rebuild from storage at startup and after save_db()
+- Top-N and page reads that only walk the rows returned
+- Per-user position / percentile / gap lookups in O(log n)
+- A version per metric, bumped whenever its top rows may have changed
+  (a score, the order or a shown username)
+- Weekly boards that only hold users with stats for the current week
+- Closing a finished week: its final standings are archived
+  (backends/week_archive.py) and its Top 3 kept for the Dominator flag;
+  the archive is written off the lock so commits never wait for it
+
+Weekly stats roll over lazily (see UserRecord.roll_over), so at the
+start of a week the weekly boards are simply emptied; users re-enter
+them on their first transaction of the new week.
+"""
+
+import time
+import logging
+import threading
+
+from database import iter_users, add_commit_hook, add_reload_hook, add_rollover_hook, get_meta, set_meta, WEEKS_DIR
+from backends.week_archive import WeekArchive
+from user_record import UserRecord
+from utils.epochs import current_week, previous_week, next_week_start
+from utils.skiplist import SkipList
+from modules.leaderboard_metrics import METRICS
+from modules.badges import award_new_badges
+
+logger = logging.getLogger(__name__)
+
+
+# Rows shown on a leaderboard screen; changes inside this window bump
+# the metric's version so cached screens are rebuilt
+TOP_WINDOW = 10
+
+
+# ---------------------------------------------------------
+# SCORING
+# ---------------------------------------------------------
+def _score(metric, user, week):
+    """A user's score on one board, or None if they are not on it."""
+    if metric.weekly and user.weekly.get("week") != week:
+        return None
+    return metric.score(user)
+
+
+# ---------------------------------------------------------
+# BOARD (one metric in one scope)
+# ---------------------------------------------------------
+class _Board:
+    """Scores and their (-score, uid) order for one metric in one scope."""
+
+    __slots__ = ("scores", "order", "version")
+
+    def __init__(self):
+        self.scores = {}        # uid -> score
+        self.order = SkipList()
+        self.version = 0
+
+    def load(self, scores: dict):
+        """Replace every score; one sort and an O(n) skip list build."""
+        self.scores = scores
+        self.order = SkipList.from_sorted(sorted((-score, uid) for uid, score in scores.items()))
+        self.version += 1
+
+    def clear(self):
+        self.load({})
+
+    def set(self, uid: str, score, renamed=False):
+        """Re-score one user (None takes them off); O(log n)."""
+        order = self.order
+        old = self.scores.get(uid)
+
+        if old == score:
+            # Same score: a shown row only changes if the username did
+            if renamed and score is not None and order.rank((-score, uid)) < TOP_WINDOW:
+                self.version += 1
+            return
+
+        in_top = old is not None and order.rank((-old, uid)) < TOP_WINDOW
+        if old is not None:
+            order.remove((-old, uid))
+            del self.scores[uid]
+        if score is not None:
+            order.insert((-score, uid))
+            self.scores[uid] = score
+
+        if in_top or (score is not None and order.rank((-score, uid)) < TOP_WINDOW):
+            self.version += 1
+
+    def rows(self, offset: int, limit: int):
+        return [(uid, -neg) for neg, uid in self.order.slice(offset, offset + limit)]
+
+    def position(self, uid: str):
+        score = self.scores.get(uid)
+        if score is None:
+            return None
+
+        order = self.order
+        index = order.rank((-score, uid))
+        total = len(order)
+        above = -order.at(index - 1)[0] if index > 0 else None
+
+        return {
+            "position": index + 1,
+            "total": total,
+            "score": score,
+            "percentile": round(100.0 * (total - index - 1) / total, 1),
+            "gap": above - score if above is not None else None,
+        }
+
+
+# ---------------------------------------------------------
+# INDEX
+# ---------------------------------------------------------
+class LeaderboardIndex:
+    """
+    Ordered (score, user) boards for each registered metric: one global
+    set, plus one per group chat (per_chat metrics) holding its members.
+    """
+
+    def __init__(self, metrics: dict, archive=None):
+        self.metrics = metrics
+        self.weekly = [name for name, m in metrics.items() if m.weekly]
+        self.chat_metrics = [name for name, m in metrics.items() if m.per_chat]
+        self.archive = archive
+        self._lock = threading.Lock()
+        # scope (None = global, else chat id) -> metric -> _Board
+        self._boards = {None: {name: _Board() for name in metrics}}
+        # uid -> chats whose boards the user is ranked on, so leaving a
+        # chat (or a progress reset clearing `chats`) takes them off it
+        self._user_chats = {}
+
+        self._set_week(current_week())
+        # Last closed week: {"week": ..., "top3": [uid, ...]}
+        self._finished = get_meta("weekly_top3") or {"week": None, "top3": []}
+        # Thread archiving a week closed by _check_week, if any
+        self._archiver = None
+
+    def _set_week(self, week):
+        self._week = week
+        self._week_ends = next_week_start(week)
+
+    def _scope(self, chat):
+        """Boards of one scope, created on first use (lock held)."""
+        boards = self._boards.get(chat)
+        if boards is None:
+            boards = self._boards[chat] = {name: _Board() for name in self.chat_metrics}
+        return boards
+
+    def _board(self, metric, chat):
+        """A board to read, or None if that scope has none (lock held)."""
+        self._check_week()
+        return self._boards.get(chat, {}).get(metric)
+
+    def rebuild(self, users):
+        """
+        Replace the index with (uid, stored dict) pairs from storage.
+
+        Holds the lock throughout, so a commit that lands while storage is
+        being read applies its update afterwards instead of being lost.
+        """
+        with self._lock:
+            self._set_week(current_week())
+            last_week = previous_week(self._week)
+            close_last_week = self._finished.get("week") != last_week
+            last_week_rows = []
+
+            # scope -> metric -> uid -> score
+            scores = {None: {name: {} for name in self.metrics}}
+            user_chats = {}
+            for uid, stored in users:
+                if not uid.isdigit():
+                    continue
+                record = UserRecord.from_dict(stored)
+                if record.chats:
+                    user_chats[uid] = set(record.chats)
+                for scope in [None] + record.chats:
+                    names = self.metrics if scope is None else self.chat_metrics
+                    by_metric = scores.get(scope)
+                    if by_metric is None:
+                        by_metric = scores[scope] = {name: {} for name in names}
+                    for name in names:
+                        score = _score(self.metrics[name], record, self._week)
+                        if score is not None:
+                            by_metric[name][uid] = score
+
+                weekly = record.weekly
+                if close_last_week and weekly.get("week") == last_week:
+                    last_week_rows.append((uid, weekly.get("xp", 0), weekly.get("grinds", 0)))
+
+            self._user_chats = user_chats
+
+            # Boards are reloaded in place so their versions keep counting up
+            for scope in set(self._boards) | set(scores):
+                by_metric = scores.get(scope, {})
+                for name, board in self._scope(scope).items():
+                    board.load(by_metric.get(name, {}))
+
+            # The bot was down when last week ended: close it from storage.
+            # A week nobody played (fresh install, downtime) is not archived
+            close_last_week = close_last_week and bool(last_week_rows)
+            if close_last_week:
+                last_week_rows.sort(key=lambda row: (-row[1], row[0]))
+                finished = self._finish(last_week, last_week_rows)
+
+        if close_last_week:
+            self._store_finished(last_week, last_week_rows, finished)
+
+    def _check_week(self):
+        """
+        Close the current week once it is over (lock held). Only the
+        snapshot and the board reset happen here; the archive and meta
+        are written by a background thread. An empty week is not archived.
+        """
+        if time.time() < self._week_ends:
+            return
+
+        xp_board = self._boards[None]["xp"]
+        grinds = self._boards[None]["grinds"].scores
+        week = self._week
+        ranked = [(uid, -neg, grinds.get(uid, 0)) for neg, uid in xp_board.order]
+
+        for boards in self._boards.values():
+            for name in self.weekly:
+                if name in boards:
+                    boards[name].clear()
+        self._set_week(current_week())
+
+        if not ranked:
+            return
+        finished = self._finish(week, ranked)
+        self._archiver = threading.Thread(
+            target=self._store_finished, args=(week, ranked, finished),
+            name="week-archive", daemon=True
+        )
+        self._archiver.start()
+
+    def _finish(self, week, ranked):
+        """Record a closed week's Top 3 in memory (lock held)."""
+        self._finished = {"week": week, "top3": [uid for uid, _xp, _grinds in ranked[:3]]}
+        return self._finished
+
+    def _store_finished(self, week, ranked, finished):
+        """
+        Archive a closed week and persist its Top 3 (lock not held).
+        `ranked` is [(uid, xp, grinds), ...] in XP order. If the bot stops
+        first, the next rebuild closes the week again from storage.
+        """
+        try:
+            if self.archive is not None:
+                self.archive.write(week, ranked)
+            set_meta("weekly_top3", finished)
+        except Exception as e:
+            logger.error(f"Archiving week {week} failed: {e}")
+
+    def close_week(self):
+        """Close the finished week now instead of on the next index access."""
+        with self._lock:
+            self._check_week()
+
+    def finished_week(self):
+        """(week, [uid, ...]) of the last closed week and its Top 3."""
+        with self._lock:
+            self._check_week()
+            return self._finished["week"], list(self._finished["top3"])
+
+    def update(self, uid: str, record, old_username=None):
+        """
+        Re-score one user on the global and their chats' boards; O(log n) each.
+        `old_username` is their username before this change (commit hook).
+        """
+        if not uid.isdigit():
+            return
+
+        renamed = record.get("username") != old_username
+        with self._lock:
+            self._check_week()
+            scores = {name: _score(metric, record, self._week) for name, metric in self.metrics.items()}
+            for name, board in self._boards[None].items():
+                board.set(uid, scores[name], renamed)
+            chats = set(record.chats)
+            for chat in chats:
+                for name, board in self._scope(chat).items():
+                    board.set(uid, scores[name], renamed)
+
+            for chat in self._user_chats.get(uid, set()) - chats:
+                for board in self._boards.get(chat, {}).values():
+                    board.set(uid, None)
+            if chats:
+                self._user_chats[uid] = chats
+            else:
+                self._user_chats.pop(uid, None)
+
+    def version(self, metric: str, chat=None) -> int:
+        """Changes whenever the first TOP_WINDOW rows of a board may have changed."""
+        with self._lock:
+            board = self._board(metric, chat)
+            return board.version if board is not None else 0
+
+    def top(self, metric: str, limit: int = 10, chat=None):
+        """[(uid, score), ...] for the best `limit` users."""
+        with self._lock:
+            board = self._board(metric, chat)
+            return board.rows(0, limit) if board is not None else []
+
+    def page(self, metric: str, offset: int, limit: int, chat=None):
+        """
+        ([(uid, score), ...], total) for positions [offset, offset + limit);
+        O(log n + limit) on the skip list.
+        """
+        with self._lock:
+            board = self._board(metric, chat)
+            if board is None:
+                return [], 0
+            return board.rows(offset, limit), len(board.order)
+
+    def position(self, metric: str, uid: str, chat=None):
+        """
+        Where one user stands on a board, or None if they are not on it
+        (e.g. no weekly stats yet this week).
+        Returns {"position" (1-based), "total", "score", "percentile"
+        (share of users ranked below, 0-100), "gap" (points behind the
+        user directly above, None for #1)}.
+        """
+        with self._lock:
+            board = self._board(metric, chat)
+            return board.position(uid) if board is not None else None
+
+    def has_chat_board(self, metric: str) -> bool:
+        return metric in self.chat_metrics
+
+    def __len__(self):
+        with self._lock:
+            return max(len(board.scores) for board in self._boards[None].values())
+
+
+archive = WeekArchive(WEEKS_DIR, top_rows=TOP_WINDOW)
+index = LeaderboardIndex(METRICS, archive=archive)
+
+
+def rebuild():
+    index.rebuild(iter_users())
+
+
+def _flag_dominator(uid, user, finished):
+    """Rollover hook: Top 3 of the week that just closed get the flag."""
+    week, top3 = index.finished_week()
+    if finished.get("week") == week and uid in top3:
+        user.weekly["top3"] = True
+        # Awarded here: the user's first action of the week may not be a grind
+        award_new_badges(int(uid), user, ("top3",))
+
+
+add_commit_hook(index.update)
+add_reload_hook(rebuild)
+add_rollover_hook(_flag_dominator)
+rebuild()
@@ -0,0 +1,71 @@
+"""
+modules/leaderboard_metrics.py
+Leaderboard metric registry for PWN Ascension.
+
+Every board is declared once here: how a user is scored, whether the
+board is weekly (emptied when a week closes) or also kept per group
+chat, and how its screen is titled. The index (leaderboard_index.py)
+keeps one ordered board per metric and the screens (leaderboard.py)
+are generated from the same declarations, so a new board is one
+register() call: no new query function, screen or full scan.
+
+Metric names appear in callback data (lb_<name>_p<n>), so they must
+not contain "_".
+"""
+
+
+class Metric:
+    """One leaderboard: scoring plus how its screen is shown."""
+
+    __slots__ = ("name", "score", "title", "button", "unit", "weekly", "per_chat")
+
+    def __init__(self, name, score, title, button, unit, weekly=False, per_chat=False):
+        if "_" in name:
+            raise ValueError(f"Metric name {name!r} must not contain '_'")
+        self.name = name
+        self.score = score          # fn(UserRecord) -> int
+        self.title = title
+        self.button = button
+        self.unit = unit
+        self.weekly = weekly        # scored from this week's stats only
+        self.per_chat = per_chat    # also ranked within each group chat
+
+
+METRICS = {}
+
+
+def register(metric: Metric):
+    """Add a board; registration order is the order of the board buttons."""
+    METRICS[metric.name] = metric
+    return metric
+
+
+# ---------------------------------------------------------
+# BOARDS
+# ---------------------------------------------------------
+register(Metric(
+    "xp", lambda user: user.weekly.get("xp", 0),
+    title="TOP XP LEADERBOARD", button="🔥 Top XP", unit="XP",
+    weekly=True, per_chat=True
+))
+
+register(Metric(
+    "grinds", lambda user: user.weekly.get("grinds", 0),
+    title="TOP GRINDERS", button="⚡ Top Grinds", unit="grinds",
+    weekly=True, per_chat=True
+))
+
+register(Metric(
+    "badges", lambda user: len(user.badges),
+    title="TOP BADGE COLLECTORS", button="🎖️ Top Badges", unit="badges"
+))
+
+register(Metric(
+    "streak", lambda user: user.streak,
+    title="TOP STREAKS", button="📆 Top Streaks", unit="days"
+))
+
+register(Metric(
+    "lifetime", lambda user: user.xp,
+    title="ALL-TIME XP", button="👑 All-Time XP", unit="XP"
+))
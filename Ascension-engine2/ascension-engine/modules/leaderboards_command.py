@@ -3,9 +3,8 @@ modules/leaderboards_command.py
 Allows users to type /leaderboards to instantly open the XP leaderboard.
 """
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from database import get_user
-from modules.leaderboard import get_top_xp, get_top_grinds, get_top_badge_collectors
+from modules.leaderboard import get_top, format_position, display_names, board_chat, leaderboard_keyboard
 from ui.components import render_text
 
 
@@ -15,28 +14,25 @@ def handle_leaderboards_command(bot, update):
 
     user = get_user(user_id)
 
-    # Build XP leaderboard as default
-    top = get_top_xp()
+    # Build XP leaderboard as default (the group's own board in a group)
+    chat = board_chat("xp", update.effective_chat)
+    top = get_top("xp", chat=chat)
 
     text = "🏆 *WEEKLY LEADERBOARDS*\n\n"
+    if chat is not None:
+        text += "👥 _This group_\n\n"
+    names = display_names(uid for uid, _ in top)
     rank = 1
     for uid, xp in top:
-        u = get_user(int(uid))
-        username = u.get("username", f"User{uid}") if u else f"User{uid}"
-        username_safe = username.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("`", "\\`")
+        username_safe = names[uid]
         text += f"{rank}. {username_safe} — {xp} XP\n"
         rank += 1
 
+    text += "\n" + format_position(user_id, "xp", "XP", chat)
+
     text = render_text(user, text)
 
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("🔥 Top XP", callback_data="lb_xp"),
-            InlineKeyboardButton("⚡ Top Grinds", callback_data="lb_grinds"),
-            InlineKeyboardButton("🏅 Top Badges", callback_data="lb_badges"),
-        ],
-        [InlineKeyboardButton("🏠 Menu", callback_data="menu_main")]
-    ])
+    keyboard = leaderboard_keyboard()
 
     bot.send_message(
         chat_id=chat_id,
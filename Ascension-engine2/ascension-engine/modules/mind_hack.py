@@ -8,7 +8,8 @@ Fully dynamic, uses difficulty tiers and 20+ sequence patterns.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import load_db, save_db, get_user
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 XP = {
@@ -205,22 +206,16 @@ def _process_answer(bot, update, chosen, correct, level):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     if chosen == correct:
-        db[uid]["xp"] += XP[level]
-        db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + XP[level]
-        save_db(db)
+        gained, _ = award_xp(user_id, XP[level], "mind_hack")
 
         text = render_text(user,
             f"🧠 *CORRECT!* 🎉\n\n"
             f"Difficulty: *{level.capitalize()}*\n"
-            f"+{XP[level]} XP"
+            f"+{XP[level]} XP" + boost_note(XP[level], gained)
         )
     else:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - PENALTY)
-        save_db(db)
+        award_xp(user_id, -PENALTY, "mind_hack")
 
         text = render_text(user,
             f"❌ *WRONG!*\n\n"
@@ -11,9 +11,10 @@ This module:
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import load_db, save_db, get_user
+from database import get_user, transaction
 from ui.components import render_text
 from modules.badges import check_for_new_badges
+from modules.xp_ledger import award_xp
 
 # XP gained per onboarding screen
 ONBOARDING_XP_REWARD = 100
@@ -75,12 +76,10 @@ def handle_joined_yes(bot, update):
     user_id = query.from_user.id
 
     # Record answer as "B" for community (like original flow)
-    uid = str(user_id)
-    db = load_db()
-    step = db[uid].get("onboarding_step", 1)
-    db[uid][f"onb_step_{step}_answer"] = "B"
-    db[uid]["xp"] = db[uid].get("xp", 0) + ONBOARDING_XP_REWARD
-    save_db(db)
+    with transaction(user_id) as user:
+        step = user.get("onboarding_step", 1)
+        user[f"onb_step_{step}_answer"] = "B"
+        award_xp(user_id, ONBOARDING_XP_REWARD, "onboarding")
 
     # Advance to step 2
     user = get_user(user_id)
@@ -93,17 +92,13 @@ def handle_joined_yes(bot, update):
 def _record_answer(bot, update, user_id, user, answer):
     query = update.callback_query
 
-    uid = str(user_id)
-    db = load_db()
+    with transaction(user_id) as u:
+        # Save user's answer
+        step = u.get("onboarding_step", 1)
+        u[f"onb_step_{step}_answer"] = answer
 
-    # Save user's answer
-    step = user.get("onboarding_step", 1)
-    db[uid][f"onb_step_{step}_answer"] = answer
-
-    # Give XP
-    db[uid]["xp"] = db[uid].get("xp", 0) + ONBOARDING_XP_REWARD
-
-    save_db(db)
+        # Give XP
+        award_xp(user_id, ONBOARDING_XP_REWARD, "onboarding")
 
     # Next
     user = get_user(user_id)
@@ -116,22 +111,18 @@ def _record_answer(bot, update, user_id, user, answer):
 def _advance_step(bot, update, user_id, user):
     query = update.callback_query
 
-    uid = str(user_id)
-    db = load_db()
+    with transaction(user_id) as u:
+        step = u.get("onboarding_step", 1) + 1
+        u["onboarding_step"] = step
 
-    step = user.get("onboarding_step", 1) + 1
-    db[uid]["onboarding_step"] = step
-    save_db(db)
+        # End of onboarding
+        if step > 5:
+            u["onboarding_complete"] = True
 
-    # End of onboarding
-    if step > 5:
-        db = load_db()
-        db[uid]["onboarding_complete"] = True
-        save_db(db)
-
-        # Badge check (Initiate)
-        new_badge = check_for_new_badges(user_id)
+            # Badge check (Initiate)
+            check_for_new_badges(user_id, ("onboarding",))
 
+    if step > 5:
         return _complete_screen(bot, update, user_id)
 
     return _show_step(bot, update, user_id, get_user(user_id))
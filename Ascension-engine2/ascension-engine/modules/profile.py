@@ -4,7 +4,8 @@ Profile screen, grind initiator, and power stats panel.
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, save_db
+from database import get_user
+from modules.badge_catalog import badge_emoji
 from ui.components import render_text
 
 # Grinding engine
@@ -35,25 +36,13 @@ def _send_profile(bot, chat_id, user):
     
     badge_count = len(badges)
     
-    # Badge emoji mapping
-    badge_emojis = {
-        "Initiate": "🎖",
-        "First Grind": "⚡",
-        "XP Hunter": "🏹",
-        "Streak Master": "🔥",
-        "Grind Lord": "👑",
-        "Diamond Rank": "💎",
-        "Challenge Complete": "🏆",
-        "Week Warrior": "⚔️"
-    }
-    
     # Badge grid (2 rows x 4 columns)
     icons = []
     for badge in badges[:8]:
         if isinstance(badge, dict):
             icons.append(badge.get("emoji", "⬛"))
         else:
-            icons.append(badge_emojis.get(badge, "⬛"))
+            icons.append(badge_emoji(badge, "⬛"))
     
     while len(icons) < 8:
         icons.append("⬛")
@@ -116,25 +105,13 @@ def _edit_profile(bot, query, user):
     
     badge_count = len(badges)
     
-    # Badge emoji mapping
-    badge_emojis = {
-        "Initiate": "🎖",
-        "First Grind": "⚡",
-        "XP Hunter": "🏹",
-        "Streak Master": "🔥",
-        "Grind Lord": "👑",
-        "Diamond Rank": "💎",
-        "Challenge Complete": "🏆",
-        "Week Warrior": "⚔️"
-    }
-    
     # Badge grid (2 rows x 4 columns)
     icons = []
     for badge in badges[:8]:
         if isinstance(badge, dict):
             icons.append(badge.get("emoji", "⬛"))
         else:
-            icons.append(badge_emojis.get(badge, "⬛"))
+            icons.append(badge_emoji(badge, "⬛"))
     
     while len(icons) < 8:
         icons.append("⬛")
@@ -12,14 +12,17 @@ Outcomes:
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user, transaction
+from modules.xp_ledger import award_xp, boost_note
+from modules.badges import unlock_badge
+from modules.badge_catalog import awarded_by
 from ui.components import render_text
 
 XP_CORRECT = 100
 XP_WRONG = 20
 XP_EDGE = 500
 
-RARE_BADGE_NAME = "Quantum Master"
+RARE_BADGE_NAME = awarded_by("quantum_edge").name
 
 
 # ---------------------------------------------------------
@@ -73,9 +76,6 @@ def flip(bot, update, user_pick):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     # Determine actual coin outcome
     # 1% Edge
     if random.random() < 0.01:
@@ -87,20 +87,18 @@ def flip(bot, update, user_pick):
     # EDGE EVENT
     # -------------------------------
     if outcome == "edge":
-        db[uid]["xp"] += XP_EDGE
-
-        # Award badge if not unlocked
-        if RARE_BADGE_NAME not in db[uid]["badges"]:
-            db[uid]["badges"].append(RARE_BADGE_NAME)
+        with transaction(user_id) as u:
+            gained, _ = award_xp(user_id, XP_EDGE, "quantum_flip")
 
-        save_db(db)
+            # Award badge if not unlocked
+            unlock_badge(user_id, u, RARE_BADGE_NAME)
 
         text = render_text(
             user,
             f"⚛️✨ *INCREDIBLE — COIN LANDED ON ITS EDGE!* ✨⚛️\n\n"
             f"You picked: *{user_pick.title()}*\n"
             f"Coin result: **EDGE**\n\n"
-            f"+{XP_EDGE} XP\n"
+            f"+{XP_EDGE} XP{boost_note(XP_EDGE, gained)}\n"
             f"🎖️ Badge unlocked: *{RARE_BADGE_NAME}*"
         )
 
@@ -116,19 +114,17 @@ def flip(bot, update, user_pick):
     correct = (user_pick == outcome)
 
     if correct:
-        db[uid]["xp"] += XP_CORRECT
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_CORRECT, "quantum_flip")
 
         text = render_text(
             user,
             f"⚛️ *YOU GUESSED CORRECT!* ⚛️\n\n"
             f"You picked: *{user_pick.title()}*\n"
             f"Coin result: *{outcome.title()}*\n\n"
-            f"+{XP_CORRECT} XP"
+            f"+{XP_CORRECT} XP" + boost_note(XP_CORRECT, gained)
         )
     else:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - XP_WRONG)
-        save_db(db)
+        award_xp(user_id, -XP_WRONG, "quantum_flip")
 
         text = render_text(
             user,
@@ -11,7 +11,8 @@ Categories:
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 
@@ -174,20 +175,15 @@ def check_answer(bot, update, choice, correct, category):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     if choice == correct:
-        db[uid]["xp"] += XP_CORRECT
-        save_db(db)
+        gained, _ = award_xp(user_id, XP_CORRECT, "quiz")
 
         text = render_text(user,
-            f"✅ *Correct!*\n+{XP_CORRECT} XP\n\n"
+            f"✅ *Correct!*\n+{XP_CORRECT} XP{boost_note(XP_CORRECT, gained)}\n\n"
             "Next question?"
         )
     else:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - XP_WRONG)
-        save_db(db)
+        award_xp(user_id, -XP_WRONG, "quiz")
 
         text = render_text(user,
             f"❌ *Wrong!* Correct answer: {correct}\n"
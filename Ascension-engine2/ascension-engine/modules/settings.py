@@ -10,7 +10,7 @@ Features:
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import load_db, save_db, get_user
+from database import get_user, transaction, clear_activity
 from ui.components import render_text
 
 
@@ -81,13 +81,9 @@ def _toggle_notifications(bot, update):
     query = update.callback_query
     user_id = query.from_user.id
 
-    db = load_db()
-    uid = str(user_id)
-
-    current = db[uid]["settings"].get("notifications", True)
-    db[uid]["settings"]["notifications"] = not current
-
-    save_db(db)
+    with transaction(user_id) as user:
+        current = user["settings"].get("notifications", True)
+        user["settings"]["notifications"] = not current
 
     return _show_settings(bot, update)
 
@@ -99,13 +95,9 @@ def _toggle_theme(bot, update):
     query = update.callback_query
     user_id = query.from_user.id
 
-    db = load_db()
-    uid = str(user_id)
-
-    current = db[uid]["settings"].get("theme", "Dark")
-    db[uid]["settings"]["theme"] = "Light" if current == "Dark" else "Dark"
-
-    save_db(db)
+    with transaction(user_id) as user:
+        current = user["settings"].get("theme", "Dark")
+        user["settings"]["theme"] = "Light" if current == "Dark" else "Dark"
 
     return _show_settings(bot, update)
 
@@ -159,35 +151,11 @@ def _reset_account(bot, update):
     query = update.callback_query
     user_id = query.from_user.id
 
-    uid = str(user_id)
-    db = load_db()
-
-    # Full wipe of user data
-    db[uid] = {
-        "xp": 0,
-        "rank": "Bronze",
-        "streak": 0,
-        "grinds_today": 0,
-        "last_grind": 0,
-        "last_grind_date": None,
-        "badges": [],
-        "onboarding_step": 1,
-        "onboarding_complete": False,
-        "settings": {
-            "notifications": True,
-            "theme": "Dark",
-            "language": "English"
-        },
-        "activity": [],
-        "weekly": {
-            "xp": 0,
-            "grinds": 0,
-            "badges": 0,
-            "top3": False
-        },
-    }
-
-    save_db(db)
+    with transaction(user_id) as user:
+        # Wipe progress; keep username, verification and join date
+        user.reset()
+
+    clear_activity(user_id)
 
     text = render_text(get_user(user_id),
         "🧹 *ACCOUNT RESET SUCCESSFUL*\n\n"
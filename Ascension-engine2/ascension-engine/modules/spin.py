@@ -3,8 +3,16 @@ import asyncio
 from datetime import datetime, timedelta
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
+from modules.badge_catalog import awarded_by
+from utils.activity_events import (
+    EVENT_SPIN_BOOST, EVENT_SPIN_STREAK,
+    EVENT_SPIN_FRAGMENT, EVENT_SPIN_BADGE
+)
+
 SPIN_COOLDOWN_HOURS = 24
 
+SPIN_BADGE = awarded_by("spin")
+
 REWARDS = [
     ("+300 XP", "xp", 300, 60),
     ("+600 XP", "xp", 600, 50),
@@ -13,7 +21,7 @@ REWARDS = [
     ("📅 +1 Streak Day", "streak", 1, 15),
     ("🟦 Badge Fragment", "fragment", 1, 12),
     ("🂡 JACKPOT: +2,000 XP", "xp", 2000, 3),
-    ("💠 Wheel Master Badge", "badge", 1, 1),
+    (f"{SPIN_BADGE.emoji} {SPIN_BADGE.name} Badge", "badge", 1, 1),
 ]
 
 
@@ -107,19 +115,21 @@ def open_spin_screen(bot, update, user_id):
         )
 
 
+def _log_after_commit(user_id, code, payload):
+    """Log a spin reward once the open transaction commits."""
+    from database import after_commit, log_activity
+    after_commit(user_id, lambda: log_activity(user_id, code, payload))
+
+
 def start_spin(bot, update, user_id):
     """Perform the spin animation and award reward"""
-    from database import load_db, save_db, log_activity
+    from database import transaction
+    from modules.xp_ledger import award_xp
+    from modules.badges import unlock_badge
     import time
     
-    db = load_db()
-    uid = str(user_id)
-    
-    if uid not in db:
-        return
-    
-    db[uid]["last_spin"] = int(time.time())
-    save_db(db)
+    with transaction(user_id) as user:
+        user["last_spin"] = int(time.time())
     
     update.callback_query.answer()
     msg = update.callback_query.message
@@ -136,30 +146,25 @@ def start_spin(bot, update, user_id):
     reward = random.choices(REWARDS, weights=[r[3] for r in REWARDS])[0]
     text, r_type, amount, _ = reward
     
-    db = load_db()
-    
-    if r_type == "xp":
-        db[uid]["xp"] = db[uid].get("xp", 0) + amount
-        log_activity(user_id, f"🎰 Daily Spin: {text}")
-        
-    elif r_type == "boost":
-        db[uid]["xp_boost_until"] = int(time.time()) + (24 * 3600)
-        log_activity(user_id, f"🎰 Daily Spin: {text}")
-        
-    elif r_type == "streak":
-        db[uid]["streak"] = db[uid].get("streak", 0) + 1
-        log_activity(user_id, f"🎰 Daily Spin: {text}")
-        
-    elif r_type == "fragment":
-        db[uid]["badge_fragments"] = db[uid].get("badge_fragments", 0) + 1
-        log_activity(user_id, f"🎰 Daily Spin: {text}")
-        
-    elif r_type == "badge":
-        if "Wheel Master" not in db[uid].get("badges", []):
-            db[uid].setdefault("badges", []).append("Wheel Master")
-        log_activity(user_id, f"🎰 Daily Spin: {text}")
-    
-    save_db(db)
+    with transaction(user_id) as user:
+        if r_type == "xp":
+            award_xp(user_id, amount, "spin")
+            
+        elif r_type == "boost":
+            user["xp_boost_until"] = int(time.time()) + (24 * 3600)
+            _log_after_commit(user_id, EVENT_SPIN_BOOST, amount)
+            
+        elif r_type == "streak":
+            user["streak"] = user.get("streak", 0) + 1
+            _log_after_commit(user_id, EVENT_SPIN_STREAK, amount)
+            
+        elif r_type == "fragment":
+            user["badge_fragments"] = user.get("badge_fragments", 0) + 1
+            _log_after_commit(user_id, EVENT_SPIN_FRAGMENT, amount)
+            
+        elif r_type == "badge":
+            unlock_badge(user_id, user, SPIN_BADGE.name)
+            _log_after_commit(user_id, EVENT_SPIN_BADGE, amount)
     
     msg.edit_text(
         f"🎉 **YOU WON:**\n{text}\n\n"
@@ -8,7 +8,8 @@ User must tap within 1 second after receiving a "⚡ TAP NOW!" signal.
 import time
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 
@@ -93,9 +94,6 @@ def _process_tap(bot, update, signal_ts):
     now = time.time()
     reaction = now - signal_ts
 
-    db = load_db()
-    uid = str(user_id)
-
     if reaction < 0:
         xp = XP_FAIL
         msg = "⛔ You tapped too early!"
@@ -112,12 +110,9 @@ def _process_tap(bot, update, signal_ts):
         xp = XP_FAIL
         msg = f"🐌 Too slow... {int(reaction*1000)}ms (+0 XP)"
 
-    db[uid]["xp"] += xp
-    db[uid]["weekly"]["xp"] = db[uid].get("weekly", {}).get("xp", 0) + xp
-    save_db(db)
-    user = get_user(user_id)
+    gained, _ = award_xp(user_id, xp, "tap_speed")
 
-    text = render_text(user, msg)
+    text = render_text(user, msg + boost_note(xp, gained))
 
     keyboard = InlineKeyboardMarkup([
         [InlineKeyboardButton("🔁 Play Again", callback_data="tapspeed_start")],
@@ -6,7 +6,7 @@ A simple logic question to confirm the user is human.
 
 import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import load_db, save_db, get_user
+from database import get_user, transaction
 
 
 # List of reasoning questions
@@ -99,10 +99,8 @@ def check_reasoning_answer(bot, update, chosen, correct):
 
     if chosen == correct:
         # Mark verified
-        db = load_db()
-        uid = str(user_id)
-        db[uid]["verified"] = True
-        save_db(db)
+        with transaction(user_id) as user:
+            user["verified"] = True
 
         text = (
             "✅ *Correct!*\n\n"
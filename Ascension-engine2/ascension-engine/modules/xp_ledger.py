@@ -0,0 +1,130 @@
+"""
+modules/xp_ledger.py
+XP ledger for PWN Ascension — the one place XP changes.
+
+Handles:
+- Active XP boosts (Daily Spin) on gains
+- Lifetime, daily and weekly XP counters kept in step
+- Rank recalculation
+- XpAwarded (and GameFinished for game sources) on the event bus
+- One activity event per award, tagged with its source (deferred)
+
+award_xp() runs inside the user's transaction (joining one the caller
+already holds), so the XP change, derived counters, inline subscribers
+and leaderboard index update land in a single committed write.
+"""
+
+import time
+
+from database import transaction, log_activity
+from events import subscribe, emit, XpAwarded, GameFinished
+from utils.activity_events import (
+    EVENT_GRIND, EVENT_SPIN_XP, EVENT_ONBOARDING_XP,
+    EVENT_DICE_BATTLE, EVENT_TAP_SPEED, EVENT_BOMB_DEFUSAL, EVENT_MIND_HACK,
+    EVENT_ASCENSION_RUSH, EVENT_DARK_CORRIDOR, EVENT_XP_TYPHOON, EVENT_QUIZ,
+    EVENT_ORACLE, EVENT_QUANTUM_FLIP, EVENT_CHALLENGE,
+)
+
+
+XP_BOOST_MULTIPLIER = 2      # Daily Spin "XP Boost (x2)"
+
+# source -> activity event logged for it
+SOURCES = {
+    "grind": EVENT_GRIND,
+    "spin": EVENT_SPIN_XP,
+    "onboarding": EVENT_ONBOARDING_XP,
+    "dice_battle": EVENT_DICE_BATTLE,
+    "tap_speed": EVENT_TAP_SPEED,
+    "bomb_defusal": EVENT_BOMB_DEFUSAL,
+    "mind_hack": EVENT_MIND_HACK,
+    "ascension_rush": EVENT_ASCENSION_RUSH,
+    "dark_corridor": EVENT_DARK_CORRIDOR,
+    "xp_typhoon": EVENT_XP_TYPHOON,
+    "quiz": EVENT_QUIZ,
+    "oracle": EVENT_ORACLE,
+    "quantum_flip": EVENT_QUANTUM_FLIP,
+    "challenge": EVENT_CHALLENGE,
+}
+
+# Sources a boost never multiplies (fixed rewards)
+UNBOOSTED = ("spin", "onboarding", "challenge")
+
+# Sources that are not mini-games
+NON_GAMES = ("grind", "spin", "onboarding", "challenge")
+
+
+# ---------------------------------------------------------
+# AWARD XP
+# ---------------------------------------------------------
+def award_xp(user_id: int, amount: int, source: str):
+    """
+    Add (or, with a negative amount, take away) XP.
+
+    Returns (change, new_rank): the XP actually applied after boosts and
+    the floor at 0, and the user's new rank if it changed, else None.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Unknown XP source: {source}")
+
+    with transaction(user_id) as user:
+        if amount > 0 and source not in UNBOOSTED and boost_active(user):
+            amount *= XP_BOOST_MULTIPLIER
+
+        old_xp = user.xp
+        user.xp = max(0, old_xp + amount)
+        change = user.xp - old_xp
+
+        user.xp_today = max(0, user.xp_today + change)
+        weekly = user.weekly
+        weekly["xp"] = max(0, weekly.get("xp", 0) + change)
+
+        new_rank = calculate_rank(user.xp)
+        rank = new_rank if new_rank != user.rank else None
+        user.rank = new_rank
+
+        if change:
+            emit(XpAwarded(user_id, change, source, rank))
+        if source not in NON_GAMES:
+            emit(GameFinished(user_id, source, change))
+
+    return change, rank
+
+
+def boost_active(user) -> bool:
+    until = user.xp_boost_until
+    return bool(until) and until > time.time()
+
+
+def boost_note(base: int, change: int) -> str:
+    """Line added under a game result when a boost changed the reward."""
+    if change > base > 0:
+        return f"\n⚡ XP Boost x{XP_BOOST_MULTIPLIER}: +{change} XP"
+    return ""
+
+
+# ---------------------------------------------------------
+# ACTIVITY (deferred subscriber)
+# ---------------------------------------------------------
+def _log_award(event):
+    log_activity(event.user_id, SOURCES[event.source], event.amount)
+
+
+subscribe(XpAwarded, _log_award, deferred=True)
+
+
+# ---------------------------------------------------------
+# RANK CALCULATION
+# ---------------------------------------------------------
+def calculate_rank(xp):
+    """Return the appropriate rank based on XP."""
+    if xp >= 10000:
+        return "Ascended"
+    if xp >= 5000:
+        return "Master"
+    if xp >= 2500:
+        return "Diamond"
+    if xp >= 1500:
+        return "Gold"
+    if xp >= 750:
+        return "Silver"
+    return "Bronze"
@@ -10,7 +10,8 @@ Goal:
 
 import time
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from database import get_user, load_db, save_db
+from database import get_user
+from modules.xp_ledger import award_xp, boost_note
 from ui.components import render_text
 
 STORM_DURATION = 5        # seconds
@@ -96,26 +97,21 @@ def typhoon_finish(bot, update, taps):
     user_id = q.from_user.id
     user = get_user(user_id)
 
-    db = load_db()
-    uid = str(user_id)
-
     # XP Calculation
     if taps < 3:
-        db[uid]["xp"] = max(0, db[uid]["xp"] - PENALTY_SMALL)
-        save_db(db)
+        award_xp(user_id, -PENALTY_SMALL, "xp_typhoon")
         result = render_text(user,
             f"💀 *TYPHOON OVERPOWERED YOU!*\n\n"
             f"You tapped only *{taps}* times.\n"
             f"Penalty: −{PENALTY_SMALL} XP"
         )
     else:
-        gained = taps * XP_PER_TAP
-        db[uid]["xp"] += gained
-        save_db(db)
+        base = taps * XP_PER_TAP
+        gained, _ = award_xp(user_id, base, "xp_typhoon")
         result = render_text(user,
             f"🔥 *YOU SURVIVED THE TYPHOON!* 🔥\n\n"
             f"Taps: *{taps}*\n"
-            f"XP Earned: *+{gained} XP*"
+            f"XP Earned: *+{base} XP*" + boost_note(base, gained)
         )
 
     keyboard = InlineKeyboardMarkup([
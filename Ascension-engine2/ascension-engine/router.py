@@ -87,6 +87,13 @@ from database import init_user
 logger = logging.getLogger(__name__)
 
 
+def _group_chat_id(chat):
+    """Chat id of a group chat (where membership is tracked), else None."""
+    if chat is not None and chat.type in ("group", "supergroup"):
+        return chat.id
+    return None
+
+
 # ------------------------------------------------------
 # POLLING-BASED HANDLERS
 # ------------------------------------------------------
@@ -97,7 +104,7 @@ def handle_command(update: Update, context):
         text = update.message.text or ""
         user_id = update.message.from_user.id
         username = update.message.from_user.username
-        init_user(user_id, username)
+        init_user(user_id, username, _group_chat_id(update.message.chat))
 
         # Route based on command
         if text == "/start":
@@ -139,8 +146,9 @@ def handle_callback(update: Update, context):
         data = update.callback_query.data
         user_id = update.callback_query.from_user.id
         username = update.callback_query.from_user.username
+        message = update.callback_query.message
         
-        init_user(user_id, username)
+        init_user(user_id, username, _group_chat_id(message.chat if message else None))
 
         # Route based on callback data prefix
         if data.startswith("menu"):
@@ -0,0 +1,16 @@
+"""
+tests/conftest.py
+Shared pytest setup: makes the engine modules importable from tests/
+and points the storage layer at a throwaway folder before `database`
+is first imported.
+"""
+
+import os
+import sys
+import tempfile
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ENGINE_DIR not in sys.path:
+    sys.path.insert(0, ENGINE_DIR)
+
+os.environ["STORAGE_DIR"] = tempfile.mkdtemp(prefix="ascension-tests-")
@@ -0,0 +1,94 @@
+"""
+tests/test_activity_store.py
+Activity ring buffers: wraparound, newest-first paging, clear and reopen.
+"""
+
+from backends.activity_store import ActivityStore
+
+
+def _store(tmp_path, retention=5, shards=2):
+    return ActivityStore(str(tmp_path / "activity"), retention=retention, shards=shards)
+
+
+def test_page_is_newest_first(tmp_path):
+    store = _store(tmp_path)
+    for i in range(3):
+        store.append(7, 1000 + i, 1, i)
+
+    events, total = store.page(7, 0, 10)
+    assert total == 3
+    assert events == [(1002, 1, 2), (1001, 1, 1), (1000, 1, 0)]
+
+
+def test_ring_buffer_wraps(tmp_path):
+    store = _store(tmp_path, retention=5)
+    store.append_many(7, [(1000 + i, 1, i) for i in range(12)])
+
+    events, total = store.page(7, 0, 10)
+    assert total == 5
+    assert [payload for _, _, payload in events] == [11, 10, 9, 8, 7]
+
+
+def test_paging_by_offset(tmp_path):
+    store = _store(tmp_path, retention=5)
+    for i in range(8):
+        store.append(7, 1000 + i, 1, i)
+
+    assert [p for _, _, p in store.page(7, 0, 2)[0]] == [7, 6]
+    assert [p for _, _, p in store.page(7, 2, 2)[0]] == [5, 4]
+    assert [p for _, _, p in store.page(7, 4, 2)[0]] == [3]
+    assert store.page(7, 5, 2) == ([], 5)
+
+
+def test_users_are_separate(tmp_path):
+    store = _store(tmp_path, shards=2)
+    store.append(1, 1000, 1, 1)
+    store.append(3, 1000, 2, 3)          # same shard as user 1
+    store.append(2, 1000, 3, 2)
+
+    assert store.page(1, 0, 10) == ([(1000, 1, 1)], 1)
+    assert store.page(3, 0, 10) == ([(1000, 2, 3)], 1)
+    assert store.page(2, 0, 10) == ([(1000, 3, 2)], 1)
+    assert store.page(4, 0, 10) == ([], 0)
+
+
+def test_clear_empties_one_user(tmp_path):
+    store = _store(tmp_path)
+    store.append(1, 1000, 1, 1)
+    store.append(3, 1000, 1, 3)
+    store.clear(1)
+    store.clear(99)                     # unknown user: no-op
+
+    assert store.page(1, 0, 10) == ([], 0)
+    assert store.page(3, 0, 10)[1] == 1
+
+    store.append(1, 2000, 2, 5)
+    assert store.page(1, 0, 10) == ([(2000, 2, 5)], 1)
+
+
+def test_large_payloads_are_kept(tmp_path):
+    store = _store(tmp_path)
+    store.append(1, 1000, 1, 100000)            # e.g. a deep Dark Corridor run
+    store.append(1, 1001, 1, -100000)
+    assert [p for _, _, p in store.page(1, 0, 10)[0]] == [-100000, 100000]
+
+
+def test_overflowing_payload_is_clamped_and_logged(tmp_path, caplog):
+    store = _store(tmp_path)
+    store.append(1, 1000, 1, 2 ** 70)
+    assert store.page(1, 0, 10)[0] == [(1000, 1, 2 ** 63 - 1)]
+    assert "out of range" in caplog.text
+
+
+def test_reopen_keeps_log_and_retention(tmp_path):
+    store = _store(tmp_path, retention=5)
+    for uid in range(200):              # forces the shard files to grow
+        store.append(uid, 1000, 1, uid)
+    store.append_many(7, [(2000 + i, 2, i) for i in range(7)])
+    store.close()
+
+    store = _store(tmp_path, retention=50)
+    assert store.page(7, 0, 10) == (
+        [(2006, 2, 6), (2005, 2, 5), (2004, 2, 4), (2003, 2, 3), (2002, 2, 2)], 5
+    )
+    assert store.page(199, 0, 10) == ([(1000, 1, 199)], 1)
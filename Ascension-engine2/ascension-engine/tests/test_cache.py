@@ -0,0 +1,142 @@
+"""
+tests/test_cache.py
+Write-back user cache: LRU eviction and flushing dirty records.
+"""
+
+from backends.cache import CachedBackend
+
+
+class _MemoryEngine:
+    """Dict-backed engine that records every put_many batch."""
+
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+        self.batches = []
+        self.closed = False
+
+    def get(self, uid):
+        return self.records.get(uid)
+
+    def get_many(self, uids):
+        return {uid: self.records[uid] for uid in uids if uid in self.records}
+
+    def put_many(self, items):
+        items = list(items)
+        self.batches.append(dict(items))
+        self.records.update(items)
+
+    def iter_users(self):
+        return iter(list(self.records.items()))
+
+    def close(self):
+        self.closed = True
+
+
+def _cache(inner, **kwargs):
+    kwargs.setdefault("flush_interval", 0)
+    kwargs.setdefault("flush_threshold", 10 ** 6)
+    return CachedBackend(inner, **kwargs)
+
+
+def test_put_is_not_written_until_flush():
+    inner = _MemoryEngine()
+    cache = _cache(inner)
+    cache.put("1", {"xp": 10})
+
+    assert inner.records == {}
+    assert cache.get("1") == {"xp": 10}
+
+    cache.flush()
+    assert inner.records == {"1": {"xp": 10}}
+    cache.flush()
+    assert len(inner.batches) == 1         # nothing dirty the second time
+
+
+def test_repeated_puts_coalesce():
+    inner = _MemoryEngine()
+    cache = _cache(inner)
+    for xp in range(5):
+        cache.put("1", {"xp": xp})
+    cache.flush()
+    assert inner.batches == [{"1": {"xp": 4}}]
+
+
+def test_eviction_keeps_max_users():
+    inner = _MemoryEngine({str(i): {"xp": i} for i in range(10)})
+    cache = _cache(inner, max_users=3)
+    for i in range(10):
+        cache.get(str(i))
+
+    assert list(cache._records) == ["7", "8", "9"]
+
+
+def test_eviction_drops_least_recently_used():
+    inner = _MemoryEngine({str(i): {"xp": i} for i in range(4)})
+    cache = _cache(inner, max_users=3)
+    cache.get("0")
+    cache.get("1")
+    cache.get("2")
+    cache.get("0")          # "1" is now the oldest
+    cache.get("3")
+
+    assert set(cache._records) == {"0", "2", "3"}
+
+
+def test_evicted_dirty_record_is_still_served_and_flushed():
+    inner = _MemoryEngine()
+    cache = _cache(inner, max_users=2)
+    cache.put("1", {"xp": 1})
+    cache.put("2", {"xp": 2})
+    cache.put("3", {"xp": 3})
+
+    assert "1" not in cache._records
+    assert inner.records == {}
+    assert cache.get("1") == {"xp": 1}      # not lost, not read from inner
+
+    cache.flush()
+    assert inner.records == {"1": {"xp": 1}, "2": {"xp": 2}, "3": {"xp": 3}}
+
+
+def test_flush_threshold_triggers_write():
+    inner = _MemoryEngine()
+    cache = _cache(inner, flush_threshold=3)
+    cache.put("1", {"xp": 1})
+    cache.put("2", {"xp": 2})
+    assert inner.batches == []
+
+    cache.put("3", {"xp": 3})
+    assert len(inner.batches) == 1
+
+
+def test_failed_flush_requeues():
+    inner = _MemoryEngine()
+    cache = _cache(inner)
+    cache.put("1", {"xp": 1})
+
+    def fail(items):
+        raise OSError("disk full")
+
+    inner.put_many, put_many = fail, inner.put_many
+    cache.flush()
+    assert inner.records == {}
+
+    inner.put_many = put_many
+    cache.flush()
+    assert inner.records == {"1": {"xp": 1}}
+
+
+def test_get_for_update_is_a_copy():
+    inner = _MemoryEngine({"1": {"badges": []}})
+    cache = _cache(inner)
+    record = cache.get_for_update("1")
+    record["badges"].append("Initiate")
+    assert cache.get("1") == {"badges": []}
+
+
+def test_close_flushes_and_closes_inner():
+    inner = _MemoryEngine()
+    cache = _cache(inner)
+    cache.put("1", {"xp": 1})
+    cache.close()
+    assert inner.records == {"1": {"xp": 1}}
+    assert inner.closed
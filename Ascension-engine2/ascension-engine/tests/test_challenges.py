@@ -0,0 +1,96 @@
+"""
+tests/test_challenges.py
+Challenge progress: epoch-stamped counters and rewards paid once per period.
+"""
+
+import pytest
+
+from database import get_user, transaction
+from modules import challenges
+from user_record import UserRecord
+
+
+@pytest.fixture
+def epochs(monkeypatch):
+    """Controls the (day, week) challenges are counted in."""
+    current = {"day": "2025-11-12", "week": "2025-11-10"}
+    monkeypatch.setattr(
+        challenges, "_epochs",
+        lambda: (("daily", current["day"]), ("weekly", current["week"]))
+    )
+    return current
+
+
+def _progress(uid, counter, amount):
+    with transaction(uid) as user:
+        return challenges.add_progress(uid, user, counter, amount)
+
+
+def test_reward_is_paid_once_per_epoch(epochs):
+    uid = 95001
+    xp = get_user(uid).xp
+
+    assert _progress(uid, "grinds", 19) == ["streak_day"]
+    assert _progress(uid, "grinds", 1) == ["grinds_today"]
+    assert _progress(uid, "grinds", 5) == []
+
+    user = get_user(uid)
+    assert user.xp == xp + 150 + 200
+    state = user.challenges["daily"]
+    assert state == {"epoch": "2025-11-12", "counts": {"grinds": 25}, "done": ["streak_day", "grinds_today"]}
+    assert user.challenges["weekly"]["counts"] == {"grinds": 25}
+
+
+def test_new_epoch_starts_from_zero(epochs):
+    uid = 95002
+    _progress(uid, "grinds", 20)
+    xp = get_user(uid).xp
+
+    epochs["day"] = "2025-11-13"
+    assert _progress(uid, "grinds", 1) == ["streak_day"]
+
+    user = get_user(uid)
+    assert user.xp == xp + 150
+    assert user.challenges["daily"]["counts"] == {"grinds": 1}
+    assert user.challenges["weekly"]["counts"] == {"grinds": 21}     # same week
+
+    progress = challenges.get_challenge_progress(user)
+    assert progress["daily"]["grinds_today"] == {"current": 1, "required": 20, "completed": False}
+    assert progress["daily"]["streak_day"]["completed"] is True
+
+
+def test_stale_state_reads_as_empty(epochs):
+    user = UserRecord.new(95003)
+    user.challenges["daily"] = {"epoch": "2025-11-01", "counts": {"grinds": 50}, "done": ["grinds_today"]}
+    progress = challenges.get_challenge_progress(user)
+    assert progress["daily"]["grinds_today"] == {"current": 0, "required": 20, "completed": False}
+
+
+def test_challenge_rewards_do_not_count_as_xp_progress(epochs):
+    uid = 95004
+    _progress(uid, "xp", 499)
+    # Completing grinds_today pays 200 XP through the ledger ("challenge")
+    _progress(uid, "grinds", 20)
+    assert get_user(uid).challenges["daily"]["counts"]["xp"] == 499
+
+
+def test_xp_losses_floor_counters_at_zero(epochs):
+    uid = 95005
+    _progress(uid, "xp", 100)
+    _progress(uid, "xp", -300)
+    assert get_user(uid).challenges["daily"]["counts"]["xp"] == 0
+
+
+def test_v2_upgrade_seeds_counters():
+    stored = {
+        "_v": 2,
+        "day": "2025-11-12",
+        "grinds_today": 20,
+        "xp_today": 120,
+        "weekly": {"xp": 900, "grinds": 40, "badges": 0, "week": "2025-11-10"},
+    }
+    record = UserRecord.from_dict(stored)
+    assert record.challenges == {
+        "daily": {"epoch": "2025-11-12", "counts": {"grinds": 20, "xp": 120}, "done": []},
+        "weekly": {"epoch": "2025-11-10", "counts": {"grinds": 40, "xp": 900}, "done": []},
+    }
@@ -0,0 +1,96 @@
+"""
+tests/test_events.py
+Event bus: inline subscribers join the transaction, deferred ones run
+after it commits (and never if it rolls back).
+"""
+
+import threading
+
+import events
+from database import get_user, transaction
+from events import subscribe, emit, Event
+
+
+class _Ping(Event):
+    __slots__ = ("n",)
+
+    def __init__(self, user_id, n):
+        super().__init__(user_id)
+        self.n = n
+
+
+class _DeferredPing(Event):
+    __slots__ = ()
+
+
+def test_inline_subscribers_share_the_record():
+    def inline(event, user):
+        user["pings"] = user.get("pings", 0) + event.n
+
+    subscribe(_Ping, inline)
+
+    with transaction(93001) as user:
+        emit(_Ping(93001, 2))
+        assert user["pings"] == 2           # applied to the open record
+        emit(_Ping(93001, 3))
+
+    assert get_user(93001)["pings"] == 5
+
+    # Without an open transaction emit() opens and commits its own
+    emit(_Ping(93001, 1))
+    assert get_user(93001)["pings"] == 6
+
+
+def test_failing_inline_subscriber_does_not_stop_others():
+    calls = []
+
+    class _Boom(Event):
+        __slots__ = ()
+
+    def broken(event, user):
+        raise RuntimeError("boom")
+
+    subscribe(_Boom, broken)
+    subscribe(_Boom, lambda event, user: calls.append(event.user_id))
+    emit(_Boom(93002))
+    assert calls == [93002]
+
+
+def test_deferred_subscribers_run_after_commit():
+    seen = []
+    committed = []
+
+    def deferred(event):
+        # Runs on the worker thread, after the commit is visible
+        seen.append((event.user_id, threading.current_thread().name, get_user(event.user_id)["tag"]))
+
+    subscribe(_DeferredPing, deferred, deferred=True)
+
+    with transaction(93003) as user:
+        user["tag"] = "committed"
+        emit(_DeferredPing(93003))
+        events.drain()
+        committed.append(list(seen))        # nothing ran before the commit
+
+    events.drain()
+    assert committed == [[]]
+    assert seen == [(93003, "event-worker", "committed")]
+
+
+def test_deferred_subscribers_are_dropped_on_rollback():
+    seen = []
+    subscribe(_DeferredPing, lambda event: seen.append(event.user_id), deferred=True)
+
+    try:
+        with transaction(93004):
+            emit(_DeferredPing(93004))
+            raise RuntimeError("handler failed")
+    except RuntimeError:
+        pass
+
+    events.drain()
+    assert 93004 not in seen
+
+
+def test_event_repr_lists_fields():
+    assert repr(_Ping(5, 2)) == "_Ping(user_id=5, n=2)"
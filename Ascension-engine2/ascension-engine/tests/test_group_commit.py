@@ -0,0 +1,106 @@
+"""
+tests/test_group_commit.py
+Group-commit wrapper: batched commits and reads of queued writes.
+"""
+
+import threading
+
+import pytest
+
+from backends.group_commit import GroupCommitBackend
+
+
+class _SlowEngine:
+    """Dict-backed engine whose put_many can be held open by the test."""
+
+    def __init__(self):
+        self.records = {}
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def get(self, uid):
+        return self.records.get(uid)
+
+    get_for_update = get
+
+    def get_many(self, uids):
+        return {uid: self.records[uid] for uid in uids if uid in self.records}
+
+    def put_many(self, items):
+        self.entered.set()
+        self.release.wait()
+        items = list(items)
+        self.batches.append(dict(items))
+        self.records.update(items)
+
+
+def test_put_returns_after_commit():
+    inner = _SlowEngine()
+    db = GroupCommitBackend(inner, window_ms=1)
+    db.put("1", {"xp": 1})
+    assert inner.records == {"1": {"xp": 1}}
+
+
+def test_concurrent_puts_share_a_commit():
+    inner = _SlowEngine()
+    db = GroupCommitBackend(inner, window_ms=200)
+
+    threads = [
+        threading.Thread(target=db.put, args=(str(i), {"xp": i}))
+        for i in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert inner.records == {str(i): {"xp": i} for i in range(20)}
+    assert len(inner.batches) < 20
+
+
+def test_pending_writes_are_served():
+    inner = _SlowEngine()
+    db = GroupCommitBackend(inner, window_ms=0)
+    inner.release.clear()
+
+    writer = threading.Thread(target=db.put, args=("1", {"xp": 7}))
+    writer.start()
+    inner.entered.wait(5)
+
+    # Not stored yet, but reads must not go back in time
+    assert inner.records == {}
+    assert db.get("1") == {"xp": 7}
+    assert db.get_many(["1", "2"]) == {"1": {"xp": 7}}
+    copy = db.get_for_update("1")
+    copy["xp"] = 0
+    assert db.get("1") == {"xp": 7}
+
+    inner.release.set()
+    writer.join()
+    assert inner.records == {"1": {"xp": 7}}
+    assert db._pending == {}
+
+
+def test_commit_error_reaches_writer():
+    inner = _SlowEngine()
+
+    def fail(items):
+        raise OSError("disk full")
+
+    inner.put_many = fail
+    db = GroupCommitBackend(inner, window_ms=0)
+    with pytest.raises(OSError, match="disk full"):
+        db.put("1", {"xp": 1})
+    assert db._pending == {}
+
+
+def test_sqlite_engine_synchronous_mode(tmp_path):
+    from backends.sqlite_backend import SqliteBackend
+
+    normal = SqliteBackend(str(tmp_path / "normal.sqlite3"))
+    full = SqliteBackend(str(tmp_path / "full.sqlite3"), synchronous="FULL")
+    # PRAGMA synchronous: 1 = NORMAL, 2 = FULL
+    assert normal._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert full._conn.execute("PRAGMA synchronous").fetchone()[0] == 2
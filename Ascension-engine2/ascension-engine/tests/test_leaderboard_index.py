@@ -0,0 +1,292 @@
+"""
+tests/test_leaderboard_index.py
+Leaderboard index: rebuild, re-scoring, positions, versions and week close.
+"""
+
+import threading
+
+from database import get_meta, set_meta
+from modules.leaderboard_index import LeaderboardIndex, _Board, TOP_WINDOW
+from modules.leaderboard_metrics import METRICS
+from user_record import UserRecord, SCHEMA_VERSION
+from utils.epochs import current_week, previous_week
+
+
+def _stored(xp=0, weekly_xp=None, grinds=0, streak=0, chats=(), week=None):
+    data = {"_v": SCHEMA_VERSION, "xp": xp, "streak": streak, "chats": list(chats)}
+    if weekly_xp is not None:
+        data["weekly"] = {"xp": weekly_xp, "grinds": grinds, "badges": 0, "week": week or current_week()}
+    return data
+
+
+def _record(**kwargs):
+    return UserRecord.from_dict(_stored(**kwargs))
+
+
+def _index(users=()):
+    index = LeaderboardIndex(METRICS)
+    index.rebuild(users)
+    return index
+
+
+# -------------------------------
+# _Board
+# -------------------------------
+def test_board_orders_by_score_then_uid():
+    board = _Board()
+    board.load({"1": 10, "2": 30, "3": 10})
+    assert board.rows(0, 10) == [("2", 30), ("1", 10), ("3", 10)]
+
+    board.set("3", 40)
+    board.set("2", None)
+    board.set("4", 5)
+    assert board.rows(0, 10) == [("3", 40), ("1", 10), ("4", 5)]
+    assert board.scores == {"3": 40, "1": 10, "4": 5}
+
+
+def test_board_version_follows_top_window():
+    board = _Board()
+    board.load({str(i): 1000 - i for i in range(TOP_WINDOW + 10)})
+    version = board.version
+
+    board.set(str(TOP_WINDOW + 5), 1)          # moves around below the window
+    assert board.version == version
+
+    board.set(str(TOP_WINDOW + 5), 2000)       # enters the window
+    assert board.version == version + 1
+
+    board.set("0", 0)                          # leaves the window
+    assert board.version == version + 2
+
+
+def test_board_load_matches_incremental_sets():
+    scores = {str(i): (i * 37) % 101 for i in range(500)}
+    loaded = _Board()
+    loaded.load(dict(scores))
+    built = _Board()
+    for uid, score in scores.items():
+        built.set(uid, score)
+    assert loaded.rows(0, 500) == built.rows(0, 500)
+
+
+# -------------------------------
+# LeaderboardIndex
+# -------------------------------
+def test_rebuild_skips_non_users_and_stale_weeks():
+    index = _index([
+        ("1", _stored(xp=100, weekly_xp=50)),
+        ("2", _stored(xp=300, weekly_xp=20, week="2000-01-03")),   # old week
+        ("meta", {"weekly_top3": []}),
+    ])
+    assert index.top("xp") == [("1", 50)]
+    assert index.top("lifetime") == [("2", 300), ("1", 100)]
+    assert len(index) == 2
+
+
+def test_update_rescores_every_metric():
+    index = _index([("1", _stored(xp=100, weekly_xp=50)), ("2", _stored(xp=80, weekly_xp=60))])
+    index.update("1", _record(xp=200, weekly_xp=150, grinds=3, streak=4))
+
+    assert index.top("xp") == [("1", 150), ("2", 60)]
+    assert index.top("grinds", 1) == [("1", 3)]
+    assert index.top("streak", 1) == [("1", 4)]
+    assert index.page("lifetime", 1, 5) == ([("2", 80)], 2)
+
+
+def test_update_ignores_non_user_keys():
+    index = _index()
+    index.update("meta", _record(xp=100, weekly_xp=5))
+    assert index.top("lifetime") == []
+
+
+def test_position_percentile_and_gap():
+    index = _index([
+        ("1", _stored(weekly_xp=500)),
+        ("2", _stored(weekly_xp=300)),
+        ("3", _stored(weekly_xp=300)),
+        ("4", _stored(weekly_xp=100)),
+    ])
+
+    assert index.position("xp", "1") == {
+        "position": 1, "total": 4, "score": 500, "percentile": 75.0, "gap": None,
+    }
+    assert index.position("xp", "3") == {
+        "position": 3, "total": 4, "score": 300, "percentile": 25.0, "gap": 0,
+    }
+    assert index.position("xp", "4")["gap"] == 200
+    assert index.position("xp", "4")["percentile"] == 0.0
+    assert index.position("xp", "9") is None
+
+
+def test_position_follows_updates():
+    index = _index([("1", _stored(weekly_xp=500)), ("2", _stored(weekly_xp=300))])
+    index.update("2", _record(weekly_xp=800))
+    assert index.position("xp", "2")["position"] == 1
+    assert index.position("xp", "1")["gap"] == 300
+
+
+def test_version_ignores_unchanged_top_rows():
+    index = _index([("1", _stored(weekly_xp=500)), ("2", _stored(weekly_xp=300))])
+    version = index.version("xp")
+
+    record = _record(weekly_xp=500)
+    record["username"] = "neo"
+    record["settings"] = {"theme": "Light"}     # not shown on the board
+    index.update("1", record, old_username="neo")
+    assert index.version("xp") == version
+
+    index.update("1", record, old_username="trinity")
+    assert index.version("xp") == version + 1
+
+
+def test_commit_hook_passes_old_username():
+    import database
+    from modules import leaderboard_index
+
+    with database.transaction(91001) as user:
+        user["username"] = "morpheus"
+        user.weekly["xp"] = 10 ** 6             # top of the global board
+    version = leaderboard_index.index.version("xp")
+
+    with database.transaction(91001) as user:
+        user["last_spin"] = "2025-11-10"
+    assert leaderboard_index.index.version("xp") == version
+
+    with database.transaction(91001) as user:
+        user["username"] = "morpheus2"
+    assert leaderboard_index.index.version("xp") == version + 1
+
+
+# -------------------------------
+# WEEK CLOSE
+# -------------------------------
+class _BlockingArchive:
+    """Archive whose write() waits until the test releases it."""
+
+    def __init__(self):
+        self.writes = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, week, ranked):
+        self.started.set()
+        self.release.wait(5)
+        self.writes.append((week, list(ranked)))
+
+
+def _index_with_archive(archive, users):
+    """Index whose previous week is already closed, so rebuild archives nothing."""
+    set_meta("weekly_top3", {"week": previous_week(current_week()), "top3": []})
+    index = LeaderboardIndex(METRICS, archive=archive)
+    index.rebuild(users)
+    return index
+
+
+def _expire_week(index):
+    """Pretend the index's current week has just ended."""
+    index._week_ends = 0
+
+
+def test_close_week_archives_and_clears_weekly_boards():
+    archive = _BlockingArchive()
+    archive.release.set()
+    index = _index_with_archive(archive, [
+        ("1", _stored(xp=900, weekly_xp=300, grinds=4)),
+        ("2", _stored(xp=100, weekly_xp=700, grinds=9)),
+    ])
+    week = index._week
+
+    _expire_week(index)
+    index.close_week()
+    index._archiver.join(5)
+
+    assert archive.writes == [(week, [("2", 700, 9), ("1", 300, 4)])]
+    assert index.top("xp") == []
+    assert index.top("grinds") == []
+    assert index.top("lifetime") == [("1", 900), ("2", 100)]     # not weekly
+    assert index.finished_week() == (week, ["2", "1"])
+    assert get_meta("weekly_top3") == {"week": week, "top3": ["2", "1"]}
+
+
+def test_close_week_does_not_hold_the_lock_while_archiving():
+    archive = _BlockingArchive()
+    index = _index_with_archive(archive, [("1", _stored(xp=50, weekly_xp=30))])
+
+    _expire_week(index)
+    index.close_week()
+    assert archive.started.wait(5)
+
+    # The archive write is still running; reads and commits go through
+    index.update("1", _record(xp=60, weekly_xp=10))
+    assert index.top("xp") == [("1", 10)]
+    assert index.finished_week()[1] == ["1"]
+
+    archive.release.set()
+    index._archiver.join(5)
+    assert len(archive.writes) == 1
+
+
+def test_empty_weeks_are_not_archived():
+    archive = _BlockingArchive()
+    archive.release.set()
+    set_meta("weekly_top3", {"week": "2000-01-03", "top3": ["5"]})
+
+    # Nobody played last week: rebuild leaves the last closed week alone
+    index = LeaderboardIndex(METRICS, archive=archive)
+    index.rebuild([("1", _stored(xp=50))])
+    assert archive.writes == []
+    assert index.finished_week() == ("2000-01-03", ["5"])
+
+    # Same when the running week ends with nobody on the board
+    _expire_week(index)
+    index.close_week()
+    assert index._archiver is None
+    assert archive.writes == []
+    assert get_meta("weekly_top3") == {"week": "2000-01-03", "top3": ["5"]}
+
+
+def test_rebuild_archives_last_week_from_storage():
+    archive = _BlockingArchive()
+    archive.release.set()
+    set_meta("weekly_top3", {"week": "2000-01-03", "top3": []})
+    last_week = previous_week(current_week())
+
+    index = LeaderboardIndex(METRICS, archive=archive)
+    index.rebuild([
+        ("1", _stored(weekly_xp=40, grinds=2, week=last_week)),
+        ("2", _stored(weekly_xp=90, grinds=5, week=last_week)),
+        ("3", _stored(weekly_xp=10)),                   # this week
+    ])
+    assert archive.writes == [(last_week, [("2", 90, 5), ("1", 40, 2)])]
+    assert index.finished_week() == (last_week, ["2", "1"])
+    assert index.top("xp") == [("3", 10)]
+
+
+# -------------------------------
+# CHAT BOARDS
+# -------------------------------
+def test_chat_boards_hold_only_members():
+    index = _index([
+        ("1", _stored(weekly_xp=100, chats=[-10])),
+        ("2", _stored(weekly_xp=300, chats=[-10, -20])),
+        ("3", _stored(weekly_xp=200)),
+    ])
+    assert index.top("xp", chat=-10) == [("2", 300), ("1", 100)]
+    assert index.top("xp", chat=-20) == [("2", 300)]
+    assert index.position("xp", "1", chat=-10)["position"] == 2
+    assert index.top("xp", chat=-30) == []
+    assert index.top("lifetime", chat=-10) == []            # global-only metric
+    assert index.has_chat_board("xp") and not index.has_chat_board("lifetime")
+
+
+def test_joining_and_leaving_chats():
+    index = _index([("1", _stored(weekly_xp=100, chats=[-10]))])
+
+    index.update("1", _record(weekly_xp=150, chats=[-10, -20]))
+    assert index.top("xp", chat=-20) == [("1", 150)]
+
+    # A progress reset clears `chats`: the user leaves every chat board
+    index.update("1", _record(weekly_xp=150))
+    assert index.top("xp", chat=-10) == []
+    assert index.top("xp", chat=-20) == []
+    assert index.top("xp") == [("1", 150)]
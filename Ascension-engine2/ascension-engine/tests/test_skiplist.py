@@ -0,0 +1,102 @@
+"""
+tests/test_skiplist.py
+Indexable skip list: rank, at and slice agree with a sorted list.
+"""
+
+import random
+
+import pytest
+
+from utils.skiplist import SkipList
+
+
+def _check(sl, expected):
+    assert len(sl) == len(expected)
+    assert list(sl) == expected
+    for i, key in enumerate(expected):
+        assert sl.rank(key) == i
+        assert sl.at(i) == key
+
+
+def test_matches_sorted_list_under_churn():
+    rng = random.Random(7)
+    sl = SkipList(seed=1)
+    keys = set()
+
+    for _ in range(2000):
+        key = (-rng.randrange(500), rng.randrange(50))
+        if key in keys and rng.random() < 0.5:
+            assert sl.remove(key)
+            keys.discard(key)
+        else:
+            sl.insert(key)
+            keys.add(key)
+
+    _check(sl, sorted(keys))
+
+
+def test_insert_duplicate_is_ignored():
+    sl = SkipList(seed=1)
+    sl.insert(3)
+    sl.insert(3)
+    _check(sl, [3])
+
+
+def test_missing_keys():
+    sl = SkipList(seed=1)
+    for key in (1, 3, 5):
+        sl.insert(key)
+    assert sl.rank(2) is None
+    assert sl.remove(2) is False
+    _check(sl, [1, 3, 5])
+
+
+def test_at_bounds():
+    sl = SkipList(seed=1)
+    for key in range(10):
+        sl.insert(key)
+    assert sl.at(-1) == 9
+    with pytest.raises(IndexError):
+        sl.at(10)
+    with pytest.raises(IndexError):
+        SkipList().at(0)
+
+
+def test_slice():
+    sl = SkipList(seed=1)
+    for key in range(100, 0, -1):
+        sl.insert(key)
+    expected = list(range(1, 101))
+
+    for start, stop in [(0, 10), (37, 52), (95, 120), (-5, 3), (60, 60), (200, 210)]:
+        assert sl.slice(start, stop) == expected[max(start, 0):stop]
+
+
+def test_clear():
+    sl = SkipList(seed=1)
+    for key in range(10):
+        sl.insert(key)
+    sl.clear()
+    _check(sl, [])
+    sl.insert(4)
+    _check(sl, [4])
+
+
+def test_from_sorted_matches_inserts():
+    keys = list(range(0, 3000, 3))
+    sl = SkipList.from_sorted(keys, seed=5)
+    _check(sl, keys)
+    assert sl.slice(100, 110) == keys[100:110]
+
+    # Still a valid skip list after further changes
+    sl.insert(1)
+    sl.insert(2999)
+    sl.remove(0)
+    _check(sl, sorted(set(keys) - {0} | {1, 2999}))
+
+
+def test_from_sorted_empty():
+    sl = SkipList.from_sorted([])
+    _check(sl, [])
+    sl.insert(3)
+    _check(sl, [3])
@@ -0,0 +1,146 @@
+"""
+tests/test_user_record.py
+UserRecord: lazy defaults, compact serialization and schema upgrades.
+"""
+
+from user_record import UserRecord, SCHEMA_VERSION
+
+
+def test_defaults_are_filled_lazily():
+    record = UserRecord.from_dict({"_v": SCHEMA_VERSION, "xp": 40})
+    assert record.xp == 40
+    assert record["rank"] == "Bronze"
+    assert record.get("streak") == 0
+
+    # Mutable defaults stick once touched
+    record.badges.append("Initiate")
+    assert record["badges"] == ["Initiate"]
+
+
+def test_to_dict_stores_only_non_defaults():
+    record = UserRecord.new(7)
+    record["xp"] = 10
+    record["streak"] = 0
+    record.settings                     # read, not changed
+
+    data = record.to_dict()
+    assert data["_v"] == SCHEMA_VERSION
+    assert data["username"] == "User7"
+    assert data["xp"] == 10
+    assert "streak" not in data
+    assert "settings" not in data
+
+
+def test_round_trip_keeps_unknown_fields():
+    record = UserRecord.new(7, username="neo")
+    record["xp"] = 5
+    record["legacy_flag"] = True
+
+    again = UserRecord.from_dict(record.to_dict())
+    assert again.to_dict() == record.to_dict()
+    assert again["legacy_flag"] is True
+    assert "legacy_flag" in again
+    assert again.get("missing", 3) == 3
+
+
+def test_del_restores_default():
+    record = UserRecord.new(7)
+    record["xp"] = 99
+    del record["xp"]
+    assert record.xp == 0
+    assert "xp" not in record.to_dict()
+
+
+def test_copy_is_deep():
+    record = UserRecord.new(7)
+    record.badges.append("Initiate")
+    clone = record.copy()
+    clone.badges.append("Dominator")
+    clone.settings["theme"] = "Light"
+
+    assert record.badges == ["Initiate"]
+    assert record.settings["theme"] == "Dark"
+
+
+def test_reset_keeps_identity():
+    record = UserRecord.new(7, username="neo")
+    record["xp"] = 500
+    record["verified"] = True
+    record["extra"] = 1
+    record.reset()
+
+    assert record.xp == 0
+    assert record.username == "neo"
+    assert record.verified is True
+    assert "extra" not in record
+
+
+def test_upgrade_from_unversioned_dict_drops_activity():
+    stored = {
+        "username": "neo",
+        "xp": 120,
+        "activity": [{"time": 1, "text": "Grinded +50 XP"}],
+    }
+    record = UserRecord.from_dict(stored)
+    assert record.xp == 120
+    assert "activity" not in record
+    assert "activity" in stored             # the input is not modified
+    assert record.to_dict()["_v"] == SCHEMA_VERSION
+
+
+# -------------------------------
+# PERIOD ROLLOVER
+# -------------------------------
+def _counted(day, week):
+    record = UserRecord.new(7)
+    record.update(grinds_today=3, xp_today=150, day=day)
+    record.weekly = {"xp": 400, "grinds": 8, "badges": 1, "week": week}
+    record.badges.extend(["Initiate", "First Grind"])
+    return record
+
+
+def test_roll_over_same_period_keeps_counters():
+    record = _counted("2025-11-12", "2025-11-10")
+    assert record.is_current("2025-11-12", "2025-11-10")
+    assert record.roll_over("2025-11-12", "2025-11-10") is None
+    assert record.grinds_today == 3
+    assert record.weekly["xp"] == 400
+
+
+def test_roll_over_new_day_resets_daily_only():
+    record = _counted("2025-11-12", "2025-11-10")
+    assert not record.is_current("2025-11-13", "2025-11-10")
+    assert record.roll_over("2025-11-13", "2025-11-10") is None
+    assert (record.grinds_today, record.xp_today, record.day) == (0, 0, "2025-11-13")
+    assert record.weekly["xp"] == 400
+
+
+def test_roll_over_new_week_returns_finished_stats():
+    record = _counted("2025-11-16", "2025-11-10")
+    finished = record.roll_over("2025-11-17", "2025-11-17")
+
+    assert finished == {"xp": 400, "grinds": 8, "badges": 1, "week": "2025-11-10"}
+    assert record.weekly == {"xp": 0, "grinds": 0, "badges": 2, "week": "2025-11-17"}
+    assert record.grinds_today == 0
+    assert record.is_current("2025-11-17", "2025-11-17")
+    assert record.roll_over("2025-11-17", "2025-11-17") is None
+
+
+def test_upgrade_v1_stamps_period_counters():
+    # 2025-11-12 12:00 UTC, a Wednesday
+    stored = {
+        "_v": 1,
+        "last_grind": 1762948800,
+        "last_grind_date": "2025-11-12",
+        "grinds_today": 2,
+        "weekly": {"xp": 90, "grinds": 2, "badges": 0},
+    }
+    record = UserRecord.from_dict(stored)
+    assert record.weekly["week"] == "2025-11-10"
+    assert record.day == "2025-11-12"
+    assert record.is_current("2025-11-12", "2025-11-10")
+
+
+def test_upgrade_v1_keeps_reset_stamp():
+    record = UserRecord.from_dict({"_v": 1, "weekly": {"xp": 5, "reset": "2025-11-03"}})
+    assert record.weekly == {"xp": 5, "week": "2025-11-03"}
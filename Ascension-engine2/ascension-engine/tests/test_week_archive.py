@@ -0,0 +1,95 @@
+"""
+tests/test_week_archive.py
+Weekly archive files: write once, user history, tops and hall of fame.
+"""
+
+from backends.week_archive import WeekArchive
+
+
+RANKED = [
+    ("300", 900, 12),
+    ("100", 700, 9),
+    ("200", 500, 4),
+    ("400", 100, 1),
+]
+
+
+def _archive(tmp_path, **kwargs):
+    return WeekArchive(str(tmp_path / "weeks"), **kwargs)
+
+
+def test_user_history(tmp_path):
+    archive = _archive(tmp_path)
+    archive.write("2025-11-10", RANKED)
+    archive.write("2025-11-17", [("200", 800, 10), ("300", 50, 1)])
+
+    assert archive.user_history("200") == [
+        ("2025-11-17", {"xp": 800, "grinds": 10, "rank": 1, "total": 2}),
+        ("2025-11-10", {"xp": 500, "grinds": 4, "rank": 3, "total": 4}),
+    ]
+    assert archive.user_history("100") == [
+        ("2025-11-17", None),
+        ("2025-11-10", {"xp": 700, "grinds": 9, "rank": 2, "total": 4}),
+    ]
+    assert archive.user_history("100", weeks=1) == [("2025-11-17", None)]
+    assert archive.user_history("999") == [("2025-11-17", None), ("2025-11-10", None)]
+
+
+def test_top_is_in_xp_order(tmp_path):
+    archive = _archive(tmp_path, top_rows=3)
+    archive.write("2025-11-10", RANKED)
+
+    assert archive.top("2025-11-10") == [("300", 900), ("100", 700), ("200", 500)]
+    assert archive.top("2025-11-10", limit=10) == [("300", 900), ("100", 700), ("200", 500)]
+    assert archive.top("2025-11-10", limit=1) == [("300", 900)]
+    assert archive.top("2025-11-03") == []
+
+
+def test_hall_of_fame_newest_first(tmp_path):
+    archive = _archive(tmp_path)
+    for week in ("2025-11-03", "2025-11-17", "2025-11-10"):
+        archive.write(week, [(week[-2:], 10, 1)])
+
+    assert archive.hall_of_fame(weeks=2) == [
+        ("2025-11-17", [("17", 10)]),
+        ("2025-11-10", [("10", 10)]),
+    ]
+
+
+def test_week_is_written_once(tmp_path):
+    archive = _archive(tmp_path)
+    archive.write("2025-11-10", RANKED)
+    archive.write("2025-11-10", [("100", 1, 1)])
+    assert archive.top("2025-11-10", limit=1) == [("300", 900)]
+
+
+def test_reopen_lists_archived_weeks(tmp_path):
+    archive = _archive(tmp_path)
+    archive.write("2025-11-10", RANKED)
+    archive.write("2025-11-17", [])
+
+    archive = _archive(tmp_path)
+    assert archive.weeks() == ["2025-11-17", "2025-11-10"]
+    assert archive.top("2025-11-17") == []
+    assert archive.user_history("300")[1][1]["rank"] == 1
+
+
+def test_unreadable_week_is_skipped(tmp_path):
+    archive = _archive(tmp_path)
+    archive.write("2025-11-10", RANKED)
+    (tmp_path / "weeks" / "2025-11-17.wk").write_bytes(b"not an archive")
+
+    archive = _archive(tmp_path)
+    assert archive.user_history("300") == [
+        ("2025-11-10", {"xp": 900, "grinds": 12, "rank": 1, "total": 4}),
+    ]
+
+
+def test_truncated_week_is_skipped(tmp_path):
+    archive = _archive(tmp_path)
+    archive.write("2025-11-10", RANKED)
+    path = tmp_path / "weeks" / "2025-11-10.wk"
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert archive.user_history("300") == []
+    assert archive.top("2025-11-10") == []
@@ -0,0 +1,94 @@
+"""
+tests/test_xp_ledger.py
+XP ledger: boosts, the zero floor, period counters, rank and events.
+"""
+
+import time
+
+import pytest
+
+import events
+from database import get_user, transaction, get_activity
+from events import subscribe, XpAwarded, GameFinished
+from modules.xp_ledger import award_xp, boost_note, calculate_rank, XP_BOOST_MULTIPLIER
+
+
+def _with_xp(user_id, xp=0, boosted=False):
+    with transaction(user_id) as user:
+        user.xp = xp
+        user.rank = calculate_rank(xp)
+        user.xp_boost_until = time.time() + 3600 if boosted else None
+    return user_id
+
+
+def test_award_updates_lifetime_daily_and_weekly():
+    uid = _with_xp(92001)
+    assert award_xp(uid, 50, "grind") == (50, None)
+    assert award_xp(uid, 30, "quiz") == (30, None)
+
+    user = get_user(uid)
+    assert (user.xp, user.xp_today, user.weekly["xp"]) == (80, 80, 80)
+
+
+def test_boost_doubles_gains_of_boosted_sources_only():
+    uid = _with_xp(92002, boosted=True)
+    assert award_xp(uid, 50, "grind") == (50 * XP_BOOST_MULTIPLIER, None)
+    assert award_xp(uid, 20, "spin") == (20, None)              # fixed reward
+    assert award_xp(uid, -10, "bomb_defusal") == (-10, None)    # losses are not doubled
+
+
+def test_expired_boost_is_ignored():
+    uid = _with_xp(92003)
+    with transaction(uid) as user:
+        user.xp_boost_until = time.time() - 1
+    assert award_xp(uid, 50, "grind") == (50, None)
+
+
+def test_losses_floor_at_zero():
+    uid = _with_xp(92004, xp=30)
+    award_xp(uid, 20, "quiz")
+    change, _ = award_xp(uid, -100, "dice_battle")
+
+    user = get_user(uid)
+    assert change == -50
+    assert user.xp == 0
+    assert user.xp_today == 0
+    assert user.weekly["xp"] == 0
+
+
+def test_rank_is_returned_only_when_it_changes():
+    uid = _with_xp(92005, xp=740)
+    assert award_xp(uid, 5, "quiz") == (5, None)
+    assert award_xp(uid, 5, "quiz") == (5, "Silver")
+    assert award_xp(uid, 5, "quiz") == (5, None)
+    assert award_xp(uid, -100, "quiz") == (-100, "Bronze")
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError):
+        award_xp(92006, 10, "cheat")
+
+
+def test_events_and_activity():
+    seen = []
+    subscribe(XpAwarded, lambda event, user: seen.append(event) if event.user_id == 92007 else None)
+    subscribe(GameFinished, lambda event, user: seen.append(event) if event.user_id == 92007 else None)
+
+    uid = _with_xp(92007)
+    award_xp(uid, 40, "grind")
+    award_xp(uid, 0, "quiz")                # no change: no XpAwarded, still a game
+
+    assert [(type(e).__name__, getattr(e, "amount", getattr(e, "xp", None))) for e in seen] == [
+        ("XpAwarded", 40), ("GameFinished", 0),
+    ]
+
+    events.drain()
+    entries, total = get_activity(uid)
+    assert total == 1
+    assert "40" in entries[0]["text"]
+
+
+def test_boost_note():
+    assert boost_note(50, 100) == f"\n⚡ XP Boost x{XP_BOOST_MULTIPLIER}: +100 XP"
+    assert boost_note(50, 50) == ""
+    assert boost_note(-10, -10) == ""
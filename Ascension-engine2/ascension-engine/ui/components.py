@@ -24,30 +24,55 @@ def render_light(text: str) -> str:
     """Apply Light theme styling (emoji-shifted)."""
     return (
         "🌕 *LIGHT MODE*\n"
-        + text.replace("🔥", "✨")
-              .replace("⚡", "💡")
-              .replace("🏅", "🎖")
-              .replace("💠", "🔷")
+        + _light_emoji(text)
+    )
+
+
+def _light_emoji(text: str) -> str:
+    return (
+        text.replace("🔥", "✨")
+            .replace("⚡", "💡")
+            .replace("🏅", "🎖")
+            .replace("💠", "🔷")
     )
 
 
 # ---------------------------------------------------------
 # MAIN THEME RENDER ENTRY
 # ---------------------------------------------------------
+def get_theme(user: dict) -> str:
+    """The user's theme name ("Dark" or "Light")."""
+    settings = user.get("settings", {})
+    return settings.get("theme", "Dark")
+
+
 def render_text(user: dict, text: str) -> str:
     """
     Returns themed text depending on user's settings.
     Defaults to Dark Mode.
     """
-    settings = user.get("settings", {})
-    theme = settings.get("theme", "Dark")
+    return render_themed(get_theme(user), text)
 
+
+def render_themed(theme: str, text: str) -> str:
+    """Same as render_text, for a theme name (used by shared cached screens)."""
     if theme == "Light":
         return render_light(text)
 
     return render_dark(text)
 
 
+def render_fragment(theme: str, text: str) -> str:
+    """
+    Theme a piece of text appended to an already-rendered screen
+    (emoji styling only, no theme header).
+    """
+    if theme == "Light":
+        return _light_emoji(text)
+
+    return text
+
+
 # ---------------------------------------------------------
 # SAFE INLINE KEYBOARD BUILDER
 # ---------------------------------------------------------
@@ -0,0 +1,354 @@
+"""
+user_record.py
+Typed user record model for PWN Ascension.
+
+Handles:
+- One schema for every user field and its default
+- Slotted records (no per-record __dict__)
+- Lazy defaults: a missing field is filled on first read
+- Compact, versioned serialization (only non-default fields are stored)
+- Schema upgrades for records written by older versions
+- Lazy day / week rollover of the period counters
+
+The mapping protocol (user["xp"], user.get(...), user.setdefault(...),
+"key" in user) is kept so handlers written against plain dicts keep
+working. Attribute access (user.xp) does the same lookup without the
+.get(..., default) chain.
+"""
+
+import copy
+import time
+
+from utils.epochs import week_of
+
+
+SCHEMA_VERSION = 3
+
+
+# ---------------------------------------------------------
+# SCHEMA
+# ---------------------------------------------------------
+def _default_settings():
+    return {
+        "notifications": True,
+        "theme": "Dark",
+        "language": "English"
+    }
+
+
+def _default_weekly():
+    return {
+        "xp": 0,
+        "grinds": 0,
+        "badges": 0
+    }
+
+
+def _default_challenges():
+    return {
+        "daily": {},
+        "weekly": {}
+    }
+
+
+def _now():
+    return int(time.time())
+
+
+# field -> default value, or a factory for mutable / time-based defaults
+SCHEMA = {
+    "username": None,
+    "xp": 0,
+    "rank": "Bronze",
+    "streak": 0,
+    "grinds_today": 0,
+    "xp_today": 0,
+    "day": None,            # UTC day grinds_today / xp_today belong to
+    "last_grind": 0,
+    "last_grind_date": None,
+    "badges": list,
+    "onboarding_step": 1,
+    "onboarding_complete": False,
+    "verified": False,
+    "settings": _default_settings,
+    "weekly": _default_weekly,
+    "challenges": _default_challenges,
+    "last_spin": None,
+    "badge_fragments": 0,
+    "xp_boost_until": None,
+    "chats": list,          # group chats the user was seen in
+    "created_at": _now,
+}
+
+# Written even when equal to the default
+ALWAYS_STORED = ("username", "created_at")
+
+# Fields kept by a progress reset
+IDENTITY_FIELDS = ("username", "verified", "created_at")
+
+_FACTORIES = {name: d for name, d in SCHEMA.items() if callable(d)}
+
+# Default values to compare against when serializing
+_DEFAULT_VALUES = {
+    name: (d() if callable(d) else d)
+    for name, d in SCHEMA.items()
+    if name not in ALWAYS_STORED
+}
+
+
+# ---------------------------------------------------------
+# SCHEMA UPGRADES (version N -> N + 1)
+# ---------------------------------------------------------
+def _upgrade_v0(data):
+    # Unversioned dicts: activity moved to the activity store
+    data.pop("activity", None)
+    return data
+
+
+def _upgrade_v1(data):
+    # Period counters gain the day / week they were counted in
+    weekly = data.get("weekly")
+    if isinstance(weekly, dict) and "week" not in weekly:
+        weekly = dict(weekly)
+        stamped = weekly.pop("reset", None)
+        last_seen = data.get("last_grind") or data.get("created_at") or 0
+        weekly["week"] = stamped or week_of(last_seen)
+        data["weekly"] = weekly
+    if "day" not in data and data.get("last_grind_date"):
+        data["day"] = data["last_grind_date"]
+    return data
+
+
+def _upgrade_v2(data):
+    # Challenges keep their own counters stamped with their day / week
+    # (modules/challenges.py); seed them from this period's counters so
+    # targets already reached complete, and pay out, on the next event
+    weekly = data.get("weekly") or {}
+    data["challenges"] = {
+        "daily": {
+            "epoch": data.get("day"),
+            "counts": {"grinds": data.get("grinds_today", 0), "xp": data.get("xp_today", 0)},
+            "done": []
+        },
+        "weekly": {
+            "epoch": weekly.get("week"),
+            "counts": {"grinds": weekly.get("grinds", 0), "xp": weekly.get("xp", 0)},
+            "done": []
+        }
+    }
+    return data
+
+
+_UPGRADES = {
+    0: _upgrade_v0,
+    1: _upgrade_v1,
+    2: _upgrade_v2,
+}
+
+
+# ---------------------------------------------------------
+# USER RECORD
+# ---------------------------------------------------------
+class UserRecord:
+    """One user's data with schema defaults filled on demand."""
+
+    __slots__ = tuple(SCHEMA) + ("_extra",)
+
+    def __init__(self, **fields):
+        self._extra = None   # fields outside the schema, created on demand
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def new(cls, user_id: int, username=None):
+        """Fresh record for a user who has never been seen."""
+        return cls(
+            username=username if username else f"User{user_id}",
+            created_at=_now()
+        )
+
+    # -------------------------------
+    # LAZY DEFAULTS
+    # -------------------------------
+    def __getattr__(self, name):
+        # Only called when a slot has never been set
+        if name not in SCHEMA:
+            raise AttributeError(name)
+
+        factory = _FACTORIES.get(name)
+        if factory is None:
+            return SCHEMA[name]
+
+        # Mutable defaults are stored so the caller's changes stick
+        value = factory()
+        object.__setattr__(self, name, value)
+        return value
+
+    # -------------------------------
+    # MAPPING PROTOCOL
+    # -------------------------------
+    def __getitem__(self, key):
+        if key in SCHEMA:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in SCHEMA:
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in SCHEMA:
+            # Back to the schema default
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                pass
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in SCHEMA or (self._extra is not None and key in self._extra)
+
+    def __iter__(self):
+        yield from SCHEMA
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(SCHEMA) + (len(self._extra) if self._extra else 0)
+
+    def get(self, key, default=None):
+        if key in SCHEMA:
+            return getattr(self, key)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in SCHEMA:
+            return getattr(self, key)
+        if self._extra is None:
+            self._extra = {}
+        return self._extra.setdefault(key, default)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def update(self, other=(), **fields):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    # -------------------------------
+    # PERIOD ROLLOVER
+    # -------------------------------
+    def is_current(self, day: str, week: str) -> bool:
+        """True if the daily and weekly counters belong to `day` / `week`."""
+        return self.day == day and self.weekly.get("week") == week
+
+    def roll_over(self, day: str, week: str):
+        """
+        Zero counters left over from an earlier day or week.
+        Returns the finished week's stats if the week rolled over, else None.
+        """
+        if self.day != day:
+            self.grinds_today = 0
+            self.xp_today = 0
+            self.day = day
+
+        finished = None
+        if self.weekly.get("week") != week:
+            finished = self.weekly
+            self.weekly = {
+                "xp": 0,
+                "grinds": 0,
+                "badges": len(self.badges),
+                "week": week
+            }
+        return finished
+
+    # -------------------------------
+    # RESET / COPY
+    # -------------------------------
+    def reset(self, keep=IDENTITY_FIELDS):
+        """Return every field to its default, except those in `keep`."""
+        for name in SCHEMA:
+            if name not in keep:
+                del self[name]
+        self._extra = None
+
+    def copy(self):
+        """Deep copy (nested lists and dicts are not shared)."""
+        clone = UserRecord.__new__(UserRecord)
+        for name in self.__slots__:
+            try:
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            if isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            object.__setattr__(clone, name, value)
+        return clone
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    # -------------------------------
+    # SERIALIZATION
+    # -------------------------------
+    def to_dict(self) -> dict:
+        """Compact stored form: schema version + non-default fields."""
+        data = {"_v": SCHEMA_VERSION}
+        for name in SCHEMA:
+            try:
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            if name in ALWAYS_STORED or value != _DEFAULT_VALUES[name]:
+                data[name] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Build a record from its stored form, upgrading old schemas."""
+        data = dict(data)
+        version = data.pop("_v", 0)
+        while version < SCHEMA_VERSION:
+            data = _UPGRADES[version](data)
+            version += 1
+
+        record = cls.__new__(cls)
+        record._extra = None
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def __repr__(self):
+        return f"UserRecord({self.to_dict()!r})"
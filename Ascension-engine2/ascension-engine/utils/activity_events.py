@@ -0,0 +1,90 @@
+"""
+utils/activity_events.py
+Activity event codes and display templates for PWN Ascension.
+
+Activity is stored as (event code, small integer payload) pairs instead of
+text. The text shown in the activity feed is rendered from the template
+table below when the page is displayed.
+"""
+
+import re
+
+
+# ---------------------------------------------------------
+# EVENT CODES (stored on disk — never renumber)
+# ---------------------------------------------------------
+EVENT_LEGACY = 0          # imported entry whose text could not be mapped
+EVENT_GRIND = 1           # payload: XP gained
+EVENT_SPIN_XP = 2         # payload: XP won
+EVENT_SPIN_BOOST = 3      # payload: boost days
+EVENT_SPIN_STREAK = 4     # payload: streak days added
+EVENT_SPIN_FRAGMENT = 5   # payload: fragments won
+EVENT_SPIN_BADGE = 6      # payload: unused
+
+# XP awarded through modules/xp_ledger.py (payload: XP change, may be < 0)
+EVENT_ONBOARDING_XP = 7
+EVENT_DICE_BATTLE = 8
+EVENT_TAP_SPEED = 9
+EVENT_BOMB_DEFUSAL = 10
+EVENT_MIND_HACK = 11
+EVENT_ASCENSION_RUSH = 12
+EVENT_DARK_CORRIDOR = 13
+EVENT_XP_TYPHOON = 14
+EVENT_QUIZ = 15
+EVENT_ORACLE = 16
+EVENT_QUANTUM_FLIP = 17
+EVENT_CHALLENGE = 18      # challenge completion reward
+
+
+TEMPLATES = {
+    EVENT_LEGACY: "Earlier activity",
+    EVENT_GRIND: "Performed grind (+{n} XP)",
+    EVENT_SPIN_XP: "🎰 Daily Spin: +{n:,} XP",
+    EVENT_SPIN_BOOST: "🎰 Daily Spin: ⚡ {n}-Day XP Boost (x2)",
+    EVENT_SPIN_STREAK: "🎰 Daily Spin: 📅 +{n} Streak Day",
+    EVENT_SPIN_FRAGMENT: "🎰 Daily Spin: 🟦 Badge Fragment",
+    EVENT_SPIN_BADGE: "🎰 Daily Spin: 💠 Wheel Master Badge",
+    EVENT_ONBOARDING_XP: "🚀 Onboarding reward: +{n} XP",
+    EVENT_DICE_BATTLE: "🎲 Dice Battle: {n:+,} XP",
+    EVENT_TAP_SPEED: "⚡ Tap Speed Test: {n:+,} XP",
+    EVENT_BOMB_DEFUSAL: "💣 Bomb Defusal: {n:+,} XP",
+    EVENT_MIND_HACK: "🧠 Mind Hack Puzzle: {n:+,} XP",
+    EVENT_ASCENSION_RUSH: "⚡ Ascension Rush: {n:+,} XP",
+    EVENT_DARK_CORRIDOR: "🚪 Dark Corridor: {n:+,} XP",
+    EVENT_XP_TYPHOON: "🌪️ XP Typhoon: {n:+,} XP",
+    EVENT_QUIZ: "🧠 Quiz Game: {n:+,} XP",
+    EVENT_ORACLE: "🔮 Corrupted Oracle: {n:+,} XP",
+    EVENT_QUANTUM_FLIP: "⚛️ Quantum Flip: {n:+,} XP",
+    EVENT_CHALLENGE: "🏆 Challenge complete: +{n:,} XP",
+}
+
+
+def render_event(code: int, payload: int) -> str:
+    """Return the display text for one stored event."""
+    template = TEMPLATES.get(code)
+    if template is None:
+        return "Unknown activity"
+    return template.format(n=payload)
+
+
+# ---------------------------------------------------------
+# LEGACY TEXT → EVENT (used when importing old text logs)
+# ---------------------------------------------------------
+_LEGACY_PATTERNS = [
+    (re.compile(r"^Performed grind \(\+(\d+) XP\)$"), EVENT_GRIND),
+    (re.compile(r"^🎰 Daily Spin: .*?\+([\d,]+) XP$"), EVENT_SPIN_XP),
+    (re.compile(r"^🎰 Daily Spin: ⚡ (\d+)-Day XP Boost"), EVENT_SPIN_BOOST),
+    (re.compile(r"^🎰 Daily Spin: 📅 \+(\d+) Streak Day"), EVENT_SPIN_STREAK),
+    (re.compile(r"^🎰 Daily Spin: 🟦 Badge Fragment()"), EVENT_SPIN_FRAGMENT),
+    (re.compile(r"^🎰 Daily Spin: 💠 Wheel Master Badge()"), EVENT_SPIN_BADGE),
+]
+
+
+def parse_legacy_text(text: str):
+    """Map an old free-text activity entry to (code, payload)."""
+    for pattern, code in _LEGACY_PATTERNS:
+        match = pattern.match(text or "")
+        if match:
+            value = match.group(1).replace(",", "")
+            return code, int(value) if value else 1
+    return EVENT_LEGACY, 0
@@ -0,0 +1,60 @@
+"""
+utils/epochs.py
+Day / week period keys for PWN Ascension counters.
+
+Daily counters belong to a UTC day ("YYYY-MM-DD") and weekly counters to
+a week, keyed by the date of its Monday (weeks start Monday 00:00 UTC).
+Counters tagged with an old key are stale and roll over lazily the next
+time the user is touched.
+"""
+
+import time
+import threading
+from datetime import datetime, timedelta
+
+
+_lock = threading.Lock()
+_cached = {"until": 0.0, "day": None, "week": None}
+
+
+def day_of(ts: float) -> str:
+    return datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+def week_of(ts: float) -> str:
+    date = datetime.utcfromtimestamp(ts).date()
+    monday = date - timedelta(days=date.weekday())
+    return monday.strftime("%Y-%m-%d")
+
+
+def previous_week(week: str) -> str:
+    monday = datetime.strptime(week, "%Y-%m-%d") - timedelta(days=7)
+    return monday.strftime("%Y-%m-%d")
+
+
+def current_epochs():
+    """(day, week) keys for now; recomputed only once per UTC day."""
+    now = time.time()
+    if now < _cached["until"]:
+        return _cached["day"], _cached["week"]
+
+    with _lock:
+        midnight = datetime.utcfromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        _cached["day"] = day_of(now)
+        _cached["week"] = week_of(now)
+        _cached["until"] = (midnight + timedelta(days=1) - datetime(1970, 1, 1)).total_seconds()
+        return _cached["day"], _cached["week"]
+
+
+def current_day() -> str:
+    return current_epochs()[0]
+
+
+def current_week() -> str:
+    return current_epochs()[1]
+
+
+def next_week_start(week: str) -> float:
+    """Unix time at which the week after `week` begins."""
+    monday = datetime.strptime(week, "%Y-%m-%d") + timedelta(days=7)
+    return (monday - datetime(1970, 1, 1)).total_seconds()
@@ -0,0 +1,202 @@
+"""
+utils/skiplist.py
+Indexable skip list: a sorted container with O(log n) insert, remove,
+rank lookup and access by position.
+
+Keys must be unique and comparable (e.g. tuples such as (-score, uid)).
+Every forward link stores its width (how many items it skips), which is
+what makes rank() and at() logarithmic.
+"""
+
+import random
+
+
+MAX_LEVEL = 32
+P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class SkipList:
+    """Sorted set of unique keys with positional access."""
+
+    def __init__(self, seed=None):
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_sorted(cls, keys, seed=None):
+        """
+        Build from unique keys already in ascending order in O(n), linking
+        each level left to right instead of searching for every insert.
+        Heights are assigned evenly (every 4th node reaches level 2, every
+        16th level 3, ...), the layout random heights average out to.
+        """
+        sl = cls(seed)
+        last = [sl._head] * MAX_LEVEL     # rightmost node at each level
+        last_pos = [-1] * MAX_LEVEL       # and its position
+        size = 0
+        for key in keys:
+            level, n = 1, size + 1
+            while n % 4 == 0 and level < MAX_LEVEL:
+                n //= 4
+                level += 1
+            node = _Node(key, level)
+            for i in range(level):
+                last[i].next[i] = node
+                last[i].width[i] = size - last_pos[i]
+                last[i] = node
+                last_pos[i] = size
+            if level > sl._level:
+                sl._level = level
+            size += 1
+
+        # Tail links skip to the end of the list
+        for i in range(MAX_LEVEL):
+            last[i].width[i] = size - last_pos[i]
+        sl._size = size
+        return sl
+
+    def __len__(self):
+        return self._size
+
+    def _random_level(self):
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < P:
+            level += 1
+        return level
+
+    def _find(self, key):
+        """Predecessor at every level and its position (index of head = -1)."""
+        update = [self._head] * MAX_LEVEL
+        positions = [-1] * MAX_LEVEL
+        node = self._head
+        pos = -1
+        for i in range(self._level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[i]
+                node = nxt
+                nxt = node.next[i]
+            update[i] = node
+            positions[i] = pos
+        return update, positions
+
+    # -------------------------------
+    # WRITES
+    # -------------------------------
+    def insert(self, key):
+        """Add a key (ignored if already present)."""
+        update, positions = self._find(key)
+        nxt = update[0].next[0]
+        if nxt is not None and nxt.key == key:
+            return
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                update[i] = self._head
+                positions[i] = -1
+                self._head.width[i] = self._size + 1
+            self._level = level
+
+        node = _Node(key, level)
+        pos = positions[0] + 1   # index of the new node
+        for i in range(level):
+            prev = update[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            # prev is at positions[i]; it used to skip prev.width[i] items
+            node.width[i] = prev.width[i] - (pos - positions[i]) + 1
+            prev.width[i] = pos - positions[i]
+
+        # Links above the new node's height now skip one more item
+        for i in range(level, self._level):
+            update[i].width[i] += 1
+
+        self._size += 1
+
+    def remove(self, key):
+        """Remove a key; return False if it was not present."""
+        update, _ = self._find(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+
+        for i in range(self._level):
+            prev = update[i]
+            if prev.next[i] is node:
+                prev.width[i] += node.width[i] - 1
+                prev.next[i] = node.next[i]
+            else:
+                prev.width[i] -= 1
+
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+
+        self._size -= 1
+        return True
+
+    def clear(self):
+        self.__init__()
+
+    # -------------------------------
+    # READS
+    # -------------------------------
+    def rank(self, key):
+        """0-based position of a key, or None if absent."""
+        update, positions = self._find(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return None
+        return positions[0] + 1
+
+    def at(self, index):
+        """Key at a 0-based position."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+
+        node = self._head
+        pos = -1
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None and pos + node.width[i] <= index:
+                pos += node.width[i]
+                node = node.next[i]
+        return node.key
+
+    def slice(self, start, stop):
+        """Keys at positions [start, stop) in order."""
+        start = max(start, 0)
+        stop = min(stop, self._size)
+        if start >= stop:
+            return []
+
+        node = self._head
+        pos = -1
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None and pos + node.width[i] <= start:
+                pos += node.width[i]
+                node = node.next[i]
+
+        keys = []
+        while node is not None and len(keys) < stop - start:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]